@@ -1,45 +1,137 @@
-from services.job_scraper import search_timesjobs_jobs
+from services.job_scraper import iter_timesjobs_pages, get_search_cache_stats, MAX_FANOUT_PAGES
 import os
 from dotenv import load_dotenv
 import logging
-from flask import Flask, render_template, request, jsonify, flash, redirect, url_for
+import atexit
+import hashlib
+import click
+import io
+import time
+from flask import Flask, Request, Response, render_template, stream_template, request, jsonify, flash, redirect, url_for, g, session, abort, send_file
 from werkzeug.utils import secure_filename
 from datetime import datetime
-from services.resume_parser import ResumeParser
-from services.job_matcher import JobMatcher
-from models.database import init_db, get_db
-import spacy
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    from spacy.cli import download
-    download("en_core_web_sm")
-    nlp = spacy.load("en_core_web_sm")
+from bson import ObjectId
+from services.resume_parser import PARSER_VERSION
+from services.ingestion import (
+    QueueFull, get_queue as get_ingest_queue,
+    get_status as get_ingest_status, get_active_jobs as get_active_ingests
+)
+from services import metrics, profiling, warmup
+from services.job_search import index_job, search_jobs, rebuild_index
+from services.job_analysis import build_analysis, get_job_analysis, get_analyses_for, backfill_job_analysis
+from services.resume_features import (
+    get_resume_features, get_features_for, features_hash, load_parsed_data, backfill_features
+)
+from models.database import (
+    init_db, get_db, close_db, get_pool_stats,
+    get_match_result, save_match_result,
+    find_resume_by_hash, touch_resume,
+    get_jobs_page, get_recent_resumes, get_job_counts, JOB_PAGE_SIZE,
+    insert_job, rebuild_job_stats
+)
 
 
 load_dotenv()
 
-SECRET_KEY = os.getenv('SECRET_KEY', 'default-secret-key')
+DEFAULT_SECRET_KEY = 'default-secret-key'
+SECRET_KEY = os.getenv('SECRET_KEY', DEFAULT_SECRET_KEY)
 UPLOAD_FOLDER = os.getenv('UPLOAD_FOLDER', 'uploads')
 MAX_CONTENT_LENGTH = int(os.getenv('MAX_CONTENT_LENGTH', 16 * 1024 * 1024))
 DEBUG = os.getenv('DEBUG', 'False').lower() == 'true'
 PORT = int(os.getenv('PORT', 5000))
 ALLOWED_EXTENSIONS = {'pdf', 'docx', 'txt'}
+DASHBOARD_JOBS = 5
+RESPONDED_STATUSES = ('interviewed', 'offered', 'rejected')
 
 logging.basicConfig(level=logging.DEBUG if DEBUG else logging.INFO, 
                    format='[%(asctime)s] %(levelname)s in %(module)s: %(message)s')
 logger = logging.getLogger(__name__)
 
+class HashingUploadBuffer(io.BytesIO):
+    """In-memory upload buffer that SHA-256 hashes each chunk as Werkzeug writes it"""
+
+    def __init__(self):
+        super().__init__()
+        self.sha256 = hashlib.sha256()
+
+    def write(self, data):
+        self.sha256.update(data)
+        return super().write(data)
+
+class InMemoryUploadRequest(Request):
+    """Keep uploaded files in memory instead of spooling them to temp files.
+
+    MAX_CONTENT_LENGTH bounds the buffer, and parsers read the bytes directly.
+    The content hash used for deduplication is computed while the body is
+    parsed, so the upload is never read a second time.
+    """
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return HashingUploadBuffer()
+
 app = Flask(__name__)
+app.request_class = InMemoryUploadRequest
 app.config['SECRET_KEY'] = SECRET_KEY
+profiling.set_secret_key_configured(SECRET_KEY != DEFAULT_SECRET_KEY)
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = MAX_CONTENT_LENGTH
 
-os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+atexit.register(close_db)
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+    trigger = profiling.profile_trigger(request.headers.get(profiling.PROFILE_HEADER))
+    if trigger:
+        g.profiler = profiling.start_profile()
+        g.profile_trigger = trigger
+
+@app.after_request
+def record_response_status(response):
+    g.response_status = response.status_code
+    return response
+
+@app.teardown_request
+def record_request_duration(error=None):
+    # Streamed responses keep the request context until the last chunk is
+    # sent, so this covers the full body, not just the view function.
+    start = g.pop('request_start', None)
+    if start is None:
+        return
+    status = 500 if error is not None else g.pop('response_status', 500)
+    elapsed = time.perf_counter() - start
+    metrics.observe(metrics.REQUEST_METRIC, elapsed,
+                    endpoint=request.endpoint or 'unmatched', method=request.method, status=str(status))
+    metrics.flush()
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        try:
+            name = profiling.save_profile(
+                profiler, profiling.request_metadata(request, status, elapsed, g.pop('profile_trigger', None))
+            )
+            logger.info(f"Saved request profile {name} ({elapsed * 1000:.0f} ms)")
+        except Exception as e:
+            logger.error(f"Could not save request profile: {str(e)}")
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+def read_upload(file):
+    """Bytes of an uploaded file and their SHA-256, hashed as the request body streamed in"""
+    stream = file.stream
+    if isinstance(stream, HashingUploadBuffer):
+        return stream.getvalue(), stream.sha256.hexdigest()
+    data = stream.read()
+    return data, hashlib.sha256(data).hexdigest()
+
+def find_parsed_duplicate(file_hash):
+    """Stored resume with identical content parsed by the current parser, if any"""
+    existing = find_resume_by_hash(file_hash)
+    if existing and existing.get("parser_version") == PARSER_VERSION:
+        touch_resume(existing["_id"])
+        return existing
+    return None
+
 @app.route('/')
 def index():
     return render_template('index.html')
@@ -61,26 +153,22 @@ def upload_resume():
         filename = secure_filename(file.filename)
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         filename = f"{timestamp}_{filename}"
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
         try:
-            parser = ResumeParser()
-            parsed_data = parser.parse_resume(filepath)
-            db = get_db()
-            db.resumes.insert_one({
-                "filename": filename,
-                "original_filename": file.filename,
-                "upload_date": datetime.utcnow(),
-                "parsed_data": parsed_data,
-                "created_at": datetime.utcnow()
-            })
-            os.remove(filepath)
-            logger.info(f"Resume {filename} uploaded and parsed successfully.")
-            flash('Resume uploaded and parsed successfully!')
+            data, file_hash = read_upload(file)
+            if find_parsed_duplicate(file_hash):
+                logger.info(f"Resume {filename} matches an already parsed upload; reusing it.")
+                flash('This resume was already uploaded and parsed.')
+                return redirect(url_for('dashboard'))
+            job_id = get_ingest_queue().submit(data, filename, file.filename, file_hash)
+            logger.info(f"Resume {filename} queued for parsing (ingest job {job_id}).")
+            flash('Resume uploaded! It is being parsed in the background.')
             return redirect(url_for('dashboard'))
+        except QueueFull as e:
+            flash(str(e))
+            return redirect(url_for('index'))
         except Exception as e:
-            logger.error(f"Error parsing resume {filename}: {str(e)}", exc_info=True)
-            flash(f'Error parsing resume: {str(e)}')
+            logger.error(f"Error queueing resume {filename}: {str(e)}", exc_info=True)
+            flash(f'Error uploading resume: {str(e)}')
             return redirect(url_for('index'))
     flash('Invalid file type. Please upload PDF, DOCX, or TXT files.')
     return redirect(url_for('index'))
@@ -88,13 +176,54 @@ def upload_resume():
 @app.route('/dashboard')
 def dashboard():
     db = get_db()
-    resumes = list(db.resumes.find().sort("upload_date", -1))
-    jobs = list(db.jobs.find().sort("application_date", -1))
+    resumes = get_recent_resumes()
+    jobs, next_cursor = get_jobs_page(limit=DASHBOARD_JOBS)
     for r in resumes:
         r["_id"] = str(r["_id"])
     for j in jobs:
         j["_id"] = str(j["_id"])
-    return render_template('dashboard.html', resumes=resumes, jobs=jobs)
+    job_counts = get_job_counts()
+    by_status = job_counts["by_status"]
+    counts = {
+        "resumes": db.resumes.estimated_document_count(),
+        "jobs": job_counts["total"],
+        "pending": by_status.get("applied", 0),
+        "offers": by_status.get("offered", 0),
+        "responded": sum(by_status.get(status, 0) for status in RESPONDED_STATUSES),
+        "by_status": by_status,
+    }
+    pending_ingests = get_active_ingests()
+    return render_template('dashboard.html', resumes=resumes, jobs=jobs, next_cursor=next_cursor,
+                           counts=counts, pending_ingests=pending_ingests)
+
+@app.route('/api/jobs')
+def api_jobs():
+    try:
+        jobs, next_cursor = get_jobs_page(
+            limit=request.args.get('limit', JOB_PAGE_SIZE, type=int),
+            after=request.args.get('after'),
+            status=request.args.get('status')
+        )
+    except ValueError:
+        return jsonify({'error': 'Invalid cursor'}), 400
+    for job in jobs:
+        job["_id"] = str(job["_id"])
+        job["check_match_url"] = url_for('check_match', job_id=job["_id"]) if job.get("has_description") else None
+    return jsonify({'jobs': jobs, 'next_cursor': next_cursor})
+
+@app.route('/api/search_jobs')
+def api_search_jobs():
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'error': 'Missing search query'}), 400
+    results = search_jobs(
+        query,
+        limit=request.args.get('limit', 20, type=int),
+        status=request.args.get('status')
+    )
+    for job in results['results']:
+        job["check_match_url"] = url_for('check_match', job_id=job["_id"]) if job["has_description"] else None
+    return jsonify(results)
 
 @app.route('/add_job', methods=['GET', 'POST'])
 def add_job():
@@ -104,16 +233,18 @@ def add_job():
         job_description = request.form['job_description']
         application_date = request.form['application_date']
         status = request.form['status']
-        db = get_db()
-        db.jobs.insert_one({
+        job = {
             "company": company,
             "position": position,
             "job_description": job_description,
+            "analysis": build_analysis(job_description),
             "application_date": application_date,
             "status": status,
             "created_at": datetime.utcnow(),
             "updated_at": datetime.utcnow()
-        })
+        }
+        job_id = insert_job(job)
+        index_job(dict(job, _id=job_id))
         flash('Job added successfully!')
         return redirect(url_for('dashboard'))
     return render_template('add_job.html')
@@ -130,39 +261,61 @@ def api_parse_resume():
             filename = secure_filename(file.filename)
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             filename = f"{timestamp}_{filename}"
-            filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            file.save(filepath)
-            parser = ResumeParser()
-            parsed_data = parser.parse_resume(filepath)
-            os.remove(filepath)
+            data, file_hash = read_upload(file)
+            existing = find_parsed_duplicate(file_hash)
+            if existing:
+                return jsonify({
+                    'success': True,
+                    'duplicate': True,
+                    'resume_id': str(existing["_id"]),
+                    'data': existing.get("parsed_data")
+                })
+            job_id = get_ingest_queue().submit(data, filename, file.filename, file_hash)
             return jsonify({
                 'success': True,
-                'data': parsed_data
-            })
+                'job_id': job_id,
+                'status_url': url_for('api_parse_status', job_id=job_id)
+            }), 202
+        except QueueFull as e:
+            return jsonify({'error': str(e)}), 503
         except Exception as e:
             return jsonify({'error': str(e)}), 500
     return jsonify({'error': 'Invalid file type'}), 400
 
+@app.route('/api/parse_status/<string:job_id>')
+def api_parse_status(job_id):
+    try:
+        status = get_ingest_status(job_id)
+    except Exception:
+        return jsonify({'error': 'Invalid job ID'}), 400
+    if not status:
+        return jsonify({'error': 'Job not found'}), 404
+    if status['status'] == 'done' and status['resume_id']:
+        resume = get_db().resumes.find_one({"_id": ObjectId(status['resume_id'])}, {"parsed_data": 1})
+        if resume:
+            status['data'] = resume.get("parsed_data")
+    return jsonify(status)
+
 @app.route('/find_jobs', methods=['GET', 'POST'])
 def find_jobs():
-    results = []
     query = ''
     location = ''
     page = 1
+    pages = 1
     if request.method == 'POST':
         query = request.form.get('query', '').strip()
         location = request.form.get('location', '').strip()
-        page = int(request.form.get('page', '1') or '1')
+        page = max(1, int(request.form.get('page', '1') or '1'))
+        pages = max(1, min(int(request.form.get('pages', '1') or '1'), MAX_FANOUT_PAGES))
         if not query:
             flash('Please enter a search query')
         else:
-            try:
-                results = search_timesjobs_jobs(query=query, location=location, page=page, max_results=20)
-                if not results:
-                    flash('No results found. Try a simpler keyword or leave location empty.')
-            except Exception as e:
-                flash(f'Error fetching jobs: {str(e)}')
-    return render_template('find_jobs.html', results=results, query=query, location=location, page=page)
+            # Pages are fetched concurrently and rendered in order as they arrive.
+            batches = iter_timesjobs_pages(query, location, start_page=page, pages=pages, max_results=20)
+            return stream_template('find_jobs.html', batches=batches, query=query, location=location,
+                                   page=page, pages=pages, max_pages=MAX_FANOUT_PAGES)
+    return render_template('find_jobs.html', batches=None, query=query, location=location,
+                           page=page, pages=pages, max_pages=MAX_FANOUT_PAGES)
 
 @app.route('/import_job', methods=['POST'])
 def import_job():
@@ -176,24 +329,129 @@ def import_job():
         description = f"Location: {job_location}\n\n{description}"
     if job_link:
         description = f"Link: {job_link}\n\n{description}"
-    db = get_db()
     application_date = datetime.utcnow().date().isoformat()
     status = "applied"
 
-    db.jobs.insert_one({
+    job = {
         "company": company,
         "position": title,
         "job_description": description,
+        "analysis": build_analysis(description),
         "application_date": application_date,
         "status": status,
         "created_at": datetime.utcnow(),
         "updated_at": datetime.utcnow()
-    })
+    }
+    job_id = insert_job(job)
+    index_job(dict(job, _id=job_id))
     flash('Job imported successfully!')
     return redirect(url_for('dashboard'))
 
-from bson import ObjectId
-import ast
+@app.route('/api/match_all')
+def api_match_all():
+    from services.batch_matcher import BatchMatcher
+    db = get_db()
+    top_k = request.args.get('top_k', 10, type=int)
+    all_resumes = request.args.get('all_resumes', 'false').lower() == 'true'
+    resume_id = request.args.get('resume_id')
+
+    if all_resumes:
+        resumes = list(db.resumes.find({}, {"features": 1}).sort("upload_date", -1))
+    elif resume_id:
+        try:
+            resumes = [db.resumes.find_one({"_id": ObjectId(resume_id)}, {"features": 1})]
+        except Exception:
+            return jsonify({'error': 'Invalid resume ID'}), 400
+    else:
+        resumes = [db.resumes.find_one({}, {"features": 1}, sort=[("upload_date", -1)])]
+    resumes = [r for r in resumes if r]
+    if not resumes:
+        return jsonify({'error': 'No resume found'}), 404
+
+    jobs = list(db.jobs.find({}, {"company": 1, "position": 1, "status": 1, "analysis": 1}))
+
+    features = get_features_for(resumes)
+    resumes = [resume for resume in resumes if resume["_id"] in features]
+    if not resumes:
+        return jsonify({'error': 'No resume found'}), 404
+
+    batch = BatchMatcher()
+    resume_batch = batch.encode_resumes([features[resume["_id"]] for resume in resumes])
+    analyses = get_analyses_for(jobs)
+    jobs = [job for job in jobs if job["_id"] in analyses]
+    job_batch = batch.encode_jobs([analyses[job["_id"]] for job in jobs])
+    scores = batch.score(resume_batch, job_batch)
+
+    results = []
+    for row, resume in enumerate(resumes):
+        ranked = []
+        for col in batch.top_k(scores['match_score'][row], top_k):
+            job = jobs[col]
+            ranked.append({
+                'job_id': str(job["_id"]),
+                'company': job.get("company"),
+                'position': job.get("position"),
+                'status': job.get("status"),
+                'match_score': float(scores['match_score'][row, col]),
+                'skill_match_score': round(float(scores['skill_match_score'][row, col]), 1),
+                'experience_match_score': float(scores['experience_match_score'][row, col]),
+                'industry_match_score': float(scores['industry_match_score'][row, col]),
+            })
+        results.append({'resume_id': str(resume["_id"]), 'jobs': ranked})
+
+    return jsonify({
+        'success': True,
+        'total_jobs': len(jobs),
+        'results': results if all_resumes else results[0]['jobs'],
+        'resume_id': None if all_resumes else results[0]['resume_id'],
+    })
+
+@app.route('/healthz/ready')
+def healthz_ready():
+    # gunicorn's hooks warm the state before the first request. Under flask
+    # run or a test client nothing does, so the first check starts it.
+    status = warmup.status()
+    if not status['ready']:
+        warmup.warm_in_background(app)
+    return jsonify(status), 200 if status['ready'] else 503
+
+@app.route('/api/db_stats')
+def api_db_stats():
+    return jsonify(get_pool_stats())
+
+@app.route('/api/search_cache_stats')
+def api_search_cache_stats():
+    return jsonify(get_search_cache_stats())
+
+@app.route('/metrics')
+def prometheus_metrics():
+    return Response(metrics.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+def require_profile_admin():
+    """Allow the profile pages once PROFILE_TOKEN has been sent in the X-Profile header (remembered in the session)"""
+    if profiling.is_admin(request.headers.get(profiling.PROFILE_HEADER)):
+        session['profile_admin'] = profiling.admin_grant()
+    elif not profiling.has_admin_grant(session.get('profile_admin')):
+        abort(404)
+
+@app.route('/admin/profiles')
+def list_profiles():
+    require_profile_admin()
+    return render_template('profiles.html', profiles=profiling.list_profiles(),
+                           sample_rate=profiling.PROFILE_SAMPLE_RATE)
+
+@app.route('/admin/profiles/<string:name>')
+def download_profile(name):
+    require_profile_admin()
+    if request.args.get('format') == 'text':
+        report = profiling.summarize(name, sort=request.args.get('sort', 'cumulative'))
+        if report is None:
+            abort(404)
+        return Response(report, mimetype='text/plain')
+    path = profiling.profile_path(name)
+    if not path:
+        abort(404)
+    return send_file(path, as_attachment=True, download_name=name)
 
 @app.route('/check_match/<string:job_id>')
 def check_match(job_id):
@@ -221,25 +479,40 @@ def check_match(job_id):
     logger.debug(f"Resume data: {resume}")
 
     try:
-        # Parse stored resume data
-        parsed_data_field = resume.get("parsed_data", "{}")
-        if isinstance(parsed_data_field, str):
-            resume_data = ast.literal_eval(parsed_data_field)
+        # Parsed data is only needed for display; matching reads the stored features
+        resume_data = load_parsed_data(resume)
+        features = get_resume_features(resume)
+
+        from services.job_matcher import JobMatcher, config_version
+
+        job_description = job.get("job_description", "")
+        job_analysis = get_job_analysis(job)
+        job_hash = job_analysis["description_hash"]
+        resume_hash = features_hash(features)
+        version = config_version()
+
+        cached = get_match_result(resume["_id"], job["_id"], job_hash, resume_hash, version)
+        if cached:
+            match_score = cached["match_score"]
+            analysis_details = cached["analysis"]
+            missing_skills = cached["missing_keywords"]
+            skill_suggestions = cached["skill_suggestions"]
         else:
-            resume_data = parsed_data_field
+            matcher = JobMatcher()
 
-        from services.job_matcher import JobMatcher
-        matcher = JobMatcher()
+            # Compute match score and analysis
+            match_score, analysis_details = matcher.calculate_match_score(
+                resume_data, job_description, features, job_analysis
+            )
 
-        # Compute match score and analysis
-        match_score, analysis_details = matcher.calculate_match_score(
-            resume_data, job.get("job_description", "")
-        )
+            missing_skills = analysis_details.get("missing_skills", [])
+            skill_suggestions = matcher.get_skill_suggestions(missing_skills)
 
-        missing_skills = matcher._find_missing_skills_enhanced(
-            resume_data, analysis_details.get("job_skills", [])
-        )
-        skill_suggestions = matcher.get_skill_suggestions(missing_skills)
+            if analysis_details:
+                save_match_result(
+                    resume["_id"], job["_id"], job_hash, resume_hash, version,
+                    match_score, analysis_details, missing_skills, skill_suggestions
+                )
 
         logger.debug(f"Resume data type: {type(resume_data)}")
         logger.debug(f"Job description type: {type(job.get('job_description'))}")
@@ -267,7 +540,81 @@ def check_match(job_id):
         return redirect(url_for('dashboard'))
 
 
+@app.cli.command('ingest-resumes')
+@click.argument('directory', required=False, type=click.Path(exists=True, file_okay=False))
+@click.option('--workers', type=int, default=None, help='Parser processes (default: CPU count).')
+@click.option('--chunk-size', type=int, default=100, show_default=True, help='Documents per insert_many batch.')
+@click.option('--reparse', is_flag=True, help='Re-parse every stored resume instead of reading a directory.')
+def ingest_resumes_command(directory, workers, chunk_size, reparse):
+    """Bulk-parse resumes from DIRECTORY (PDF/DOCX/TXT) into the database."""
+    from services.bulk_ingest import ingest_directory, reparse_stored_resumes
+    if reparse:
+        stats = reparse_stored_resumes(workers=workers, chunk_size=chunk_size)
+        click.echo(f"Re-parsed {stats['updated']} resumes in {stats['seconds']}s "
+                   f"({stats['docs_per_sec']} docs/sec); {stats['skipped']} without stored text skipped.")
+        return
+    if not directory:
+        raise click.UsageError('DIRECTORY is required unless --reparse is given.')
+    stats = ingest_directory(directory, workers=workers, chunk_size=chunk_size)
+    for error in stats['errors']:
+        click.echo(f"  failed: {error['file']}: {error['error']}", err=True)
+    click.echo(f"Parsed {stats['files']} files in {stats['seconds']}s ({stats['docs_per_sec']} docs/sec): "
+               f"{stats['inserted']} inserted, {stats['duplicates']} duplicates, {stats['failed']} failed.")
+
+
+@app.cli.command('backfill-features')
+@click.option('--chunk-size', type=int, default=200, show_default=True, help='Resumes per bulk write.')
+@click.option('--force', is_flag=True, help='Rebuild every record, not only missing or outdated ones.')
+def backfill_features_command(chunk_size, force):
+    """Build the matching feature record for resumes that lack a current one."""
+    stats = backfill_features(chunk_size=chunk_size, force=force)
+    click.echo(f"Built features for {stats['updated']} resumes; {stats['failed']} failed.")
+
+
+@app.cli.command('backfill-job-analysis')
+@click.option('--chunk-size', type=int, default=200, show_default=True, help='Jobs per bulk write.')
+@click.option('--force', is_flag=True, help='Recompute every job, not only missing or outdated ones.')
+def backfill_job_analysis_command(chunk_size, force):
+    """Recompute stored job description analyses that are missing or outdated."""
+    stats = backfill_job_analysis(chunk_size=chunk_size, force=force)
+    click.echo(f"Checked {stats['checked']} jobs; recomputed {stats['updated']} analyses.")
+
+
+@app.cli.command('rebuild-search-index')
+def rebuild_search_index_command():
+    """Rebuild the job search index from the jobs collection and save it to disk."""
+    start = time.perf_counter()
+    index = rebuild_index()
+    click.echo(f"Indexed {len(index)} jobs ({len(index.postings)} terms) in {time.perf_counter() - start:.2f}s.")
+
+
+@app.cli.command('rebuild-stats')
+def rebuild_stats_command():
+    """Recount the materialized job statistics from the jobs collection."""
+    stats = rebuild_job_stats()
+    click.echo(f"Rebuilt job stats: {stats['total']} jobs, {stats['statuses']} statuses, {stats['months']} months.")
+
+
+@app.cli.command('import-report')
+@click.option('--module', default='app', show_default=True, help='Module to import in a fresh interpreter.')
+@click.option('--limit', type=int, default=15, show_default=True, help='Rows per table.')
+def import_report_command(module, limit):
+    """Show what each module costs to import at boot (python -X importtime)."""
+    from services.import_report import import_report
+    report = import_report(module, limit=limit)
+    click.echo(f"Importing {report['module']} took {report['total_ms']:.1f} ms across {report['modules']} modules.")
+    click.echo("\nDirect imports by cumulative time:")
+    for entry in report['direct']:
+        click.echo(f"  {entry['cumulative_ms']:9.1f} ms  {entry['module']}")
+    click.echo("\nSlowest modules by own time:")
+    for entry in report['slowest_self']:
+        click.echo(f"  {entry['self_ms']:9.1f} ms  {entry['module']}")
+    heavy = [name for name in ('spacy', 'PyPDF2', 'docx', 'bs4', 'lxml', 'requests', 'numpy')
+             if name in report['loaded']]
+    click.echo(f"\nHeavy optional modules loaded at boot: {', '.join(heavy) or 'none'}")
+
 if __name__ == '__main__':
     init_db()
+    warmup.warm(app)
     port = int(os.getenv('PORT', 5000))
     app.run(host='0.0.0.0', port=port, debug=DEBUG)
@@ -0,0 +1,152 @@
+"""Seeded generator of synthetic resumes and job descriptions.
+
+The same seed always yields the same documents, so benchmark runs on
+different commits parse and match identical inputs. skill_density is the
+share of bullet words drawn from the skill taxonomy rather than filler.
+"""
+import io
+import random
+from typing import List
+from models.config import skill_categories, experience_indicators, industry_keywords
+
+FIRST_NAMES = ["Aarav", "Priya", "John", "Maria", "Wei", "Fatima", "Lucas", "Ananya", "Omar", "Emily"]
+LAST_NAMES = ["Sharma", "Smith", "Garcia", "Chen", "Khan", "Silva", "Patel", "Brown", "Ali", "Martin"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Stark Systems", "Wayne Tech", "Hooli", "Vandelay"]
+POSITIONS = ["Software Engineer", "Backend Developer", "Data Engineer", "Frontend Developer",
+             "DevOps Engineer", "Machine Learning Engineer", "Full Stack Developer"]
+UNIVERSITIES = ["Stanford University", "Delhi University", "Carnegie Mellon University", "Anna University"]
+DEGREES = ["Bachelor of Technology in Computer Science", "Master of Science in Data Science",
+           "Bachelor of Science in Information Technology"]
+CERTIFICATIONS = ["AWS Certified Solutions Architect", "Google Cloud Professional Certificate",
+                  "Azure Fundamentals Certification", "Kubernetes Administrator Certified"]
+FILLER = ("built designed maintained improved delivered reduced latency for the team across services "
+          "with a focus on reliability scale customers reporting pipelines internal tools and APIs").split()
+
+SIZES = {
+    # name: (experience entries, bullets per entry, projects, job description paragraphs)
+    "small": (2, 3, 1, 2),
+    "medium": (5, 5, 3, 5),
+    "large": (15, 8, 8, 15),
+}
+
+
+class CorpusGenerator:
+    def __init__(self, seed: int = 0, skill_density: float = 0.3):
+        self.rng = random.Random(seed)
+        self.skill_density = skill_density
+        self.skill_terms: List[str] = []
+        for skills in skill_categories.values():
+            for skill_name, variations in skills.items():
+                self.skill_terms.append(skill_name)
+                self.skill_terms.extend(variations)
+        self.industry_terms = [keyword for keywords in industry_keywords.values() for keyword in keywords]
+        self.level_terms = [indicator for indicators in experience_indicators.values() for indicator in indicators]
+
+    def _sentence(self, words: int) -> str:
+        tokens = [
+            self.rng.choice(self.skill_terms) if self.rng.random() < self.skill_density else self.rng.choice(FILLER)
+            for _ in range(words)
+        ]
+        return " ".join(tokens).capitalize()
+
+    def resume_text(self, size: str = "medium") -> str:
+        entries, bullets, projects, _ = SIZES[size]
+        rng = self.rng
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        handle = name.lower().replace(" ", ".")
+        lines = [
+            name,
+            f"{handle}@example.com | +1 555 {rng.randint(100, 999)} {rng.randint(1000, 9999)} | "
+            f"linkedin.com/in/{handle.replace('.', '-')} | github.com/{handle.replace('.', '')}",
+            f"Summary: {rng.choice(self.level_terms).title()} engineer with {rng.randint(1, 15)}+ years of experience "
+            f"in {rng.choice(self.industry_terms)}. {self._sentence(12)}.",
+            "",
+            "Experience",
+        ]
+        year = 2024
+        for _ in range(entries):
+            start = year - rng.randint(1, 4)
+            end = "Present" if year == 2024 else str(year)
+            lines.append(f"{rng.choice(COMPANIES)} - {rng.choice(POSITIONS)} - {start} - {end}")
+            lines.extend(f"• {self._sentence(rng.randint(8, 16))}" for _ in range(bullets))
+            year = start
+        lines += ["", "Education", f"{rng.choice(DEGREES)}, {rng.choice(UNIVERSITIES)}, {year - 1}", "", "Projects"]
+        for i in range(projects):
+            lines.append(f"Project {i + 1} {rng.choice(['Tracker', 'Dashboard', 'Pipeline', 'Bot'])}")
+            lines.extend(f"- {self._sentence(rng.randint(8, 14))}" for _ in range(2))
+        lines += ["", f"Skills: {', '.join(rng.sample(self.skill_terms, 12))}", "", "Certifications"]
+        lines.extend(rng.sample(CERTIFICATIONS, 2))
+        return "\n".join(lines) + "\n"
+
+    def job_description(self, size: str = "medium") -> str:
+        paragraphs = SIZES[size][3]
+        rng = self.rng
+        lines = [
+            f"We are looking for a {rng.choice(self.level_terms)} {rng.choice(POSITIONS)} to join our "
+            f"{rng.choice(self.industry_terms)} team.",
+        ]
+        for _ in range(paragraphs):
+            lines.append(self._sentence(rng.randint(20, 40)) + ".")
+        lines.append(f"Requirements: {', '.join(rng.sample(self.skill_terms, 6))}.")
+        lines.append(f"Must have: {rng.randint(2, 8)} years of experience with {rng.choice(self.skill_terms)}.")
+        lines.append(f"Qualifications: {rng.choice(DEGREES)}.")
+        return "\n".join(lines) + "\n"
+
+    def resumes(self, count: int, size: str = "medium") -> List[str]:
+        return [self.resume_text(size) for _ in range(count)]
+
+    def job_descriptions(self, count: int, size: str = "medium") -> List[str]:
+        return [self.job_description(size) for _ in range(count)]
+
+
+def to_docx(text: str) -> bytes:
+    import docx
+    document = docx.Document()
+    for line in text.splitlines():
+        document.add_paragraph(line)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def to_pdf(text: str, lines_per_page: int = 55) -> bytes:
+    """A minimal text-only PDF (Helvetica, one text object per page) that PyPDF2 can read"""
+    def escape(line: str) -> str:
+        line = line.replace("•", "-").encode("latin-1", "replace").decode("latin-1")
+        return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+    lines = text.splitlines() or [""]
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)]
+    font_id = 3
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        font_id: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    kids = []
+    next_id = 4
+    for page_lines in pages:
+        page_id, content_id = next_id, next_id + 1
+        next_id += 2
+        body = "BT /F1 10 Tf 12 TL 50 760 Td " + " ".join(f"({escape(line)}) Tj T*" for line in page_lines) + " ET"
+        stream = body.encode("latin-1")
+        objects[content_id] = b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream)
+        objects[page_id] = (
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents %d 0 R "
+            b"/Resources << /Font << /F1 %d 0 R >> >> >>" % (content_id, font_id)
+        )
+        kids.append(page_id)
+    objects[2] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        " ".join(f"{kid} 0 R" for kid in kids).encode("ascii"), len(kids))
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = {}
+    for obj_id in sorted(objects):
+        offsets[obj_id] = out.tell()
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (obj_id, objects[obj_id]))
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for obj_id in sorted(objects):
+        out.write(b"%010d 00000 n \n" % offsets[obj_id])
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
@@ -0,0 +1,267 @@
+"""Run the parser, matcher, scraper and database microbenchmarks.
+
+Inputs come from the seeded corpus generator, so two runs with the same
+options time the same documents. Results are written as JSON and can be
+compared with a stored baseline; the run fails if any benchmark's median
+is slower than the baseline by more than the threshold.
+
+    python -m benchmarks.run --size medium --output results.json
+    python -m benchmarks.run --save-baseline benchmarks/baseline.json
+    python -m benchmarks.run --baseline benchmarks/baseline.json --threshold 0.2
+
+The database benchmarks use a throwaway database on BENCH_MONGO_URI
+(default mongodb://localhost:27017) and are skipped if it is unreachable.
+"""
+import os
+
+# Set before the app modules are imported: they read these at import time,
+# and the benchmarks must never touch the configured application database.
+os.environ["MONGO_URI"] = os.getenv("BENCH_MONGO_URI", "mongodb://localhost:27017")
+os.environ["MONGO_DB_NAME"] = os.getenv("BENCH_MONGO_DB_NAME", "job_tracker_bench")
+os.environ.setdefault("MONGO_TLS", "false")
+os.environ.setdefault("MONGO_SERVER_SELECTION_TIMEOUT_MS", "2000")
+os.environ.setdefault("SPACY_AUTO_DOWNLOAD", "false")
+
+import argparse
+import json
+import logging
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Any, Optional
+from benchmarks.corpus import CorpusGenerator, SIZES, to_docx, to_pdf
+from benchmarks.scraper_parse import FIXTURE
+
+Benchmark = Callable[[], Any]
+
+
+def _time(fn: Benchmark, runs: int, warmup: int = 1) -> Dict[str, float]:
+    for _ in range(warmup):
+        fn()
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        "runs": runs,
+        "median_ms": round(statistics.median(timings), 4),
+        "mean_ms": round(statistics.fmean(timings), 4),
+        "min_ms": round(timings[0], 4),
+        "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 4),
+    }
+
+
+def _cycle(items: List) -> Callable[[], Any]:
+    """Return a function that hands out items round-robin"""
+    state = {"i": -1}
+
+    def next_item():
+        state["i"] = (state["i"] + 1) % len(items)
+        return items[state["i"]]
+    return next_item
+
+
+def parser_benchmarks(corpus: CorpusGenerator, size: str, count: int) -> Dict[str, Benchmark]:
+    from services.resume_parser import ResumeParser
+    parser = ResumeParser()
+    texts = corpus.resumes(count, size)
+    files = {
+        "txt": [text.encode("utf-8") for text in texts],
+        "docx": [to_docx(text) for text in texts],
+        "pdf": [to_pdf(text) for text in texts],
+    }
+    next_text = _cycle(texts)
+    benchmarks = {"parse_text": lambda: parser._parse_text(next_text(), use_nlp=False)}
+    for extension, documents in files.items():
+        next_document = _cycle(documents)
+        benchmarks[f"parse_resume_{extension}"] = (
+            lambda next_document=next_document, extension=extension:
+                parser.parse_resume(next_document(), f"resume.{extension}")
+        )
+    return benchmarks
+
+
+def matcher_benchmarks(corpus: CorpusGenerator, size: str, count: int) -> Dict[str, Benchmark]:
+    from services.resume_parser import ResumeParser
+    from services.job_matcher import JobMatcher
+    parser = ResumeParser()
+    matcher = JobMatcher()
+    resumes = [parser._parse_text(text, use_nlp=False) for text in corpus.resumes(count, size)]
+    next_pair = _cycle(list(zip(resumes, corpus.job_descriptions(count, size))))
+
+    def match():
+        resume, description = next_pair()
+        return matcher.calculate_match_score(resume, description)
+    return {"calculate_match_score": match}
+
+
+def scraper_benchmarks(fixture: str) -> Dict[str, Benchmark]:
+    from services.job_scraper import parse_job_cards, _parse_timesjobs, MAX_CACHED_RESULTS
+    if not os.path.exists(fixture):
+        logging.warning(f"Skipping scraper benchmark, {fixture} not found")
+        return {}
+    with open(fixture, "rb") as f:
+        raw = f.read()
+    return {"parse_timesjobs": lambda: _parse_timesjobs(parse_job_cards(raw), MAX_CACHED_RESULTS)}
+
+
+def database_benchmarks(corpus: CorpusGenerator, size: str, jobs: int) -> Dict[str, Benchmark]:
+    """Seed the bench database with jobs and resumes; empty if no server is reachable"""
+    from pymongo.errors import PyMongoError
+    from models import database
+    try:
+        database.get_client().admin.command("ping")
+    except PyMongoError as e:
+        logging.warning(f"Skipping database benchmarks, no MongoDB at {database.MONGO_URI}: {e}")
+        return {}
+
+    database.get_client().drop_database(database.DB_NAME)
+    database.init_db()
+    rng = corpus.rng
+    statuses = ["Applied", "Interview", "Offer", "Rejected"]
+    descriptions = corpus.job_descriptions(min(jobs, 50), size)
+    start = datetime(2024, 1, 1)
+    for i in range(jobs):
+        database.insert_job({
+            "company": f"Company {i}",
+            "position": "Software Engineer",
+            "job_description": descriptions[i % len(descriptions)],
+            "application_date": (start + timedelta(days=i // 3)).date().isoformat(),
+            "status": rng.choice(statuses),
+            "notes": "",
+        })
+
+    from services.resume_parser import ResumeParser
+    text = corpus.resume_text(size)
+    resume_hash = database.content_hash(text)
+    resume_id = database.save_resume(database.resume_document(
+        "bench.txt", "bench.txt", ResumeParser()._parse_text(text, use_nlp=False), text, content_hash=resume_hash
+    ))
+    job_id = str(database.get_db().jobs.find_one({}, {"_id": 1})["_id"])
+    database.save_match_result(resume_id, job_id, "job-hash", resume_hash, "bench", 50.0, {}, [], {})
+
+    def deep_page():
+        page, cursor = database.get_jobs_page()
+        for _ in range(4):
+            page, cursor = database.get_jobs_page(after=cursor)
+        return page
+
+    counter = {"n": 0}
+
+    def insert_job():
+        counter["n"] += 1
+        return database.insert_job({
+            "company": f"Inserted {counter['n']}",
+            "position": "Backend Developer",
+            "job_description": descriptions[0],
+            "application_date": datetime.utcnow().date().isoformat(),
+            "status": "Applied",
+            "notes": "",
+        })
+
+    return {
+        "db_insert_job": insert_job,
+        "db_get_jobs_page": database.get_jobs_page,
+        "db_get_jobs_page_5_deep": deep_page,
+        "db_get_job_counts": database.get_job_counts,
+        "db_get_job_statistics": database.get_job_statistics,
+        "db_find_resume_by_hash": lambda: database.find_resume_by_hash(resume_hash),
+        "db_get_match_result": lambda: database.get_match_result(resume_id, job_id, "job-hash", resume_hash, "bench"),
+    }
+
+
+def drop_bench_database():
+    from models import database
+    database.get_client().drop_database(database.DB_NAME)
+    database.close_db()
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    """Benchmarks whose median grew by more than threshold (0.2 = 20%) over the baseline"""
+    regressions = []
+    for name, current in results["benchmarks"].items():
+        previous = baseline.get("benchmarks", {}).get(name)
+        if not previous or not previous["median_ms"]:
+            continue
+        change = current["median_ms"] / previous["median_ms"] - 1
+        current["baseline_median_ms"] = previous["median_ms"]
+        current["change"] = round(change, 4)
+        if change > threshold:
+            regressions.append({"benchmark": name, "baseline_ms": previous["median_ms"],
+                                "current_ms": current["median_ms"], "change": round(change, 4)})
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--size", choices=sorted(SIZES), default="medium")
+    parser.add_argument("--skill-density", type=float, default=0.3)
+    parser.add_argument("--documents", type=int, default=20, help="distinct generated documents per benchmark")
+    parser.add_argument("--runs", type=int, default=30)
+    parser.add_argument("--jobs", type=int, default=500, help="jobs seeded into the bench database")
+    parser.add_argument("--fixture", default=FIXTURE, help="saved TimesJobs results page")
+    parser.add_argument("--only", help="comma-separated groups: parser,matcher,scraper,db")
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--baseline", help="compare against this results JSON")
+    parser.add_argument("--save-baseline", help="also write the results to this path as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed median slowdown before failing")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+
+    groups = set(args.only.split(",")) if args.only else {"parser", "matcher", "scraper", "db"}
+    corpus = CorpusGenerator(seed=args.seed, skill_density=args.skill_density)
+    benchmarks: Dict[str, Benchmark] = {}
+    seeded = False
+    try:
+        if "parser" in groups:
+            benchmarks.update(parser_benchmarks(corpus, args.size, args.documents))
+        if "matcher" in groups:
+            benchmarks.update(matcher_benchmarks(corpus, args.size, args.documents))
+        if "scraper" in groups:
+            benchmarks.update(scraper_benchmarks(args.fixture))
+        if "db" in groups:
+            db_benchmarks = database_benchmarks(corpus, args.size, args.jobs)
+            seeded = bool(db_benchmarks)
+            benchmarks.update(db_benchmarks)
+
+        results = {
+            "created_at": datetime.utcnow().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "options": {"seed": args.seed, "size": args.size, "skill_density": args.skill_density,
+                        "documents": args.documents, "runs": args.runs, "jobs": args.jobs},
+            "benchmarks": {},
+        }
+        for name, fn in benchmarks.items():
+            results["benchmarks"][name] = _time(fn, args.runs)
+            stats = results["benchmarks"][name]
+            print(f"{name:<28} median {stats['median_ms']:9.3f} ms   p95 {stats['p95_ms']:9.3f} ms   "
+                  f"min {stats['min_ms']:9.3f} ms")
+    finally:
+        if seeded:
+            drop_bench_database()
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("options") != results["options"]:
+            print("Warning: baseline was recorded with different options", file=sys.stderr)
+        regressions = compare(results, baseline, args.threshold)
+        results["regressions"] = regressions
+        for regression in regressions:
+            print(f"REGRESSION {regression['benchmark']}: {regression['baseline_ms']:.3f} ms -> "
+                  f"{regression['current_ms']:.3f} ms ({regression['change']:+.0%})")
+
+    for path in filter(None, [args.output, args.save_baseline]):
+        with open(path, "w") as f:
+            json.dump(results, f, indent=2)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+"""Time TimesJobs result parsing on a saved results page.
+
+Compares the previous hot path (full html.parser tree plus prettify() for
+the debug snapshot) with the targeted parse the scraper uses now, and
+checks that both return the same jobs.
+
+    python -m benchmarks.scraper_parse --runs 20
+"""
+import argparse
+import os
+import statistics
+import time
+from bs4 import BeautifulSoup
+from services.job_scraper import parse_job_cards, _parse_timesjobs, MAX_CACHED_RESULTS, HTML_PARSER
+
+FIXTURE = os.path.join("data", "debug", "timesjobs_last.html")
+
+
+def _full_parse(raw: bytes):
+    soup = BeautifulSoup(raw.decode("utf-8"), "html.parser")
+    soup.prettify()
+    return _parse_timesjobs(soup, MAX_CACHED_RESULTS)
+
+
+def _targeted_parse(raw: bytes):
+    return _parse_timesjobs(parse_job_cards(raw), MAX_CACHED_RESULTS)
+
+
+def _time(fn, raw: bytes, runs: int):
+    timings = []
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn(raw)
+        timings.append((time.perf_counter() - start) * 1000)
+    return result, timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixture", default=FIXTURE)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    with open(args.fixture, "rb") as f:
+        raw = f.read()
+
+    baseline, baseline_ms = _time(_full_parse, raw, args.runs)
+    targeted, targeted_ms = _time(_targeted_parse, raw, args.runs)
+    if baseline != targeted:
+        raise SystemExit("Targeted parse returned different jobs than the full parse")
+
+    print(f"Fixture: {args.fixture} ({len(raw) / 1024:.0f} KiB, {len(targeted)} jobs), {args.runs} runs")
+    for name, timings in (("html.parser + prettify", baseline_ms), (f"{HTML_PARSER} + SoupStrainer", targeted_ms)):
+        print(f"  {name:<26} median {statistics.median(timings):8.1f} ms   min {min(timings):8.1f} ms")
+    print(f"  speedup {statistics.median(baseline_ms) / statistics.median(targeted_ms):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
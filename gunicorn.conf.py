@@ -7,6 +7,55 @@ threads = int(os.getenv('GUNICORN_THREADS', 1))
 bind = f"0.0.0.0:{os.getenv('PORT', 5000)}"
 timeout = 120
 
+# Opt in to importing the app once in the master and forking workers from
+# it, so the skill matchers, compiled templates and parser modules are
+# shared copy-on-write. With it on, a HUP reload no longer picks up code
+# changes; only a full restart does.
+preload_app = os.getenv('GUNICORN_PRELOAD', 'false').lower() == 'true'
+
 accesslog = '-'
 errorlog = '-'
-loglevel = 'info'
\ No newline at end of file
+loglevel = 'info'
+
+# Workers share their metrics through per-process snapshot files.
+os.environ.setdefault('METRICS_DIR', os.path.join('data', 'metrics'))
+
+
+def on_starting(server):
+    from services.metrics import clear_snapshots
+    clear_snapshots()
+
+
+def when_ready(server):
+    # Runs in the master after the app is preloaded and before any worker
+    # is forked. No Mongo client or thread pool may be created here.
+    if not preload_app:
+        return
+    from app import app
+    from services import warmup
+    warmup.warm(app)
+    warmup.freeze()
+
+
+def post_fork(server, worker):
+    from models.database import reset_client
+    from services.metrics import registry
+    reset_client()
+    registry.reset()
+
+
+def post_worker_init(worker):
+    # Without preloading each worker imports the app itself; warm it here so
+    # /healthz/ready only passes once the first request will be fast.
+    if not preload_app:
+        from services import warmup
+        warmup.warm(worker.wsgi)
+
+
+def worker_exit(server, worker):
+    from models.database import close_db
+    from services.metrics import flush
+    from services.job_search import save_loaded_index
+    flush(force=True)
+    save_loaded_index()
+    close_db()
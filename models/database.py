@@ -1,43 +1,295 @@
-from pymongo import MongoClient
+from pymongo import MongoClient, ReturnDocument, monitoring
+from pymongo.errors import DuplicateKeyError
 from bson import ObjectId
 from datetime import datetime
 import os
+import json
+import base64
+import hashlib
+import threading
 from dotenv import load_dotenv
+from services.metrics import observe, STAGE_METRIC
 load_dotenv()
 
 MONGO_URI = os.getenv("MONGO_URI")
 if not MONGO_URI:
     raise ValueError("MONGO_URI not set in environment variables")
-DB_NAME = "job_tracker"
+DB_NAME = os.getenv("MONGO_DB_NAME", "job_tracker")
+
+MONGO_TLS = os.getenv("MONGO_TLS", "true").lower() == "true"
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", 20))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", 0))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", 300000))
+MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", 10000))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", 10000))
+MONGO_SOCKET_TIMEOUT_MS = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", 30000))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", 10000))
+
+JOB_PAGE_SIZE = 20
+MAX_JOB_PAGE_SIZE = 100
+
+# Fields needed to list a job; the description itself is reduced to a flag.
+JOB_LIST_FIELDS = {
+    "company": 1,
+    "position": 1,
+    "application_date": 1,
+    "status": 1,
+    "has_description": {"$gt": [{"$ifNull": ["$job_description", ""]}, ""]},
+}
+RESUME_LIST_FIELDS = {
+    "original_filename": 1,
+    "upload_date": 1,
+    "has_parsed_data": {"$gt": [{"$ifNull": ["$parsed_data", None]}, None]},
+}
+
+# Materialized counters: one job_stats document plus one job_stats_monthly
+# document per application month, keyed by the month's first day.
+JOB_STATS_ID = "jobs"
+
+_client = None
+_client_pid = None
+_client_lock = threading.Lock()
+
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """Counts connection pool events for the current process's client."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.connections_created = 0
+            self.connections_closed = 0
+            self.checkouts = 0
+            self.checkins = 0
+            self.checkout_failures = 0
+            self.pool_clears = 0
+            self.in_use = 0
+            self.max_in_use = 0
+
+    def _bump(self, name, delta=1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + delta)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "connections_created": self.connections_created,
+                "connections_closed": self.connections_closed,
+                "connections_open": self.connections_created - self.connections_closed,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "checkout_failures": self.checkout_failures,
+                "pool_clears": self.pool_clears,
+                "in_use": self.in_use,
+                "max_in_use": self.max_in_use,
+            }
+
+    def connection_created(self, event):
+        self._bump("connections_created")
+
+    def connection_closed(self, event):
+        self._bump("connections_closed")
+
+    def connection_checked_out(self, event):
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self.max_in_use = max(self.max_in_use, self.in_use)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checkins += 1
+            self.in_use = max(self.in_use - 1, 0)
+
+    def connection_check_out_failed(self, event):
+        self._bump("checkout_failures")
+
+    def pool_cleared(self, event):
+        self._bump("pool_clears")
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_check_out_started(self, event):
+        pass
+
+
+pool_metrics = PoolMetricsListener()
+
+
+class CommandTimingListener(monitoring.CommandListener):
+    """Records each Mongo command's server round trip as a mongo.<command> stage."""
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        observe(STAGE_METRIC, event.duration_micros / 1e6, stage=f"mongo.{event.command_name}")
+
+    def failed(self, event):
+        observe(STAGE_METRIC, event.duration_micros / 1e6, stage=f"mongo.{event.command_name}")
+
+
+command_timing = CommandTimingListener()
+
+
+def _create_client():
+    options = {
+        "maxPoolSize": MONGO_MAX_POOL_SIZE,
+        "minPoolSize": MONGO_MIN_POOL_SIZE,
+        "maxIdleTimeMS": MONGO_MAX_IDLE_TIME_MS,
+        "connectTimeoutMS": MONGO_CONNECT_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "socketTimeoutMS": MONGO_SOCKET_TIMEOUT_MS,
+        "waitQueueTimeoutMS": MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        "event_listeners": [pool_metrics, command_timing],
+    }
+    if MONGO_TLS:
+        import certifi
+        options["tls"] = True
+        options["tlsCAFile"] = certifi.where()
+    return MongoClient(MONGO_URI, **options)
+
+
+def get_client():
+    """Return the process-wide MongoClient, creating it on first use.
+
+    The client is tied to the pid that created it, so a worker forked from a
+    process that already held a client builds its own pool instead of sharing
+    sockets with the parent.
+    """
+    global _client, _client_pid
+    pid = os.getpid()
+    if _client is not None and _client_pid == pid:
+        return _client
+    with _client_lock:
+        if _client is None or _client_pid != pid:
+            # A client inherited across fork must not be closed here; its
+            # sockets belong to the parent process.
+            pool_metrics.reset()
+            _client = _create_client()
+            _client_pid = pid
+    return _client
+
 
 def get_db():
-    import certifi
-    from pymongo import MongoClient
+    return get_client()[DB_NAME]
 
-    client = MongoClient(
-        MONGO_URI,
-        tls=True,
-        tlsCAFile=certifi.where()
-    )
-    return client[DB_NAME]
+
+def reset_client():
+    """Drop the reference to an inherited client, e.g. from a post_fork hook."""
+    global _client, _client_pid
+    with _client_lock:
+        _client = None
+        _client_pid = None
+        pool_metrics.reset()
+
+
+def get_pool_stats():
+    stats = pool_metrics.snapshot()
+    stats.update({
+        "pid": os.getpid(),
+        "client_active": _client is not None and _client_pid == os.getpid(),
+        "max_pool_size": MONGO_MAX_POOL_SIZE,
+        "min_pool_size": MONGO_MIN_POOL_SIZE,
+    })
+    return stats
 
 
 def init_db():
     db = get_db()
 
-    for collection in ["resumes", "jobs", "job_applications", "skills", "resume_skills"]:
+    for collection in ["resumes", "jobs", "job_applications", "skills", "resume_skills", "ingest_jobs",
+                       "job_stats", "job_stats_monthly"]:
         if collection not in db.list_collection_names():
             db.create_collection(collection)
 
     db.jobs.create_index("status")              
     db.jobs.create_index("application_date")   
+    db.jobs.create_index([("application_date", -1), ("_id", -1)])
+    db.jobs.create_index([("status", 1), ("application_date", -1), ("_id", -1)])
+    db.jobs.create_index("updated_at")
     db.resumes.create_index("upload_date")       
+    db.resumes.create_index(
+        "content_hash",
+        unique=True,
+        partialFilterExpression={"content_hash": {"$exists": True}}
+    )
+    db.job_applications.create_index(
+        [("resume_id", 1), ("job_id", 1)],
+        unique=True,
+        partialFilterExpression={"config_version": {"$exists": True}}
+    )
     db.skills.create_index("name", unique=True)  
+    db.ingest_jobs.create_index([("status", 1), ("created_at", -1)])
+
+    if db.job_stats.find_one({"_id": JOB_STATS_ID}) is None:
+        rebuild_job_stats()
 
     print("MongoDB database initialized successfully.")
 
 
 
+def resume_document(filename, original_filename, parsed_data, resume_text=None,
+                    content_hash=None, parser_version=None, features=None):
+    now = datetime.utcnow()
+    document = {
+        "filename": filename,
+        "original_filename": original_filename,
+        "upload_date": now,
+        "parsed_data": parsed_data,
+        "resume_text": resume_text,
+        "created_at": now
+    }
+    if content_hash:
+        document["content_hash"] = content_hash
+        document["parser_version"] = parser_version
+    if features:
+        document["features"] = features
+    return document
+
+def find_resume_by_hash(content_hash):
+    db = get_db()
+    return db.resumes.find_one({"content_hash": content_hash}, {"parsed_data": 1, "parser_version": 1})
+
+def touch_resume(resume_id):
+    db = get_db()
+    db.resumes.update_one({"_id": ObjectId(resume_id)}, {"$set": {"upload_date": datetime.utcnow()}})
+
+def save_resume(document):
+    """Insert a parsed resume, or refresh the stored one with the same content hash"""
+    db = get_db()
+    if not document.get("content_hash"):
+        return db.resumes.insert_one(document).inserted_id
+    fields = dict(document)
+    created_at = fields.pop("created_at")
+    for attempt in range(2):
+        try:
+            saved = db.resumes.find_one_and_update(
+                {"content_hash": fields["content_hash"]},
+                {"$set": fields, "$setOnInsert": {"created_at": created_at}},
+                projection={"_id": 1},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+            return saved["_id"]
+        except DuplicateKeyError:
+            # Two identical uploads raced on the upsert; the retry updates the winner.
+            if attempt:
+                raise
+
 def get_resume_by_id(resume_id):
     db = get_db()
     return db.resumes.find_one({"_id": ObjectId(resume_id)})
@@ -56,12 +308,177 @@ def get_all_jobs():
     jobs = list(db.jobs.find().sort("application_date", -1))
     return jobs
 
+# application_date holds an ISO date string, a datetime or nothing. Sorted
+# descending, BSON puts datetimes first, then strings, then null and missing
+# values; a $lt on one type never matches the others.
+APPLICATION_DATE_TYPES = ("date", "string", "null")
+
+def _application_date_type(value):
+    if isinstance(value, datetime):
+        return "date"
+    if value is None:
+        return "null"
+    return "string"
+
+def encode_job_cursor(job):
+    """Opaque keyset cursor pointing just after job in (application_date, _id) order"""
+    application_date = job.get("application_date")
+    kind = _application_date_type(application_date)
+    value = application_date.isoformat() if kind == "date" else application_date
+    key = json.dumps([kind, value, str(job["_id"])])
+    return base64.urlsafe_b64encode(key.encode("utf-8")).decode("ascii")
+
+def decode_job_cursor(cursor):
+    """Inverse of encode_job_cursor; raises ValueError for a malformed cursor"""
+    try:
+        kind, value, job_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        if kind == "date":
+            value = datetime.fromisoformat(value)
+        elif kind == "null":
+            value = None
+        elif kind != "string" or not isinstance(value, str):
+            raise ValueError(kind)
+        return value, ObjectId(job_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+def _after_job(application_date, job_id):
+    """Filter for the jobs sorted after (application_date, job_id), across date types"""
+    kind = _application_date_type(application_date)
+    branches = [{"application_date": application_date, "_id": {"$lt": job_id}}]
+    if kind != "null":
+        branches.append({"application_date": {"$lt": application_date}})
+    for later in APPLICATION_DATE_TYPES[APPLICATION_DATE_TYPES.index(kind) + 1:]:
+        if later == "string":
+            branches.append({"application_date": {"$type": "string"}})
+        else:
+            # Matches both an explicit null and a missing field.
+            branches.append({"application_date": None})
+    return {"$or": branches}
+
+def get_jobs_page(limit=JOB_PAGE_SIZE, after=None, status=None):
+    """One page of jobs, newest application first, and the cursor for the next page.
+
+    Pages are keyed on (application_date, _id) rather than skipped to, so
+    every page is a bounded range scan of the compound index however deep it
+    is. Jobs without an application date come last. Only the list fields are
+    returned; next_cursor is None on the last page.
+    """
+    db = get_db()
+    limit = max(1, min(int(limit), MAX_JOB_PAGE_SIZE))
+    match = {}
+    if status:
+        match["status"] = status
+    if after:
+        match.update(_after_job(*decode_job_cursor(after)))
+    jobs = list(db.jobs.aggregate([
+        {"$match": match},
+        {"$sort": {"application_date": -1, "_id": -1}},
+        {"$limit": limit + 1},
+        {"$project": JOB_LIST_FIELDS},
+    ]))
+    next_cursor = None
+    if len(jobs) > limit:
+        jobs = jobs[:limit]
+        next_cursor = encode_job_cursor(jobs[-1])
+    return jobs, next_cursor
+
+def get_recent_resumes(limit=10):
+    """Newest resumes with only the fields needed to list them"""
+    db = get_db()
+    return list(db.resumes.aggregate([
+        {"$sort": {"upload_date": -1}},
+        {"$limit": limit},
+        {"$project": RESUME_LIST_FIELDS},
+    ]))
+
+def get_job_counts():
+    """Total jobs and jobs per status, read from the materialized stats"""
+    stats = _get_job_stats()
+    by_status = {status: count for status, count in stats.get("status_counts", {}).items() if count}
+    return {"total": stats.get("total", 0), "by_status": by_status}
+
+def _status_key(status):
+    """Status as a safe field name inside job_stats.status_counts"""
+    return str(status or "unknown").replace(".", "_").lstrip("$")
+
+def _month_start(application_date):
+    """First day of the application month, or None when the date cannot be read"""
+    if isinstance(application_date, datetime):
+        return datetime(application_date.year, application_date.month, 1)
+    try:
+        return datetime.strptime(str(application_date)[:7], "%Y-%m")
+    except ValueError:
+        return None
+
+def _count_job(db, status, application_date, delta):
+    result = db.job_stats.update_one(
+        {"_id": JOB_STATS_ID},
+        {"$inc": {"total": delta, f"status_counts.{_status_key(status)}": delta},
+         "$set": {"updated_at": datetime.utcnow()}}
+    )
+    month = _month_start(application_date)
+    # Until the stats have been built there is nothing to keep in step;
+    # the first read rebuilds them from the jobs collection.
+    if result.matched_count and month is not None:
+        db.job_stats_monthly.update_one({"_id": month}, {"$inc": {"count": delta}}, upsert=True)
+
+def insert_job(document):
+    """Insert a job and count it in the materialized stats"""
+    db = get_db()
+    job_id = db.jobs.insert_one(document).inserted_id
+    _count_job(db, document.get("status"), document.get("application_date"), 1)
+    return job_id
+
+def rebuild_job_stats():
+    """Recount job_stats and job_stats_monthly from the jobs collection.
+
+    Used on first start and to repair drift; jobs written while it runs may
+    need another rebuild to be counted.
+    """
+    db = get_db()
+    status_counts = {}
+    for row in db.jobs.aggregate([{"$group": {"_id": "$status", "count": {"$sum": 1}}}]):
+        key = _status_key(row["_id"])
+        status_counts[key] = status_counts.get(key, 0) + row["count"]
+    months = {}
+    for row in db.jobs.aggregate([{"$group": {"_id": "$application_date", "count": {"$sum": 1}}}]):
+        month = _month_start(row["_id"])
+        if month is not None:
+            months[month] = months.get(month, 0) + row["count"]
+
+    now = datetime.utcnow()
+    stats = {"total": sum(status_counts.values()), "status_counts": status_counts,
+             "updated_at": now, "rebuilt_at": now}
+    db.job_stats.replace_one({"_id": JOB_STATS_ID}, stats, upsert=True)
+    db.job_stats_monthly.delete_many({})
+    if months:
+        db.job_stats_monthly.insert_many([{"_id": month, "count": count} for month, count in months.items()])
+    return {"total": stats["total"], "statuses": len(status_counts), "months": len(months)}
+
+def _get_job_stats():
+    db = get_db()
+    stats = db.job_stats.find_one({"_id": JOB_STATS_ID})
+    if stats is None:
+        rebuild_job_stats()
+        stats = db.job_stats.find_one({"_id": JOB_STATS_ID}) or {}
+    return stats
+
 def update_job_status(job_id, status):
     db = get_db()
-    db.jobs.update_one(
+    previous = db.jobs.find_one_and_update(
         {"_id": ObjectId(job_id)},
-        {"$set": {"status": status, "updated_at": datetime.utcnow()}}
+        {"$set": {"status": status, "updated_at": datetime.utcnow()}},
+        projection={"status": 1},
+        return_document=ReturnDocument.BEFORE
     )
+    if previous and _status_key(previous.get("status")) != _status_key(status):
+        db.job_stats.update_one(
+            {"_id": JOB_STATS_ID},
+            {"$inc": {f"status_counts.{_status_key(previous.get('status'))}": -1,
+                      f"status_counts.{_status_key(status)}": 1},
+             "$set": {"updated_at": datetime.utcnow()}}
+        )
 
 def add_follow_up_note(job_id, notes):
     db = get_db()
@@ -71,28 +488,23 @@ def add_follow_up_note(job_id, notes):
     )
 
 def get_job_statistics():
+    """Status counts, total and the six latest months, read from the materialized stats"""
     db = get_db()
+    stats = _get_job_stats()
 
-    status_counts = list(db.jobs.aggregate([
-        {"$group": {"_id": "$status", "count": {"$sum": 1}}}
-    ]))
-
-    total_applications = db.jobs.count_documents({})
+    status_counts = [
+        {"_id": status, "count": count}
+        for status, count in stats.get("status_counts", {}).items() if count
+    ]
 
-    monthly_counts = list(db.jobs.aggregate([
-        {
-            "$group": {
-                "_id": {"$substr": ["$application_date", 0, 7]},
-                "count": {"$sum": 1}
-            }
-        },
-        {"$sort": {"_id": -1}},
-        {"$limit": 6}
-    ]))
+    monthly_counts = [
+        {"_id": bucket["_id"].strftime("%Y-%m"), "month": bucket["_id"], "count": bucket["count"]}
+        for bucket in db.job_stats_monthly.find({"count": {"$gt": 0}}).sort("_id", -1).limit(6)
+    ]
 
     return {
         "status_counts": status_counts,
-        "total_applications": total_applications,
+        "total_applications": stats.get("total", 0),
         "monthly_counts": monthly_counts
     }
 
@@ -107,6 +519,55 @@ def add_job_application(job_id, resume_id, match_score=None, missing_keywords=No
     }
     db.job_applications.insert_one(data)
 
+def chunked(items, size):
+    """Yield lists of up to size items, e.g. to group documents into bulk writes"""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def content_hash(value):
+    """Stable SHA-256 of a string or JSON-like document, used as a cache key"""
+    if not isinstance(value, str):
+        value = json.dumps(value, sort_keys=True, default=str)
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+def get_match_result(resume_id, job_id, job_hash, resume_hash, config_version):
+    """Cached match for this resume/job pair, or None if either side or the config changed"""
+    db = get_db()
+    return db.job_applications.find_one({
+        "resume_id": ObjectId(resume_id),
+        "job_id": ObjectId(job_id),
+        "job_hash": job_hash,
+        "resume_hash": resume_hash,
+        "config_version": config_version
+    })
+
+def save_match_result(resume_id, job_id, job_hash, resume_hash, config_version,
+                      match_score, analysis, missing_keywords, skill_suggestions):
+    db = get_db()
+    db.job_applications.update_one(
+        {"resume_id": ObjectId(resume_id), "job_id": ObjectId(job_id), "config_version": {"$exists": True}},
+        {
+            "$set": {
+                "job_hash": job_hash,
+                "resume_hash": resume_hash,
+                "config_version": config_version,
+                "match_score": match_score,
+                "analysis": analysis,
+                "missing_keywords": missing_keywords or [],
+                "skill_suggestions": skill_suggestions or {},
+                "computed_at": datetime.utcnow()
+            },
+            "$setOnInsert": {"application_date": datetime.utcnow()}
+        },
+        upsert=True
+    )
+
 def add_skill(name, category=None):
     db = get_db()
     db.skills.update_one(
@@ -126,5 +587,11 @@ def link_resume_skill(resume_id, skill_id, confidence_score=1.0):
         upsert=True
     )
 
-def close_db(_):
-    pass
+def close_db(_=None):
+    """Close this process's client and its pool; safe to call more than once."""
+    global _client, _client_pid
+    with _client_lock:
+        if _client is not None and _client_pid == os.getpid():
+            _client.close()
+        _client = None
+        _client_pid = None
@@ -0,0 +1,147 @@
+import numpy as np
+from typing import Dict, List, Any, NamedTuple, Optional
+import logging
+from models.config import industry_keywords
+from services.job_matcher import JobMatcher
+
+logger = logging.getLogger(__name__)
+
+LEVEL_CODES = {'entry': 0, 'mid': 1}
+SENIOR_CODE = 2
+
+
+class JobBatch(NamedTuple):
+    skills: np.ndarray        # (n_jobs, n_skills) bool
+    levels: np.ndarray        # (n_jobs,) int8, 0=entry 1=mid 2=anything else
+    industries: np.ndarray    # (n_jobs, n_industries) bool
+
+
+class ResumeBatch(NamedTuple):
+    skills: np.ndarray        # (n_resumes, n_skills) bool, exact taxonomy hits
+    related: np.ndarray       # (n_resumes, n_skills) bool, job skills counted as partial matches
+    skill_counts: np.ndarray  # (n_resumes,) size of each resume's skill set
+    years: np.ndarray         # (n_resumes,) float
+    industries: np.ndarray    # (n_resumes, n_industries) bool
+
+
+class BatchMatcher:
+    """Scores many resumes against many jobs with array operations.
+
+    Resumes and jobs are encoded once as boolean vectors over the canonical
+    skill vocabulary and the industry list; skill, experience and industry
+    scores for every (resume, job) pair then come out of a couple of matrix
+    products. Scores follow JobMatcher.calculate_match_score exactly.
+    """
+
+    def __init__(self, matcher: Optional[JobMatcher] = None):
+        self.matcher = matcher or JobMatcher()
+        self.skills: List[str] = self.matcher.skill_index.skills
+        self.skill_ids = self.matcher.skill_index.skill_ids
+        self.industries = list(industry_keywords)
+        self.industry_ids = {industry: i for i, industry in enumerate(self.industries)}
+        index = self.matcher.skill_index
+        categories = [index.category_of(skill) for skill in self.skills]
+        self.category_ids = {category: i for i, category in enumerate(dict.fromkeys(c for c in categories if c))}
+        self.skill_categories = np.array([self.category_ids.get(c, -1) for c in categories], dtype=np.int32)
+        self._related_rows: Dict[str, np.ndarray] = {}
+
+    def related_row(self, resume_skill: str) -> np.ndarray:
+        """Bool vector over the vocabulary: skills SkillIndex.related() pairs with resume_skill.
+
+        Computed once per distinct resume skill: same category as the skill,
+        or either one a prefix of the other.
+        """
+        row = self._related_rows.get(resume_skill)
+        if row is None:
+            category = self.category_ids.get(self.matcher.skill_index.category_of(resume_skill), -2)
+            row = self.skill_categories == category
+            for col, skill in enumerate(self.skills):
+                if skill.startswith(resume_skill) or resume_skill.startswith(skill):
+                    row[col] = True
+            self._related_rows[resume_skill] = row
+        return row
+
+    def encode_jobs(self, analyses: List[Dict[str, Any]]) -> JobBatch:
+        """Encode job analyses as produced by JobMatcher._analyze_job_description_enhanced"""
+        n = len(analyses)
+        skills = np.zeros((n, len(self.skills)), dtype=bool)
+        levels = np.full(n, SENIOR_CODE, dtype=np.int8)
+        industries = np.zeros((n, len(self.industries)), dtype=bool)
+        for row, analysis in enumerate(analyses):
+            for skill in analysis.get('technical_skills', []):
+                col = self.skill_ids.get(skill)
+                if col is not None:
+                    skills[row, col] = True
+            levels[row] = LEVEL_CODES.get(analysis.get('experience_level'), SENIOR_CODE)
+            for industry in analysis.get('industry_focus', []):
+                col = self.industry_ids.get(industry)
+                if col is not None:
+                    industries[row, col] = True
+        return JobBatch(skills, levels, industries)
+
+    def encode_resumes(self, profiles: List[Dict[str, Any]]) -> ResumeBatch:
+        """Encode stored resume features (see services.resume_features.build_features).
+
+        The exact-match row is the stored skill_ids; skill names are only
+        read for the partial matches.
+        """
+        n = len(profiles)
+        skills = np.zeros((n, len(self.skills)), dtype=bool)
+        related = np.zeros((n, len(self.skills)), dtype=bool)
+        skill_counts = np.zeros(n, dtype=np.float64)
+        years = np.zeros(n, dtype=np.float64)
+        industries = np.zeros((n, len(self.industries)), dtype=bool)
+        for row, profile in enumerate(profiles):
+            resume_set = set(profile.get('skills', []))
+            skill_counts[row] = len(resume_set)
+            years[row] = profile.get('total_years', 0) or 0
+            skills[row, profile.get('skill_ids', [])] = True
+            for skill in resume_set:
+                related[row] |= self.related_row(skill)
+            related[row] &= ~skills[row]
+            for industry in profile.get('industries', []):
+                col = self.industry_ids.get(industry)
+                if col is not None:
+                    industries[row, col] = True
+        return ResumeBatch(skills, related, skill_counts, years, industries)
+
+    def score(self, resumes: ResumeBatch, jobs: JobBatch) -> Dict[str, np.ndarray]:
+        """Return (n_resumes, n_jobs) arrays for each component and the final score"""
+        job_skills = jobs.skills.astype(np.float64)
+        exact = resumes.skills.astype(np.float64) @ job_skills.T
+        partial = resumes.related.astype(np.float64) @ job_skills.T
+        job_sizes = job_skills.sum(axis=1)[None, :]
+        safe_sizes = np.maximum(job_sizes, 1)
+
+        base = (exact + 0.5 * partial) / safe_sizes
+        coverage_bonus = np.minimum(resumes.skill_counts[:, None] / safe_sizes, 1.5) - 1.0
+        skill_scores = np.where(job_sizes > 0, np.minimum(base + coverage_bonus * 0.1, 1.0) * 100, 0.0)
+
+        years = resumes.years[:, None]
+        levels = jobs.levels[None, :]
+        entry = np.select([years <= 2, years <= 5], [100.0, 70.0], 40.0)
+        mid = np.select([(years >= 2) & (years <= 7), years < 2], [100.0, 60.0], 80.0)
+        senior = np.select([years >= 5, years >= 3], [100.0, 80.0], 50.0)
+        experience_scores = np.select([levels == 0, levels == 1], [entry, mid], senior)
+
+        overlap = (resumes.industries.astype(np.int32) @ jobs.industries.T.astype(np.int32)) > 0
+        job_has = jobs.industries.any(axis=1)[None, :]
+        resume_has = resumes.industries.any(axis=1)[:, None]
+        industry_scores = np.where(~job_has, 50.0, np.where(~resume_has, 30.0, np.where(overlap, 100.0, 40.0)))
+
+        final = np.round(skill_scores * 0.6 + experience_scores * 0.25 + industry_scores * 0.15, 1)
+        return {
+            'match_score': final,
+            'skill_match_score': skill_scores,
+            'experience_match_score': experience_scores,
+            'industry_match_score': industry_scores,
+        }
+
+    @staticmethod
+    def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+        """Indices of the k highest scores in a 1-D array, best first"""
+        k = min(k, scores.shape[0])
+        if k <= 0:
+            return np.array([], dtype=np.int64)
+        candidates = np.argpartition(-scores, k - 1)[:k]
+        return candidates[np.argsort(-scores[candidates], kind='stable')]
@@ -0,0 +1,136 @@
+import os
+import time
+import hashlib
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from models.database import get_db, resume_document, chunked
+from services.resume_parser import ResumeParser, PARSER_VERSION
+from services.resume_features import build_features
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.txt')
+
+# Pool workers are started with spawn, not fork: the parent may already hold
+# a MongoClient (reparse reads from Mongo before the pool starts, and the
+# CLI may have opened one), and a forked child must not inherit its sockets.
+POOL_CONTEXT = multiprocessing.get_context('spawn')
+
+_parser: Optional[ResumeParser] = None
+
+
+def _get_parser() -> ResumeParser:
+    global _parser
+    if _parser is None:
+        _parser = ResumeParser()
+    return _parser
+
+
+def _parse_file(path: str) -> Tuple[str, Optional[str], Optional[str], Optional[Dict[str, Any]], Optional[Dict[str, Any]], Optional[str]]:
+    """Process-pool task: (path, content_hash, text, parsed_data, features, error). NER is batched in the parent."""
+    try:
+        with open(path, 'rb') as file:
+            data = file.read()
+        parser = _get_parser()
+        text = parser.extract_text(data, path)
+        parsed_data = parser._parse_text(text, use_nlp=False)
+        return path, hashlib.sha256(data).hexdigest(), text, parsed_data, build_features(parsed_data), None
+    except Exception as e:
+        return path, None, None, None, None, str(e)
+
+
+def _parse_stored_text(item: Tuple[Any, str]) -> Tuple[Any, Dict[str, Any], Dict[str, Any]]:
+    resume_id, text = item
+    parsed_data = _get_parser()._parse_text(text, use_nlp=False)
+    return resume_id, parsed_data, build_features(parsed_data)
+
+
+def _process_pool(workers: Optional[int]) -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(max_workers=workers, mp_context=POOL_CONTEXT)
+
+
+def find_resume_files(directory: str) -> List[str]:
+    paths = []
+    for root, _, files in os.walk(directory):
+        for name in sorted(files):
+            if name.lower().endswith(SUPPORTED_EXTENSIONS):
+                paths.append(os.path.join(root, name))
+    return paths
+
+
+def ingest_directory(directory: str, workers: Optional[int] = None, chunk_size: int = 100) -> Dict[str, Any]:
+    """Parse every supported file under directory and insert the results in chunks"""
+    paths = find_resume_files(directory)
+    parser = _get_parser()
+    stats = {"files": len(paths), "inserted": 0, "duplicates": 0, "failed": 0, "errors": []}
+    start = time.perf_counter()
+
+    with _process_pool(workers) as pool:
+        results = pool.map(_parse_file, paths, chunksize=4)
+        # Opened once the pool has started; the workers never talk to Mongo.
+        db = get_db()
+        for chunk in chunked(results, chunk_size):
+            parsed = [(path, digest, text, data, features)
+                      for path, digest, text, data, features, error in chunk if error is None]
+            for path, _, _, _, _, error in chunk:
+                if error is not None:
+                    stats["failed"] += 1
+                    stats["errors"].append({"file": path, "error": error})
+                    logger.error(f"Error parsing resume {path}: {error}")
+            if not parsed:
+                continue
+            parser.fill_missing_names([data for _, _, _, data, _ in parsed], [text for _, _, text, _, _ in parsed])
+            documents = [
+                resume_document(os.path.basename(path), os.path.basename(path), data, text,
+                                content_hash=digest, parser_version=PARSER_VERSION, features=features)
+                for path, digest, text, data, features in parsed
+            ]
+            try:
+                db.resumes.insert_many(documents, ordered=False)
+                stats["inserted"] += len(documents)
+            except BulkWriteError as e:
+                # Files already stored under the same content hash are skipped.
+                duplicates = sum(1 for error in e.details.get("writeErrors", []) if error.get("code") == 11000)
+                stats["duplicates"] += duplicates
+                stats["inserted"] += e.details.get("nInserted", 0)
+                if duplicates != len(e.details.get("writeErrors", [])):
+                    raise
+
+    stats["seconds"] = round(time.perf_counter() - start, 3)
+    stats["docs_per_sec"] = round(stats["files"] / stats["seconds"], 2) if stats["seconds"] else 0.0
+    return stats
+
+
+def reparse_stored_resumes(workers: Optional[int] = None, chunk_size: int = 100) -> Dict[str, Any]:
+    """Re-run the parser over the full text stored with each resume"""
+    db = get_db()
+    parser = _get_parser()
+    query = {"resume_text": {"$type": "string"}}
+    stats = {
+        "files": db.resumes.count_documents(query),
+        "updated": 0,
+        "skipped": db.resumes.count_documents({"resume_text": {"$not": {"$type": "string"}}}),
+    }
+    start = time.perf_counter()
+
+    cursor = db.resumes.find(query, {"resume_text": 1})
+    items = ((doc["_id"], doc["resume_text"]) for doc in cursor)
+    with _process_pool(workers) as pool:
+        for chunk in chunked(items, chunk_size):
+            results = list(pool.map(_parse_stored_text, chunk, chunksize=8))
+            parser.fill_missing_names([data for _, data, _ in results], [text for _, text in chunk])
+            db.resumes.bulk_write(
+                [UpdateOne({"_id": resume_id}, {"$set": {"parsed_data": data, "parser_version": PARSER_VERSION,
+                                                         "features": features}})
+                 for resume_id, data, features in results],
+                ordered=False
+            )
+            stats["updated"] += len(results)
+
+    stats["seconds"] = round(time.perf_counter() - start, 3)
+    stats["docs_per_sec"] = round(stats["updated"] / stats["seconds"], 2) if stats["seconds"] else 0.0
+    return stats
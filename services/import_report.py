@@ -0,0 +1,51 @@
+import os
+import re
+import sys
+import subprocess
+from typing import Dict, List, Any
+
+# "import time:  self [us] |  cumulative | imported package", indented by depth
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)$')
+
+
+def measure_imports(module: str = 'app') -> List[Dict[str, Any]]:
+    """Import module in a fresh interpreter with -X importtime and return one entry per imported module.
+
+    Runs in a subprocess so nothing this process already imported is hidden
+    from the report. Each entry has the module name, its nesting depth and its
+    self and cumulative import time in milliseconds.
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True, env=dict(os.environ), cwd=os.getcwd()
+    )
+    entries = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        entries.append({
+            'module': name,
+            'depth': (len(indent) - 1) // 2,
+            'self_ms': int(self_us) / 1000,
+            'cumulative_ms': int(cumulative_us) / 1000,
+        })
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed: {result.stderr.strip().splitlines()[-1]}")
+    return entries
+
+
+def import_report(module: str = 'app', limit: int = 15) -> Dict[str, Any]:
+    """Total boot import time, the cost of each direct import, and the slowest modules overall"""
+    entries = measure_imports(module)
+    top = next((e for e in entries if e['module'] == module and e['depth'] == 0), None)
+    direct = [e for e in entries if e['depth'] == 1]
+    return {
+        'module': module,
+        'total_ms': top['cumulative_ms'] if top else sum(e['self_ms'] for e in entries),
+        'modules': len(entries),
+        'direct': sorted(direct, key=lambda e: e['cumulative_ms'], reverse=True)[:limit],
+        'slowest_self': sorted(entries, key=lambda e: e['self_ms'], reverse=True)[:limit],
+        'loaded': sorted({e['module'].split('.')[0] for e in entries}),
+    }
@@ -0,0 +1,207 @@
+import os
+import time
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, Set
+from bson import ObjectId
+from pymongo import ReturnDocument
+from models.database import get_db, resume_document, save_resume
+from services.resume_parser import ResumeParser, PARSER_VERSION
+from services.resume_features import build_features
+
+logger = logging.getLogger(__name__)
+
+INGEST_WORKERS = int(os.getenv('INGEST_WORKERS', 2))
+INGEST_QUEUE_SIZE = int(os.getenv('INGEST_QUEUE_SIZE', 16))
+INGEST_STALE_SECONDS = int(os.getenv('INGEST_STALE_SECONDS', 600))
+INGEST_HEARTBEAT_SECONDS = int(os.getenv('INGEST_HEARTBEAT_SECONDS', 60))
+
+STATUS_QUEUED = 'queued'
+STATUS_PROCESSING = 'processing'
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+ACTIVE_STATUSES = [STATUS_QUEUED, STATUS_PROCESSING]
+
+
+class QueueFull(Exception):
+    pass
+
+
+class IngestionQueue:
+    """Background resume parsing backed by the ingest_jobs collection.
+
+    Each upload becomes an ingest_jobs document that moves from queued to
+    processing to done/failed. The file bytes stay in memory and a bounded
+    thread pool in the current process does the parsing, so the number of
+    in-flight uploads (and their memory) is capped by max_pending. While a
+    job is queued or running here, a heartbeat keeps its updated_at fresh;
+    jobs whose heartbeat stopped belong to a process that died mid-way and
+    are marked failed on startup.
+
+    Parsing is CPU-bound, so these threads compete with the worker's request
+    thread for the GIL; bulk loads belong in services.bulk_ingest, which
+    parses in a process pool.
+    """
+
+    def __init__(self, max_workers: int = INGEST_WORKERS, max_pending: int = INGEST_QUEUE_SIZE):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='ingest')
+        self.slots = threading.BoundedSemaphore(max_pending)
+        self.pending: Set[ObjectId] = set()
+        self._pending_lock = threading.Lock()
+        self._heartbeat: Optional[threading.Thread] = None
+
+    def submit(self, data: bytes, filename: str, original_filename: str, content_hash: Optional[str] = None) -> str:
+        if not self.slots.acquire(blocking=False):
+            raise QueueFull('Resume parsing queue is full, please try again shortly')
+        try:
+            db = get_db()
+            now = datetime.utcnow()
+            job_id = db.ingest_jobs.insert_one({
+                "status": STATUS_QUEUED,
+                "stage": STATUS_QUEUED,
+                "progress": 0,
+                "size": len(data),
+                "content_hash": content_hash,
+                "filename": filename,
+                "original_filename": original_filename,
+                "created_at": now,
+                "updated_at": now
+            }).inserted_id
+            with self._pending_lock:
+                self.pending.add(job_id)
+                if self._heartbeat is None:
+                    self._heartbeat = threading.Thread(target=self._beat, name='ingest-heartbeat', daemon=True)
+                    self._heartbeat.start()
+            self.executor.submit(self._run, job_id, data)
+        except Exception:
+            self.slots.release()
+            raise
+        return str(job_id)
+
+    def heartbeat(self) -> int:
+        """Refresh updated_at of the jobs this queue still holds, so recover() elsewhere leaves them alone"""
+        with self._pending_lock:
+            job_ids = list(self.pending)
+        if not job_ids:
+            return 0
+        result = get_db().ingest_jobs.update_many(
+            {"_id": {"$in": job_ids}, "status": {"$in": ACTIVE_STATUSES}},
+            {"$set": {"updated_at": datetime.utcnow()}}
+        )
+        return result.modified_count
+
+    def _beat(self):
+        while True:
+            time.sleep(INGEST_HEARTBEAT_SECONDS)
+            try:
+                self.heartbeat()
+            except Exception as e:
+                logger.warning(f"Could not refresh ingest job heartbeats: {str(e)}")
+
+    def recover(self) -> int:
+        """Fail jobs whose heartbeat stopped: their in-memory payload died with their worker process"""
+        db = get_db()
+        stale_before = datetime.utcnow() - timedelta(seconds=INGEST_STALE_SECONDS)
+        result = db.ingest_jobs.update_many(
+            {"status": {"$in": ACTIVE_STATUSES}, "updated_at": {"$lt": stale_before}},
+            {"$set": {"status": STATUS_FAILED, "stage": STATUS_FAILED,
+                      "error": "Worker restarted before parsing finished, please upload again",
+                      "updated_at": datetime.utcnow()}}
+        )
+        return result.modified_count
+
+    def _update(self, job_id: ObjectId, **fields):
+        fields["updated_at"] = datetime.utcnow()
+        get_db().ingest_jobs.update_one({"_id": job_id}, {"$set": fields})
+
+    def _run(self, job_id: ObjectId, data: bytes):
+        try:
+            self._process(job_id, data)
+        except Exception as e:
+            logger.error(f"Ingest job {job_id} crashed: {str(e)}", exc_info=True)
+        finally:
+            with self._pending_lock:
+                self.pending.discard(job_id)
+            self.slots.release()
+
+    def _process(self, job_id: ObjectId, data: bytes):
+        db = get_db()
+        job = db.ingest_jobs.find_one_and_update(
+            {"_id": job_id, "status": STATUS_QUEUED},
+            {"$set": {"status": STATUS_PROCESSING, "stage": "extracting", "progress": 10,
+                      "pid": os.getpid(), "updated_at": datetime.utcnow()}},
+            return_document=ReturnDocument.AFTER
+        )
+        if job is None:
+            current = db.ingest_jobs.find_one({"_id": job_id}, {"status": 1, "error": 1}) or {}
+            logger.warning(f"Ingest job {job_id} could not be claimed (status {current.get('status')}, "
+                           f"error {current.get('error')!r}); skipping it")
+            return
+
+        try:
+            parser = ResumeParser()
+            text = parser.extract_text(data, job["filename"])
+            self._update(job_id, stage="parsing", progress=50)
+            parsed_data = parser._parse_text(text)
+            self._update(job_id, stage="saving", progress=90)
+            resume_id = save_resume(resume_document(
+                job["filename"], job["original_filename"], parsed_data, text,
+                content_hash=job.get("content_hash"), parser_version=PARSER_VERSION,
+                features=build_features(parsed_data)
+            ))
+            self._update(job_id, status=STATUS_DONE, stage=STATUS_DONE, progress=100, resume_id=resume_id)
+            logger.info(f"Resume {job['filename']} parsed in background (ingest job {job_id}).")
+        except Exception as e:
+            logger.error(f"Error parsing resume {job['filename']}: {str(e)}", exc_info=True)
+            self._update(job_id, status=STATUS_FAILED, stage=STATUS_FAILED, error=str(e))
+
+
+_queue: Optional[IngestionQueue] = None
+_queue_pid: Optional[int] = None
+_queue_lock = threading.Lock()
+
+
+def get_queue() -> IngestionQueue:
+    """Process-wide queue; a forked worker gets its own pool"""
+    global _queue, _queue_pid
+    pid = os.getpid()
+    if _queue is not None and _queue_pid == pid:
+        return _queue
+    with _queue_lock:
+        if _queue is None or _queue_pid != pid:
+            _queue = IngestionQueue()
+            _queue_pid = pid
+            try:
+                _queue.recover()
+            except Exception as e:
+                logger.warning(f"Could not clean up orphaned ingest jobs: {str(e)}")
+    return _queue
+
+
+def get_status(job_id: str) -> Optional[Dict[str, Any]]:
+    db = get_db()
+    job = db.ingest_jobs.find_one({"_id": ObjectId(job_id)})
+    if not job:
+        return None
+    return {
+        "job_id": str(job["_id"]),
+        "status": job["status"],
+        "stage": job.get("stage"),
+        "progress": job.get("progress", 0),
+        "original_filename": job.get("original_filename"),
+        "error": job.get("error"),
+        "resume_id": str(job["resume_id"]) if job.get("resume_id") else None
+    }
+
+
+def get_active_jobs(limit: int = 20):
+    db = get_db()
+    jobs = list(db.ingest_jobs.find(
+        {"status": {"$in": ACTIVE_STATUSES}},
+        {"original_filename": 1, "status": 1, "stage": 1, "progress": 1}
+    ).sort("created_at", -1).limit(limit))
+    for job in jobs:
+        job["_id"] = str(job["_id"])
+    return jobs
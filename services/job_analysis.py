@@ -0,0 +1,103 @@
+import logging
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+from bson import ObjectId
+from pymongo import UpdateOne
+from models.database import get_db, content_hash
+from services.job_matcher import config_version, get_matcher
+
+logger = logging.getLogger(__name__)
+
+# Bump when the layout of the stored analysis changes. The stored version also
+# carries config_version() (matcher and taxonomy), so editing either marks
+# every stored analysis stale.
+ANALYSIS_SCHEMA = 1
+
+def analysis_version() -> str:
+    return f"{ANALYSIS_SCHEMA}-{config_version()}"
+
+
+def build_analysis(job_description: str, description_hash: Optional[str] = None) -> Dict[str, Any]:
+    """JobMatcher's analysis of a description, stamped with its version and the description's hash"""
+    analysis = get_matcher()._analyze_job_description_enhanced(job_description or "")
+    analysis.update({
+        "version": analysis_version(),
+        "description_hash": description_hash or content_hash(job_description or ""),
+        "computed_at": datetime.utcnow(),
+    })
+    return analysis
+
+
+def is_current(analysis: Optional[Dict[str, Any]], description_hash: Optional[str] = None) -> bool:
+    """True if analysis was built by the current matcher (and for this description, when its hash is given)"""
+    if not analysis or analysis.get("version") != analysis_version():
+        return False
+    return description_hash is None or analysis.get("description_hash") == description_hash
+
+
+def get_job_analysis(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Stored analysis of a job document, rebuilt from its job_description and saved if missing or outdated.
+
+    The stored description_hash is trusted: descriptions are only written
+    together with their analysis (add_job, import_job), and edits made
+    outside the app are picked up by backfill_job_analysis.
+    """
+    analysis = job.get("analysis")
+    if is_current(analysis):
+        return analysis
+    if "job_description" not in job:
+        job = get_db().jobs.find_one({"_id": ObjectId(job["_id"])}, {"job_description": 1}) or {}
+    analysis = build_analysis(job.get("job_description") or "")
+    if job.get("_id") is not None:
+        get_db().jobs.update_one({"_id": ObjectId(job["_id"])}, {"$set": {"analysis": analysis}})
+    return analysis
+
+
+def get_analyses_for(jobs: List[Dict[str, Any]]) -> Dict[Any, Dict[str, Any]]:
+    """Analyses by _id for many job documents (projected with at least _id and analysis).
+
+    Descriptions are only read for jobs whose analysis is missing or from an
+    older version; those are rebuilt and saved in one bulk write. Jobs
+    deleted since they were read are left out.
+    """
+    stale_ids = [job["_id"] for job in jobs if not is_current(job.get("analysis"))]
+    rebuilt: Dict[Any, Dict[str, Any]] = {}
+    if stale_ids:
+        db = get_db()
+        for job in db.jobs.find({"_id": {"$in": stale_ids}}, {"job_description": 1}):
+            rebuilt[job["_id"]] = build_analysis(job.get("job_description") or "")
+        if rebuilt:
+            db.jobs.bulk_write(
+                [UpdateOne({"_id": job_id}, {"$set": {"analysis": analysis}}) for job_id, analysis in rebuilt.items()],
+                ordered=False
+            )
+            logger.info(f"Recomputed {len(rebuilt)} stale job analyses")
+    analyses = {}
+    for job in jobs:
+        analysis = rebuilt.get(job["_id"]) or job.get("analysis")
+        if is_current(analysis):
+            analyses[job["_id"]] = analysis
+    return analyses
+
+
+def backfill_job_analysis(chunk_size: int = 200, force: bool = False) -> Dict[str, int]:
+    """Recompute the analysis of every job whose stored one is missing, outdated or for an edited description"""
+    db = get_db()
+    stats = {"updated": 0, "checked": 0}
+    updates = []
+    for job in db.jobs.find({}, {"job_description": 1, "analysis.version": 1, "analysis.description_hash": 1}):
+        stats["checked"] += 1
+        description = job.get("job_description") or ""
+        description_hash = content_hash(description)
+        if not force and is_current(job.get("analysis"), description_hash):
+            continue
+        updates.append(UpdateOne({"_id": job["_id"]},
+                                 {"$set": {"analysis": build_analysis(description, description_hash)}}))
+        if len(updates) >= chunk_size:
+            db.jobs.bulk_write(updates, ordered=False)
+            stats["updated"] += len(updates)
+            updates = []
+    if updates:
+        db.jobs.bulk_write(updates, ordered=False)
+        stats["updated"] += len(updates)
+    return stats
@@ -1,11 +1,20 @@
-import re
-from typing import Dict, List, Any, Tuple
-from collections import Counter
+from typing import Dict, List, Any, Tuple, Optional
+from functools import lru_cache
 import logging
 from models.config import skill_categories, experience_indicators, industry_keywords
+from services.skill_taxonomy import get_skill_automaton, get_skill_index, taxonomy_version
+from services.metrics import span
+from services.patterns import REQUIREMENTS, REQUIREMENT_KINDS, SKILL_PREFIX, SKILL_SUFFIX, WHITESPACE, DURATION
 
 logger = logging.getLogger(__name__)
 
+# Bump when scoring logic changes so stored match results are recomputed.
+MATCHER_VERSION = 2
+
+
+def config_version() -> str:
+    return f"{MATCHER_VERSION}-{taxonomy_version()}"
+
 class JobMatcher:
     def __init__(self):
         self.skill_categories = skill_categories
@@ -14,15 +23,31 @@ class JobMatcher:
         
         self.industry_keywords = industry_keywords
 
-    def calculate_match_score(self, resume_data: Dict[str, Any], job_description: str) -> Tuple[float, Dict[str, Any]]:
+        self.skill_automaton = get_skill_automaton()
+        self.skill_index = get_skill_index()
+
+    @span('match')
+    def calculate_match_score(self, resume_data: Dict[str, Any], job_description: str,
+                              features: Optional[Dict[str, Any]] = None,
+                              job_analysis: Optional[Dict[str, Any]] = None) -> Tuple[float, Dict[str, Any]]:
+        """Score a resume against a job description.
+
+        features is a stored resume feature record (see services.resume_features)
+        and job_analysis a stored job analysis (see services.job_analysis); each
+        one that is given replaces re-extracting it from resume_data or
+        job_description.
+        """
         try:
-            resume_skills = self._extract_resume_skills_enhanced(resume_data)
+            if features is None:
+                features = self.resume_features(resume_data)
+            resume_skills = features['skills']
             
-            job_analysis = self._analyze_job_description_enhanced(job_description)
+            if job_analysis is None:
+                job_analysis = self._analyze_job_description_enhanced(job_description)
             
             skill_match_score = self._calculate_skill_match_score(resume_skills, job_analysis['technical_skills'])
-            experience_match_score = self._calculate_experience_match_score(resume_data, job_analysis['experience_level'])
-            industry_match_score = self._calculate_industry_match_score(resume_data, job_analysis['industry_focus'])
+            experience_match_score = self._experience_score(features['total_years'], job_analysis['experience_level'])
+            industry_match_score = self._industry_score(set(features['industries']), job_analysis['industry_focus'])
             
             final_score = (
                 skill_match_score * 0.6 +      
@@ -51,6 +76,15 @@ class JobMatcher:
             logger.error(f"Error calculating match score: {str(e)}")
             return 0.0, {}
 
+    @span('match.resume_features')
+    def resume_features(self, resume_data: Dict[str, Any]) -> Dict[str, Any]:
+        """The parts of a parsed resume the scores depend on"""
+        return {
+            'skills': sorted(self._extract_resume_skills_enhanced(resume_data)),
+            'total_years': self._calculate_total_years(resume_data),
+            'industries': sorted(self._extract_resume_industries(resume_data)),
+        }
+
     def _extract_resume_skills_enhanced(self, resume_data: Dict[str, Any]) -> List[str]:
         skills = set()
         
@@ -91,10 +125,10 @@ class JobMatcher:
     def _normalize_skill(self, skill: str) -> str:
         skill = skill.lower().strip()
         
-        skill = re.sub(r'^(expert in|proficient in|skilled in|experience with|knowledge of)\s+', '', skill)
-        skill = re.sub(r'\s+(expert|proficient|skilled|experienced|knowledge)$', '', skill)
+        skill = SKILL_PREFIX.sub('', skill)
+        skill = SKILL_SUFFIX.sub('', skill)
         
-        skill = re.sub(r'\s+', ' ', skill)  
+        skill = WHITESPACE.sub(' ', skill)
         
         return skill if len(skill) > 1 else None
 
@@ -102,18 +136,9 @@ class JobMatcher:
         if not text:
             return []
         
-        text = text.lower()
-        skills = set()
-        
-        for category, skill_dict in self.skill_categories.items():
-            for skill_name, variations in skill_dict.items():
-                for variation in variations:
-                    if variation in text:
-                        skills.add(skill_name)
-                        break
-        
-        return list(skills)
+        return self.skill_automaton.find_skills(text)
 
+    @span('match.job_analysis')
     def _analyze_job_description_enhanced(self, job_description: str) -> Dict[str, Any]:
         text_lower = job_description.lower()
         
@@ -125,12 +150,7 @@ class JobMatcher:
             'total_skills': 0
         }
         
-        for category, skill_dict in self.skill_categories.items():
-            for skill_name, variations in skill_dict.items():
-                for variation in variations:
-                    if variation in text_lower:
-                        analysis['technical_skills'].append(skill_name)
-                        break
+        analysis['technical_skills'] = self.skill_automaton.find_skills(text_lower)
         
         for level, indicators in self.experience_indicators.items():
             if any(indicator in text_lower for indicator in indicators):
@@ -141,22 +161,32 @@ class JobMatcher:
             if any(keyword in text_lower for keyword in keywords):
                 analysis['industry_focus'].append(industry)
         
-        requirement_patterns = [
-            r'requirements?[:\s]+(.*?)(?=\n|\.|;|responsibilities)',
-            r'must have[:\s]+(.*?)(?=\n|\.|;)',
-            r'looking for[:\s]+(.*?)(?=\n|\.|;)',
-            r'qualifications?[:\s]+(.*?)(?=\n|\.|;)',
-            r'experience with[:\s]+(.*?)(?=\n|\.|;)'
-        ]
-        
-        for pattern in requirement_patterns:
-            matches = re.findall(pattern, text_lower, re.IGNORECASE)
-            analysis['key_requirements'].extend(matches)
+        analysis['key_requirements'] = self._extract_key_requirements(text_lower)
         
         analysis['total_skills'] = len(analysis['technical_skills'])
         
         return analysis
 
+    def _extract_key_requirements(self, text_lower: str) -> List[str]:
+        """Requirement phrases grouped by kind, in REQUIREMENT_KINDS order"""
+        found = {kind: [] for kind in REQUIREMENT_KINDS}
+        ends = {kind: 0 for kind in REQUIREMENT_KINDS}
+        for match in REQUIREMENTS.finditer(text_lower):
+            if match.group('req') is not None:
+                kind, group = 'requirements', 'req_text'
+            else:
+                kind, group = match.group('kind'), 'text'
+                if kind.startswith('qualification'):
+                    kind = 'qualifications'
+            # The scan is zero-width, so skip phrases nested inside an earlier
+            # match of the same kind, as a separate findall per kind would.
+            if match.start() < ends[kind]:
+                continue
+            ends[kind] = match.end(group)
+            found[kind].append(match.group(group))
+        return [requirement for kind in REQUIREMENT_KINDS for requirement in found[kind]]
+
+    @span('match.skill_score')
     def _calculate_skill_match_score(self, resume_skills: List[str], job_skills: List[str]) -> float:
         if not job_skills:
             return 0.0
@@ -185,28 +215,12 @@ class JobMatcher:
         return final_score * 100
 
     def _get_skill_base_and_category(self, skill: str) -> Tuple[str | None, str | None]:
-        normalized_skill = skill.lower().strip()
-        for category, skill_dict in self.skill_categories.items():
-            if normalized_skill in skill_dict:  
-                return normalized_skill, category
-            for base_skill, variations in skill_dict.items():
-                if normalized_skill in variations: 
-                    return base_skill, category
-        return None, None
+        return self.skill_index.lookup(skill)
 
     def _are_skills_related(self, skill1: str, skill2: str) -> bool:
-        base_skill1, category1 = self._get_skill_base_and_category(skill1)
-        base_skill2, category2 = self._get_skill_base_and_category(skill2)
+        return self.skill_index.related(skill1, skill2)
 
-        if category1 and category2 and category1 == category2:
-            return True
-        
-        if skill1.startswith(skill2) or skill2.startswith(skill1):
-            return True
-        
-        return False
-
-    def _calculate_experience_match_score(self, resume_data: Dict[str, Any], job_level: str) -> float:
+    def _calculate_total_years(self, resume_data: Dict[str, Any]) -> float:
         total_years = 0
         
         if 'experience' in resume_data:
@@ -216,6 +230,10 @@ class JobMatcher:
                     years = self._extract_years_from_duration(duration)
                     total_years += years
         
+        return total_years
+
+    @span('match.experience_score')
+    def _experience_score(self, total_years: float, job_level: str) -> float:
         if job_level == 'entry':
             if total_years <= 2:
                 return 100.0
@@ -244,28 +262,30 @@ class JobMatcher:
         
         duration = duration.lower()
         
-        year_patterns = [
-            r'(\d+)\s*years?',
-            r'(\d+)\s*yr',
-            r'(\d+)\s*mos?',  
-            r'(\d+)\s*months?'
-        ]
-        
         total_years = 0.0
         
-        for pattern in year_patterns:
-            matches = re.findall(pattern, duration)
-            for match in matches:
-                if 'mos' in pattern or 'months' in pattern:
-                    total_years += float(match) / 12
-                else:
-                    total_years += float(match)
+        for amount, years, months in DURATION.findall(duration):
+            if months:
+                total_years += float(amount) / 12
+            else:
+                total_years += float(amount)
         
         return total_years
 
-    def _calculate_industry_match_score(self, resume_data: Dict[str, Any], job_industries: List[str]) -> float:
+    @span('match.industry_score')
+    def _industry_score(self, resume_industries: set, job_industries: List[str]) -> float:
         if not job_industries:
             return 50.0
+        if not resume_industries:
+            return 30.0
+        
+        matches = len(resume_industries.intersection(set(job_industries)))
+        if matches > 0:
+            return 100.0
+        else:
+            return 40.0
+
+    def _extract_resume_industries(self, resume_data: Dict[str, Any]) -> set:
         resume_industries = set()
         if 'experience' in resume_data:
             for exp in resume_data['experience']:
@@ -285,15 +305,9 @@ class JobMatcher:
                     if any(keyword in title or keyword in description for keyword in keywords):
                         resume_industries.add(industry)
         
-        if not resume_industries:
-            return 30.0
-        
-        matches = len(resume_industries.intersection(set(job_industries)))
-        if matches > 0:
-            return 100.0
-        else:
-            return 40.0
+        return resume_industries
 
+    @span('match.missing_skills')
     def _find_missing_skills_enhanced(self, resume_skills: List[str], job_skills: List[str]) -> List[str]:
         resume_set = set(resume_skills)
         job_set = set(job_skills)
@@ -305,10 +319,7 @@ class JobMatcher:
         nice_to_have = []
         
         for skill in missing:
-            skill_importance = 0
-            for category, skills in self.skill_categories.items():
-                if skill in skills:
-                    skill_importance += 1
+            skill_importance = self.skill_index.importance(skill)
             
             if skill_importance >= 2:
                 critical_missing.append(skill)
@@ -330,19 +341,20 @@ class JobMatcher:
         else:
             return "Low match. This position may not be the best fit for your current skill set."
 
+    @span('match.skill_suggestions')
     def get_skill_suggestions(self, missing_keywords: List[str]) -> Dict[str, List[str]]:
         suggestions = {}
         
         for keyword in missing_keywords:
-            for category, skills in self.skill_categories.items():
-                if keyword in skills:
-                    if category not in suggestions:
-                        suggestions[category] = []
-                    suggestions[category].append(keyword)
-                    break
-            else:
-                if 'general' not in suggestions:
-                    suggestions['general'] = []
-                suggestions['general'].append(keyword)
+            category = self.skill_index.primary_category(keyword) or 'general'
+            if category not in suggestions:
+                suggestions[category] = []
+            suggestions[category].append(keyword)
         
         return suggestions
+
+
+@lru_cache(maxsize=None)
+def get_matcher() -> JobMatcher:
+    """Process-wide matcher for code that only needs its analysis helpers"""
+    return JobMatcher()
@@ -1,9 +1,24 @@
+from __future__ import annotations
+
 import os
-import requests
-from bs4 import BeautifulSoup
-from typing import List, Dict
+import importlib.util
+from typing import List, Dict, Optional, Tuple, Iterator, TYPE_CHECKING
 from urllib.parse import quote_plus
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import threading
+import random
 import time
+from services.metrics import span
+
+# requests and BeautifulSoup are imported on first use, so importing this
+# module (and the app) does not pay for them before a search is made.
+if TYPE_CHECKING:
+	import requests
+	from bs4 import BeautifulSoup, SoupStrainer
+
+HTML_PARSER = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
 
 HEADERS = {
 	"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36",
@@ -13,16 +28,41 @@ HEADERS = {
 	"Referer": "https://www.timesjobs.com/",
 }
 
-TIMESJOBS_URL = "https://www.timesjobs.com/candidate/job-search.html?searchType=personalizedSearch&from=submit&txtKeywords={k}&txtLocation={l}&sequence=1&startPage=1"
+TIMESJOBS_URL = "https://www.timesjobs.com/candidate/job-search.html?searchType=personalizedSearch&from=submit&txtKeywords={k}&txtLocation={l}&sequence={page}&startPage={start}"
+
+SCRAPER_TIMEOUT = float(os.getenv("SCRAPER_TIMEOUT", 20))
+SCRAPER_POOL_SIZE = int(os.getenv("SCRAPER_POOL_SIZE", 10))
+SCRAPER_RETRIES = int(os.getenv("SCRAPER_RETRIES", 2))
+SCRAPER_CONCURRENCY = int(os.getenv("SCRAPER_CONCURRENCY", 4))
+MAX_FANOUT_PAGES = 10
+# TimesJobs pages in blocks of ten; startPage is the first page of the block.
+PAGES_PER_BLOCK = 10
+
+# Parsed results are fresh for SEARCH_CACHE_TTL seconds. After that they are
+# still served for up to SEARCH_CACHE_STALE_TTL seconds while a background
+# fetch replaces them.
+SEARCH_CACHE_SIZE = int(os.getenv("SEARCH_CACHE_SIZE", 256))
+SEARCH_CACHE_TTL = int(os.getenv("SEARCH_CACHE_TTL", 300))
+SEARCH_CACHE_STALE_TTL = int(os.getenv("SEARCH_CACHE_STALE_TTL", 1800))
+MAX_CACHED_RESULTS = 100
+
+# Only the result list and its cards are built into a tree; the rest of the
+# page (navigation, scripts, footers) is skipped while parsing.
+JOB_CARD_TAGS = ["ul", "li"]
+JOB_CARD_CLASSES = ["new-joblist", "job-bx"]
 
+# Raw result pages are saved for debugging only when enabled, and then only
+# for a sample of fetches; the write happens on a background thread.
+SCRAPER_DEBUG_HTML = os.getenv("SCRAPER_DEBUG_HTML", "false").lower() == "true"
+SCRAPER_DEBUG_SAMPLE_RATE = float(os.getenv("SCRAPER_DEBUG_SAMPLE_RATE", 1.0))
 DEBUG_DIR = os.path.join("data", "debug")
-os.makedirs(DEBUG_DIR, exist_ok=True)
 
 
-def _save_debug_html(name: str, content: str) -> str:
+def _save_debug_html(name: str, content: bytes) -> str:
 	path = os.path.join(DEBUG_DIR, f"{name}.html")
 	try:
-		with open(path, "w", encoding="utf-8") as f:
+		os.makedirs(DEBUG_DIR, exist_ok=True)
+		with open(path, "wb") as f:
 			f.write(content)
 		print(f"[TimesJobs][DEBUG] Saved HTML: {path}")
 	except Exception as e:
@@ -30,14 +70,137 @@ def _save_debug_html(name: str, content: str) -> str:
 	return path
 
 
+def _capture_debug_html(name: str, content: bytes) -> bool:
+	if not SCRAPER_DEBUG_HTML or random.random() >= SCRAPER_DEBUG_SAMPLE_RATE:
+		return False
+	threading.Thread(target=_save_debug_html, args=(name, content), daemon=True).start()
+	return True
+
+
+@lru_cache(maxsize=1)
+def _job_cards() -> SoupStrainer:
+	from bs4 import SoupStrainer
+	return SoupStrainer(JOB_CARD_TAGS, class_=JOB_CARD_CLASSES)
+
+
+def parse_job_cards(markup) -> BeautifulSoup:
+	"""Parse just the job-card nodes of a results page (bytes or str)"""
+	from bs4 import BeautifulSoup
+	return BeautifulSoup(markup, HTML_PARSER, parse_only=_job_cards())
+
+
+_session: Optional[requests.Session] = None
+_session_pid: Optional[int] = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+	"""Keep-alive session shared by the process; a forked worker builds its own"""
+	global _session, _session_pid
+	pid = os.getpid()
+	if _session is not None and _session_pid == pid:
+		return _session
+	with _session_lock:
+		if _session is None or _session_pid != pid:
+			import requests
+			from requests.adapters import HTTPAdapter
+			from urllib3.util.retry import Retry
+			session = requests.Session()
+			session.headers.update(HEADERS)
+			retries = Retry(
+				total=SCRAPER_RETRIES,
+				backoff_factor=0.3,
+				status_forcelist=(429, 500, 502, 503, 504),
+				allowed_methods=frozenset(["GET"]),
+			)
+			adapter = HTTPAdapter(pool_connections=4, pool_maxsize=SCRAPER_POOL_SIZE, max_retries=retries)
+			session.mount("https://", adapter)
+			session.mount("http://", adapter)
+			_session = session
+			_session_pid = pid
+	return _session
+
+
+class SearchCache:
+	"""Bounded LRU of parsed search results with a fresh and a stale lifetime"""
+
+	def __init__(self, max_entries: int = SEARCH_CACHE_SIZE, ttl: int = SEARCH_CACHE_TTL, stale_ttl: int = SEARCH_CACHE_STALE_TTL):
+		self.max_entries = max_entries
+		self.ttl = ttl
+		self.stale_ttl = stale_ttl
+		self.entries: "OrderedDict[Tuple, Tuple[float, List[Dict]]]" = OrderedDict()
+		self.refreshing = set()
+		self.lock = threading.Lock()
+		self.hits = 0
+		self.stale_hits = 0
+		self.misses = 0
+
+	def get(self, key: Tuple) -> Tuple[Optional[List[Dict]], bool]:
+		"""(results, fresh); results is None when nothing usable is cached"""
+		with self.lock:
+			entry = self.entries.get(key)
+			if entry is None:
+				self.misses += 1
+				return None, False
+			age = time.monotonic() - entry[0]
+			if age > self.ttl + self.stale_ttl:
+				del self.entries[key]
+				self.misses += 1
+				return None, False
+			self.entries.move_to_end(key)
+			if age > self.ttl:
+				self.stale_hits += 1
+				return entry[1], False
+			self.hits += 1
+			return entry[1], True
+
+	def set(self, key: Tuple, results: List[Dict]):
+		with self.lock:
+			self.entries[key] = (time.monotonic(), results)
+			self.entries.move_to_end(key)
+			while len(self.entries) > self.max_entries:
+				self.entries.popitem(last=False)
+
+	def start_refresh(self, key: Tuple) -> bool:
+		"""Claim the background refresh for key; False if one is already running"""
+		with self.lock:
+			if key in self.refreshing:
+				return False
+			self.refreshing.add(key)
+			return True
+
+	def finish_refresh(self, key: Tuple):
+		with self.lock:
+			self.refreshing.discard(key)
+
+	def stats(self) -> Dict:
+		with self.lock:
+			return {
+				"entries": len(self.entries),
+				"hits": self.hits,
+				"stale_hits": self.stale_hits,
+				"misses": self.misses,
+			}
+
+
+_search_cache = SearchCache()
+
+
+def get_search_cache_stats() -> Dict:
+	"""Hit, stale-hit and miss counts of this worker's search cache"""
+	return _search_cache.stats()
+
+
 def _fetch_timesjobs(url: str, *, save_name: str = "timesjobs_last") -> BeautifulSoup:
-	resp = requests.get(url, headers=HEADERS, timeout=20)
-	resp.raise_for_status()
-	soup = BeautifulSoup(resp.text, 'html.parser')
-	_save_debug_html(save_name, soup.prettify())
-	return soup
+	with span("scraper.fetch"):
+		resp = get_session().get(url, timeout=SCRAPER_TIMEOUT)
+		resp.raise_for_status()
+	_capture_debug_html(save_name, resp.content)
+	with span("scraper.parse"):
+		return parse_job_cards(resp.content)
 
 
+@span("scraper.extract")
 def _parse_timesjobs(soup: BeautifulSoup, max_results: int) -> List[Dict]:
 	results: List[Dict] = []
 	cards = soup.select('ul.new-joblist > li.clearfix') or soup.select('li.clearfix.job-bx')
@@ -79,12 +242,82 @@ def _parse_timesjobs(soup: BeautifulSoup, max_results: int) -> List[Dict]:
 	return results
 
 
+def _cache_key(query: str, location: str, page: int) -> Tuple[str, str, int]:
+	return (" ".join((query or "").lower().split()), " ".join((location or "").lower().split()), int(page or 1))
+
+
+def _page_url(query: str, location: str, page: int) -> str:
+	page = max(1, int(page or 1))
+	start = (page - 1) // PAGES_PER_BLOCK * PAGES_PER_BLOCK + 1
+	return TIMESJOBS_URL.format(k=quote_plus(query or ''), l=quote_plus(location or ''), page=page, start=start)
+
+
+def _search(query: str, location: str, page: int) -> List[Dict]:
+	save_name = "timesjobs_last" if page == 1 else f"timesjobs_page{page}"
+	soup = _fetch_timesjobs(_page_url(query, location, page), save_name=save_name)
+	return _parse_timesjobs(soup, MAX_CACHED_RESULTS)
+
+
+def _refresh(key: Tuple, query: str, location: str, page: int):
+	try:
+		results = _search(query, location, page)
+		if results:
+			_search_cache.set(key, results)
+	except Exception as e:
+		print(f"[TimesJobs] Background refresh failed: {e}")
+	finally:
+		_search_cache.finish_refresh(key)
+
+
 def search_timesjobs_jobs(query: str, location: str = "", page: int = 1, max_results: int = 20) -> List[Dict]:
-	url = TIMESJOBS_URL.format(k=quote_plus(query or ''), l=quote_plus(location or ''))
-	soup = _fetch_timesjobs(url, save_name="timesjobs_last")
-	results = _parse_timesjobs(soup, max_results)
+	key = _cache_key(query, location, page)
+	cached, fresh = _search_cache.get(key)
+	if cached is not None:
+		if not fresh and _search_cache.start_refresh(key):
+			threading.Thread(target=_refresh, args=(key, query, location, page), daemon=True).start()
+		print(f"[TimesJobs] Found {len(cached)} results on page {key[2]} ({'cached' if fresh else 'stale, refreshing'})")
+		return [dict(job) for job in cached[:max_results]]
+
+	results = _search(query, location, page)
 	if results:
-		print(f"[TimesJobs] Found {len(results)} results")
-		return results
-	print("[TimesJobs] No results found")
+		_search_cache.set(key, results)
+		print(f"[TimesJobs] Found {len(results)} results on page {key[2]}")
+		return [dict(job) for job in results[:max_results]]
+	print(f"[TimesJobs] No results found on page {key[2]}")
 	return []
+
+
+def iter_timesjobs_pages(query: str, location: str = "", start_page: int = 1, pages: int = 1, max_results: int = 20) -> Iterator[Tuple[int, List[Dict], Optional[str]]]:
+	"""Fetch consecutive pages concurrently and yield (page, jobs, error) in page order.
+
+	At most SCRAPER_CONCURRENCY pages are in flight; each page is yielded as
+	soon as it and the pages before it have arrived. Jobs whose link was on
+	an earlier page are dropped, so a listing that moves between pages keeps
+	its first position. A failed page yields its error instead of ending the
+	search.
+	"""
+	start_page = max(1, int(start_page or 1))
+	pages = max(1, min(int(pages or 1), MAX_FANOUT_PAGES))
+	seen = set()
+	pool = ThreadPoolExecutor(max_workers=min(pages, SCRAPER_CONCURRENCY), thread_name_prefix="timesjobs")
+	try:
+		futures = [
+			(number, pool.submit(search_timesjobs_jobs, query, location, number, max_results))
+			for number in range(start_page, start_page + pages)
+		]
+		for number, future in futures:
+			try:
+				jobs = future.result()
+			except Exception as e:
+				print(f"[TimesJobs] Page {number} failed: {e}")
+				yield number, [], str(e)
+				continue
+			new_jobs = []
+			for job in jobs:
+				if job["link"] not in seen:
+					seen.add(job["link"])
+					new_jobs.append(job)
+			yield number, new_jobs, None
+	finally:
+		# A client that disconnects mid-stream should not leave queued fetches behind.
+		pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,425 @@
+import os
+import re
+import math
+import html
+import time
+import heapq
+import json
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Iterable, Optional, Set, Tuple
+from bson import ObjectId
+from models.database import get_db
+from services.metrics import span
+from services.skill_taxonomy import _normalize_phrase, get_skill_automaton, taxonomy_version
+
+logger = logging.getLogger(__name__)
+
+# Bump when tokenization, field weights or the saved layout change; the
+# stored version also carries the taxonomy version, so editing the taxonomy
+# makes workers rebuild the index from Mongo instead of loading it.
+INDEX_SCHEMA = 1
+
+SEARCH_INDEX_PATH = os.getenv('SEARCH_INDEX_PATH', os.path.join('data', 'search_index', 'jobs.json'))
+# How often a worker looks for jobs added or re-statused by other workers before searching.
+SEARCH_INDEX_SYNC_SECONDS = float(os.getenv('SEARCH_INDEX_SYNC_SECONDS', 5))
+# Unsaved additions after which the index is written back to disk.
+SEARCH_INDEX_SAVE_EVERY = int(os.getenv('SEARCH_INDEX_SAVE_EVERY', 200))
+
+# BM25 parameters; term counts in the title and company weigh more than in the description.
+BM25_K1 = 1.2
+BM25_B = 0.75
+FIELD_WEIGHTS = (('position', 3), ('company', 2), ('job_description', 1))
+SNIPPET_CHARS = 180
+MAX_RESULTS = 100
+
+# ObjectIds from different workers are only ordered by their second, so
+# syncing re-reads a short window before the newest indexed one.
+SYNC_OVERLAP = timedelta(seconds=5)
+
+_TOKEN = re.compile(r'[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*')
+_SKILL_TERM = 'skill:'
+STOPWORDS = frozenset(
+    'a an and are as at be by for from has have in is it its of on or our the to we will with you your'.split()
+)
+
+
+def index_version() -> str:
+    return f"{INDEX_SCHEMA}-{taxonomy_version()}"
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens, normalized like taxonomy phrases; keeps c++, c#, node.js"""
+    if not text:
+        return []
+    return [token for token in _TOKEN.findall(_normalize_phrase(text)) if token not in STOPWORDS]
+
+
+def skill_terms(text: str) -> List[str]:
+    """One term per canonical skill in text, so 'js' and 'javascript' find each other"""
+    return [_SKILL_TERM + skill for skill in get_skill_automaton().find_skills(text)] if text else []
+
+
+def query_terms(query: str) -> List[str]:
+    return list(dict.fromkeys(tokenize(query) + skill_terms(query)))
+
+
+class JobSearchIndex:
+    """In-memory inverted index with BM25 scoring over company, position and job_description.
+
+    Postings map each term to {doc number: weighted term count}. Doc numbers
+    index into ids, lengths and statuses; statuses let a status filter apply
+    before the top results are taken. Only ids are kept, so results are
+    hydrated (and highlighted) from Mongo.
+    """
+
+    def __init__(self):
+        self.version = index_version()
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self.ids: List[str] = []
+        self.lengths: List[int] = []
+        self.statuses: List[Optional[str]] = []
+        self.doc_numbers: Dict[str, int] = {}
+        self.total_length = 0
+        self.norms: Optional[List[float]] = None
+        self.last_id: Optional[ObjectId] = None
+        self.status_synced: Optional[datetime] = None
+        self.unsaved = 0
+        self.synced_at = 0.0
+        self.lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain data for saving; each posting list is split into doc numbers and counts"""
+        with self.lock:
+            return {
+                "version": self.version,
+                "ids": list(self.ids),
+                "lengths": list(self.lengths),
+                "statuses": list(self.statuses),
+                "postings": {term: [list(postings), list(postings.values())] for term, postings in self.postings.items()},
+                "last_id": str(self.last_id) if self.last_id else None,
+                "status_synced": self.status_synced.isoformat() if self.status_synced else None,
+            }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'JobSearchIndex':
+        index = cls()
+        index.version = data["version"]
+        index.ids = [str(job_id) for job_id in data["ids"]]
+        index.lengths = [int(length) for length in data["lengths"]]
+        index.statuses = list(data["statuses"])
+        if not len(index.ids) == len(index.lengths) == len(index.statuses):
+            raise ValueError("ids, lengths and statuses differ in size")
+        index.postings = {term: dict(zip(docs, counts)) for term, (docs, counts) in data["postings"].items()}
+        index.doc_numbers = {job_id: doc for doc, job_id in enumerate(index.ids)}
+        index.total_length = sum(index.lengths)
+        index.last_id = ObjectId(data["last_id"]) if data.get("last_id") else None
+        if data.get("status_synced"):
+            index.status_synced = datetime.fromisoformat(data["status_synced"])
+        return index
+
+    def add(self, job: Dict[str, Any]) -> bool:
+        """Index a job document; returns False if it is already indexed"""
+        job_id = str(job['_id'])
+        counts: Dict[str, int] = {}
+        for field, weight in FIELD_WEIGHTS:
+            text = job.get(field) or ''
+            for term in tokenize(text) + skill_terms(text):
+                counts[term] = counts.get(term, 0) + weight
+        with self.lock:
+            if job_id in self.doc_numbers:
+                return False
+            doc = len(self.ids)
+            self.ids.append(job_id)
+            self.doc_numbers[job_id] = doc
+            length = sum(counts.values())
+            self.lengths.append(length)
+            self.statuses.append(job.get('status'))
+            self.total_length += length
+            for term, count in counts.items():
+                self.postings.setdefault(term, {})[doc] = count
+            object_id = ObjectId(job['_id'])
+            if self.last_id is None or object_id > self.last_id:
+                self.last_id = object_id
+            self.unsaved += 1
+        return True
+
+    def _length_norms(self) -> List[float]:
+        """BM25's k1 * (1 - b + b * length / average length) per doc, recomputed only after additions"""
+        if self.norms is None or len(self.norms) != len(self.lengths):
+            average = self.total_length / len(self.lengths) or 1
+            self.norms = [BM25_K1 * (1 - BM25_B + BM25_B * length / average) for length in self.lengths]
+        return self.norms
+
+    def search(self, query: str, limit: int = 20, status: Optional[str] = None,
+               offset: int = 0) -> Tuple[List[Tuple[str, float]], int]:
+        """(job id, score) pairs ranked offset to offset + limit, and how many jobs matched any term.
+
+        With status, jobs whose indexed status differs are left out of both.
+        """
+        terms = query_terms(query)
+        with self.lock:
+            count = len(self.ids)
+            if not terms or not count:
+                return [], 0
+            norms = self._length_norms()
+            scores: Dict[int, float] = {}
+            for term in terms:
+                postings = self.postings.get(term)
+                if not postings:
+                    continue
+                weight = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5)) * (BM25_K1 + 1)
+                for doc, tf in postings.items():
+                    scores[doc] = scores.get(doc, 0.0) + weight * tf / (tf + norms[doc])
+            if status:
+                statuses = self.statuses
+                scores = {doc: score for doc, score in scores.items() if statuses[doc] == status}
+            top = heapq.nlargest(offset + limit, scores.items(), key=lambda item: item[1])[offset:]
+            return [(self.ids[doc], score) for doc, score in top], len(scores)
+
+
+_index: Optional[JobSearchIndex] = None
+_index_lock = threading.Lock()
+_save_lock = threading.Lock()
+
+
+def load_index(path: Optional[str] = None) -> Optional[JobSearchIndex]:
+    """Index saved at path (default SEARCH_INDEX_PATH), or None if it is missing, unreadable or outdated"""
+    path = path or SEARCH_INDEX_PATH
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get("version") != index_version():
+            logger.info(f"Search index at {path} is outdated; it will be rebuilt")
+            return None
+        return JobSearchIndex.from_dict(data)
+    except Exception as e:
+        logger.warning(f"Could not load search index from {path}: {str(e)}")
+        return None
+
+
+def save_index(index: JobSearchIndex, path: Optional[str] = None) -> str:
+    """Write the index as JSON, atomically; concurrent writers each replace the file whole"""
+    path = path or SEARCH_INDEX_PATH
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with index.lock:
+        data = index.to_dict()
+        index.unsaved = 0
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, separators=(',', ':'))
+    os.replace(tmp_path, path)
+    return path
+
+
+def _save_in_background(index: JobSearchIndex):
+    def run():
+        if not _save_lock.acquire(blocking=False):
+            return
+        try:
+            save_index(index)
+        except Exception as e:
+            logger.error(f"Could not save search index: {str(e)}")
+        finally:
+            _save_lock.release()
+    threading.Thread(target=run, name='search-index-save', daemon=True).start()
+
+
+_PROJECTION = dict({field: 1 for field, _ in FIELD_WEIGHTS}, status=1)
+
+
+def _add_jobs(index: JobSearchIndex, jobs: Iterable[Dict[str, Any]]) -> int:
+    return sum(1 for job in jobs if index.add(job))
+
+
+def build_index() -> JobSearchIndex:
+    """Index every job in the database"""
+    start = time.perf_counter()
+    index = JobSearchIndex()
+    index.status_synced = datetime.utcnow()
+    _add_jobs(index, get_db().jobs.find({}, _PROJECTION).sort('_id', 1))
+    index.synced_at = time.monotonic()
+    logger.info(f"Built search index over {len(index)} jobs in {time.perf_counter() - start:.2f}s")
+    return index
+
+
+def sync_index(index: JobSearchIndex) -> int:
+    """Add jobs inserted since the newest indexed one and pick up status changes (by any worker)"""
+    db = get_db()
+    index.synced_at = time.monotonic()
+    query = {}
+    if index.last_id is not None:
+        query = {"_id": {"$gte": ObjectId.from_datetime(index.last_id.generation_time - SYNC_OVERLAP)}}
+    added = _add_jobs(index, db.jobs.find(query, _PROJECTION))
+    if added:
+        logger.info(f"Added {added} new jobs to the search index")
+    now = datetime.utcnow()
+    if index.status_synced is not None:
+        for job in db.jobs.find({"updated_at": {"$gte": index.status_synced - SYNC_OVERLAP}}, {"status": 1}):
+            with index.lock:
+                doc = index.doc_numbers.get(str(job["_id"]))
+                if doc is not None and index.statuses[doc] != job.get("status"):
+                    index.statuses[doc] = job.get("status")
+                    index.unsaved += 1
+    index.status_synced = now
+    return added
+
+
+def preload_index() -> bool:
+    """Load the saved index without touching Mongo; safe in the gunicorn master before fork"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = load_index()
+        return _index is not None
+
+
+def get_job_index() -> JobSearchIndex:
+    """Process-wide index: loaded from disk (or built from Mongo) once, then kept in sync"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = load_index()
+            if _index is None:
+                _index = build_index()
+                _save_in_background(_index)
+        index = _index
+    if time.monotonic() - index.synced_at >= SEARCH_INDEX_SYNC_SECONDS:
+        sync_index(index)
+    if index.unsaved >= SEARCH_INDEX_SAVE_EVERY:
+        _save_in_background(index)
+    return index
+
+
+def index_job(job: Dict[str, Any]):
+    """Add a newly inserted job to this worker's index, if it has been loaded"""
+    index = _index
+    if index is None:
+        return
+    try:
+        index.add(job)
+    except Exception as e:
+        logger.error(f"Could not index job {job.get('_id')}: {str(e)}")
+
+
+def save_loaded_index() -> Optional[str]:
+    """Persist this worker's index if it has unsaved additions; used on shutdown"""
+    if _index is None or not _index.unsaved:
+        return None
+    return save_index(_index)
+
+
+def rebuild_index() -> JobSearchIndex:
+    """Build the index from scratch, save it, and use it in this process"""
+    global _index
+    index = build_index()
+    save_index(index)
+    with _index_lock:
+        _index = index
+    return index
+
+
+def _highlight_pattern(query: str, text: str) -> Optional[re.Pattern]:
+    words: Set[str] = set(tokenize(query))
+    skills = {term[len(_SKILL_TERM):] for term in skill_terms(query)}
+    if skills:
+        automaton = get_skill_automaton()
+        for phrase in automaton.find_phrases(text):
+            if any(skill in skills for _, skill in automaton.phrase_skills[phrase]):
+                words.add(phrase)
+    if not words:
+        return None
+    alternatives = sorted((re.escape(word).replace(r'\ ', r'\s+') for word in words), key=len, reverse=True)
+    return re.compile(r'(?<!\w)(?:' + '|'.join(alternatives) + r')(?!\w)', re.IGNORECASE)
+
+
+def _mark(text: str, pattern: Optional[re.Pattern], start: int = 0, end: Optional[int] = None) -> str:
+    """HTML-escaped text[start:end] with every match wrapped in <mark>"""
+    end = len(text) if end is None else end
+    if pattern is None:
+        return html.escape(text[start:end])
+    parts = []
+    position = start
+    for match in pattern.finditer(text, start, end):
+        parts.append(html.escape(text[position:match.start()]))
+        parts.append(f"<mark>{html.escape(match.group())}</mark>")
+        position = match.end()
+    parts.append(html.escape(text[position:end]))
+    return ''.join(parts)
+
+
+def highlight(query: str, job: Dict[str, Any], snippet_chars: int = SNIPPET_CHARS) -> Dict[str, str]:
+    """Escaped HTML for position and company, and a description snippet around the first hit"""
+    highlights = {}
+    for field in ('position', 'company'):
+        text = job.get(field) or ''
+        highlights[field] = _mark(text, _highlight_pattern(query, text))
+    description = job.get('job_description') or ''
+    pattern = _highlight_pattern(query, description)
+    first = pattern.search(description) if pattern else None
+    start = max(0, first.start() - snippet_chars // 3) if first else 0
+    end = min(len(description), start + snippet_chars)
+    if start > 0:
+        space = description.find(' ', start, end)
+        start = space + 1 if space != -1 else start
+    snippet = _mark(description, pattern, start, end).replace('\n', ' ')
+    highlights['snippet'] = ('…' if start > 0 else '') + snippet + ('…' if end < len(description) else '')
+    return highlights
+
+
+def search_jobs(query: str, limit: int = 20, status: Optional[str] = None) -> Dict[str, Any]:
+    """Rank tracked jobs for query with BM25 and return them highlighted.
+
+    The index filters by status before taking the top results and only
+    yields ids and scores. Each page of them is read from Mongo in one
+    query, which also drops deleted jobs and any whose status changed since
+    the index last synced; further pages are read until limit jobs pass.
+    """
+    start = time.perf_counter()
+    limit = max(1, min(limit, MAX_RESULTS))
+    index = get_job_index()
+    projection = {"company": 1, "position": 1, "job_description": 1, "status": 1, "application_date": 1}
+    results = []
+    offset = matched = 0
+    while len(results) < limit:
+        with span('search.rank'):
+            ranked, matched = index.search(query, limit, status=status, offset=offset)
+        if not ranked:
+            break
+        offset += len(ranked)
+        mongo_query: Dict[str, Any] = {"_id": {"$in": [ObjectId(job_id) for job_id, _ in ranked]}}
+        if status:
+            mongo_query["status"] = status
+        jobs = {str(job["_id"]): job for job in get_db().jobs.find(mongo_query, projection)}
+        with span('search.highlight'):
+            for job_id, score in ranked:
+                job = jobs.get(job_id)
+                if job is None:
+                    continue
+                results.append({
+                    "_id": job_id,
+                    "company": job.get("company"),
+                    "position": job.get("position"),
+                    "status": job.get("status"),
+                    "application_date": job.get("application_date"),
+                    "has_description": bool(job.get("job_description")),
+                    "score": round(score, 4),
+                    "highlights": highlight(query, job),
+                })
+                if len(results) >= limit:
+                    break
+        if offset >= matched:
+            break
+    return {
+        "query": query,
+        "matched": matched,
+        "indexed": len(index),
+        "results": results,
+        "took_ms": round((time.perf_counter() - start) * 1000, 2),
+    }
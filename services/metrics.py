@@ -0,0 +1,212 @@
+import os
+import json
+import time
+import bisect
+import threading
+from functools import wraps
+from typing import Dict, List, Any, Tuple, Optional, Callable
+
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() == 'true'
+# Directory shared by every gunicorn worker. Each worker writes its own
+# snapshot there and /metrics sums them, so any worker can answer a scrape.
+# Empty means single-process mode: only this process's numbers are served.
+METRICS_DIR = os.getenv('METRICS_DIR', '')
+METRICS_FLUSH_SECONDS = float(os.getenv('METRICS_FLUSH_SECONDS', 5))
+
+# Upper bounds in seconds; wide enough for a cached lookup and a slow scrape.
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+REQUEST_METRIC = 'job_tracker_request_duration_seconds'
+STAGE_METRIC = 'job_tracker_stage_duration_seconds'
+REGEX_METRIC = 'job_tracker_regex_duration_seconds'
+HELP = {
+    REQUEST_METRIC: 'Time spent handling an HTTP request',
+    STAGE_METRIC: 'Time spent in one instrumented stage (extraction, parsing, matching, Mongo, scraping)',
+    REGEX_METRIC: 'Time spent in one call of a parser or matcher regex (REGEX_TIMING=true)',
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram for one metric and label set"""
+
+    __slots__ = ('counts', 'total', 'count', '_lock')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        index = bisect.bisect_left(BUCKETS, seconds)
+        with self._lock:
+            self.counts[index] += 1
+            self.total += seconds
+            self.count += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'counts': list(self.counts), 'sum': self.total, 'count': self.count}
+
+
+class Registry:
+    """All histograms of this process, keyed by metric name and labels"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Start empty under a new snapshot name, e.g. in a freshly forked worker"""
+        with self._lock:
+            self.histograms: Dict[Tuple[str, Labels], Histogram] = {}
+            self.pid = os.getpid()
+            self.snapshot_name = f"{self.pid}-{time.time_ns()}.json"
+            self.last_flush = 0.0
+
+    def histogram(self, name: str, labels: Labels) -> Histogram:
+        key = (name, labels)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(key, Histogram())
+        return histogram
+
+    def observe(self, name: str, seconds: float, **labels: str):
+        self.histogram(name, tuple(sorted(labels.items()))).observe(seconds)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            items = list(self.histograms.items())
+        return [dict(name=name, labels=dict(labels), **histogram.snapshot()) for (name, labels), histogram in items]
+
+
+registry = Registry()
+
+
+def observe(name: str, seconds: float, **labels: str):
+    if METRICS_ENABLED:
+        registry.observe(name, seconds, **labels)
+
+
+class span:
+    """Time a block (or, as a decorator, a function) as one stage.
+
+        with span('parse.skills'):
+            ...
+    """
+
+    __slots__ = ('stage', 'start')
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if METRICS_ENABLED:
+            registry.observe(STAGE_METRIC, time.perf_counter() - self.start, stage=self.stage)
+        return False
+
+    def __call__(self, fn: Callable) -> Callable:
+        stage = self.stage
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+
+
+# --- Multi-worker aggregation --------------------------------------------------
+
+def flush(force: bool = False) -> Optional[str]:
+    """Write this process's snapshot to METRICS_DIR, at most every METRICS_FLUSH_SECONDS"""
+    if not METRICS_DIR:
+        return None
+    now = time.monotonic()
+    if not force and now - registry.last_flush < METRICS_FLUSH_SECONDS:
+        return None
+    registry.last_flush = now
+    os.makedirs(METRICS_DIR, exist_ok=True)
+    path = os.path.join(METRICS_DIR, registry.snapshot_name)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(registry.snapshot(), f)
+    os.replace(tmp_path, path)
+    return path
+
+
+def clear_snapshots():
+    """Remove every worker snapshot; call once when the server starts"""
+    if not METRICS_DIR or not os.path.isdir(METRICS_DIR):
+        return
+    for name in os.listdir(METRICS_DIR):
+        if name.endswith('.json') or name.endswith('.tmp'):
+            os.remove(os.path.join(METRICS_DIR, name))
+
+
+def _load_snapshots() -> List[List[Dict[str, Any]]]:
+    """Snapshots of every worker, including ones that have since exited.
+
+    A dead worker's file is kept so the summed counters never go backwards.
+    """
+    if not METRICS_DIR:
+        return [registry.snapshot()]
+    flush(force=True)
+    snapshots = []
+    for name in sorted(os.listdir(METRICS_DIR)):
+        if not name.endswith('.json'):
+            continue
+        try:
+            with open(os.path.join(METRICS_DIR, name)) as f:
+                snapshots.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return snapshots
+
+
+def collect() -> Dict[Tuple[str, Labels], Dict[str, Any]]:
+    """Histograms summed across all worker snapshots"""
+    merged: Dict[Tuple[str, Labels], Dict[str, Any]] = {}
+    for snapshot in _load_snapshots():
+        for entry in snapshot:
+            key = (entry['name'], tuple(sorted(entry['labels'].items())))
+            total = merged.setdefault(key, {'counts': [0] * (len(BUCKETS) + 1), 'sum': 0.0, 'count': 0})
+            total['counts'] = [a + b for a, b in zip(total['counts'], entry['counts'])]
+            total['sum'] += entry['sum']
+            total['count'] += entry['count']
+    return merged
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+
+def render_prometheus() -> str:
+    """All histograms in the Prometheus text exposition format"""
+    lines = []
+    metrics = collect()
+    for name in sorted({name for name, _ in metrics}):
+        lines.append(f"# HELP {name} {HELP.get(name, name)}")
+        lines.append(f"# TYPE {name} histogram")
+        for (metric, labels), data in sorted(metrics.items()):
+            if metric != name:
+                continue
+            cumulative = 0
+            for bound, count in zip(BUCKETS + (float('inf'),), data['counts']):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f"{name}_bucket{_format_labels(labels, ('le', le))} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {data['sum']:.6f}")
+            lines.append(f"{name}_count{_format_labels(labels)} {data['count']}")
+    return "\n".join(lines) + "\n"
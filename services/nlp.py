@@ -0,0 +1,70 @@
+import os
+import time
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+SPACY_MODEL = os.getenv('SPACY_MODEL', 'en_core_web_sm')
+SPACY_AUTO_DOWNLOAD = os.getenv('SPACY_AUTO_DOWNLOAD', 'true').lower() == 'true'
+# Only the NER component is used (person names in resume headers); the rest
+# of the pipeline is dead weight per document and per worker. NER in the
+# en_core_web models embeds its own tok2vec, so the shared one is skipped too.
+SPACY_DISABLE = [c.strip() for c in os.getenv(
+    'SPACY_DISABLE', 'tok2vec,parser,lemmatizer,tagger,attribute_ruler,senter'
+).split(',') if c.strip()]
+# After a failed load, callers get None for this long before loading is tried again.
+SPACY_RETRY_SECONDS = float(os.getenv('SPACY_RETRY_SECONDS', 300))
+
+_models = {}
+_failed_at = {}
+_lock = threading.Lock()
+
+
+def _load(name: str):
+    import spacy
+    try:
+        return spacy.load(name, disable=SPACY_DISABLE)
+    except OSError:
+        if not SPACY_AUTO_DOWNLOAD:
+            raise
+        logger.warning(f"spaCy model {name} not found. Downloading...")
+        from spacy.cli import download
+        download(name)
+        return spacy.load(name, disable=SPACY_DISABLE)
+
+
+def get_nlp(name: str = SPACY_MODEL):
+    """Return the shared spaCy pipeline, loading it on first use.
+
+    Returns None if the model cannot be loaded so callers can fall back to
+    their rule-based paths instead of failing the request. A failed load is
+    retried once SPACY_RETRY_SECONDS have passed.
+    """
+    nlp = _models.get(name)
+    if nlp is not None or _recently_failed(name):
+        return nlp
+    with _lock:
+        if name in _models:
+            return _models[name]
+        if _recently_failed(name):
+            return None
+        try:
+            _models[name] = _load(name)
+            _failed_at.pop(name, None)
+            logger.info(f"Loaded spaCy model {name} (pipes: {_models[name].pipe_names})")
+        except (Exception, SystemExit) as e:
+            # spacy.cli.download exits the interpreter on some failures
+            logger.error(f"Could not load spaCy model {name}: {str(e)}")
+            _failed_at[name] = time.monotonic()
+            return None
+    return _models[name]
+
+
+def _recently_failed(name: str) -> bool:
+    failed_at = _failed_at.get(name)
+    return failed_at is not None and time.monotonic() - failed_at < SPACY_RETRY_SECONDS
+
+
+def is_loaded(name: str = SPACY_MODEL) -> bool:
+    return name in _models
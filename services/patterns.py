@@ -0,0 +1,176 @@
+import os
+import re
+import time
+from typing import Dict, List
+from services.metrics import observe, REGEX_METRIC
+
+REGEX_TIMING = os.getenv('REGEX_TIMING', 'false').lower() == 'true'
+
+# Longest run of words a company, position or institution name may span.
+# Bounding these runs keeps every pattern linear in the input length, which
+# matters because PDF extraction can still produce very long lines.
+MAX_NAME_WORDS = 6
+MAX_PHRASE_CHARS = 80
+
+
+class TimedPattern:
+    """A compiled regex that can record per-call time under a stable name.
+
+    With REGEX_TIMING on, each call is observed in the job_tracker_regex
+    histogram at /metrics, labelled with the pattern name.
+    """
+
+    __slots__ = ('name', 'regex')
+
+    def __init__(self, name: str, pattern: str, flags: int = 0):
+        self.name = name
+        self.regex = re.compile(pattern, flags)
+
+    def _record(self, start: float):
+        observe(REGEX_METRIC, time.perf_counter() - start, pattern=self.name)
+
+    def search(self, text: str):
+        if not REGEX_TIMING:
+            return self.regex.search(text)
+        start = time.perf_counter()
+        try:
+            return self.regex.search(text)
+        finally:
+            self._record(start)
+
+    def match(self, text: str):
+        if not REGEX_TIMING:
+            return self.regex.match(text)
+        start = time.perf_counter()
+        try:
+            return self.regex.match(text)
+        finally:
+            self._record(start)
+
+    def findall(self, text: str) -> List:
+        if not REGEX_TIMING:
+            return self.regex.findall(text)
+        start = time.perf_counter()
+        try:
+            return self.regex.findall(text)
+        finally:
+            self._record(start)
+
+    def finditer(self, text: str):
+        """Iterate matches; with timing on, the scan is done eagerly so it can be measured"""
+        if not REGEX_TIMING:
+            return self.regex.finditer(text)
+        start = time.perf_counter()
+        try:
+            return iter(list(self.regex.finditer(text)))
+        finally:
+            self._record(start)
+
+    def sub(self, repl: str, text: str) -> str:
+        if not REGEX_TIMING:
+            return self.regex.sub(repl, text)
+        start = time.perf_counter()
+        try:
+            return self.regex.sub(repl, text)
+        finally:
+            self._record(start)
+
+
+class PatternBank:
+    def __init__(self):
+        self.patterns: Dict[str, TimedPattern] = {}
+
+    def add(self, name: str, pattern: str, flags: int = 0) -> TimedPattern:
+        compiled = TimedPattern(name, pattern, flags)
+        self.patterns[name] = compiled
+        return compiled
+
+    def __getitem__(self, name: str) -> TimedPattern:
+        return self.patterns[name]
+
+
+PATTERNS = PatternBank()
+
+
+def warm_patterns() -> int:
+    """Number of compiled patterns; every pattern is compiled when this module is imported"""
+    return len(PATTERNS.patterns)
+
+# Entries never span lines, so runs between words use horizontal space only.
+_SPACE = r'[^\S\n]'
+_WORDS = rf'\w+(?:{_SPACE}+\w+){{0,{MAX_NAME_WORDS - 1}}}'
+_DASH = rf'{_SPACE}*[-–]{_SPACE}*'
+
+# --- Resume parser -----------------------------------------------------------
+EMAIL = PATTERNS.add('email', r'(?<![A-Za-z0-9._%+-])[A-Za-z0-9._%+-]+@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,}\b')
+PHONE = PATTERNS.add('phone', r'(\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+LINKEDIN = PATTERNS.add('linkedin', r'linkedin\.com/in/[\w-]+')
+GITHUB = PATTERNS.add('github', r'github\.com/[\w-]+')
+YEARS_EXPERIENCE = PATTERNS.add('years_experience', r'(?<!\d)(\d+)[\+\-\s]*years?\s*(?:of\s*)?(?:experience|exp)', re.IGNORECASE)
+YEAR = PATTERNS.add('year', r'\b(19|20)\d{2}\b')
+NAME_LINE = PATTERNS.add('name_line', r'^[A-Za-z\s]+$')
+WHITESPACE = PATTERNS.add('whitespace', r'\s+')
+HORIZONTAL_WHITESPACE = PATTERNS.add('horizontal_whitespace', rf'{_SPACE}+')
+# Runs of breaks collapse to one; a blank line between paragraphs is kept.
+LINE_BREAKS = PATTERNS.add('line_breaks', r' ?\n *(\n)?[\n ]*')
+# Bullets are kept so line-based extractors can tell list items from titles.
+DISALLOWED_CHARS = PATTERNS.add('disallowed_chars', r'[^\w\s\.\,\-\@\(\)\:\/\+\#•]')
+
+EXPERIENCE_PATTERNS = [
+    PATTERNS.add('experience_range', rf'\b({_WORDS}){_DASH}({_WORDS}){_DASH}(\d{{4}}){_DASH}(\d{{4}}|Present)', re.IGNORECASE),
+    PATTERNS.add('experience_dates', rf'\b({_WORDS}){_SPACE}*(\d{{4}}){_DASH}(\d{{4}}|Present)', re.IGNORECASE),
+    PATTERNS.add('experience_year', rf'\b({_WORDS}){_DASH}({_WORDS}){_SPACE}*(\d{{4}})', re.IGNORECASE),
+]
+
+_CAPITALIZED_WORDS = rf'[A-Z][a-z]+(?:{_SPACE}+[A-Z][a-z]+){{0,{MAX_NAME_WORDS - 1}}}'
+EDUCATION_PATTERNS = [
+    PATTERNS.add('education_degree', rf'\b(Bachelor|Master|PhD|B\.Tech|M\.Tech|B\.E|M\.E|B\.S|M\.S|B\.A|M\.A)\s+[^,\n]{{1,{MAX_PHRASE_CHARS}}}', re.IGNORECASE),
+    PATTERNS.add('education_university', rf'\b({_CAPITALIZED_WORDS}){_SPACE}+University', re.IGNORECASE),
+    PATTERNS.add('education_college', rf'\b({_CAPITALIZED_WORDS}){_SPACE}+College', re.IGNORECASE),
+]
+
+_CERT_NAME = rf'[A-Z][A-Za-z \t]{{1,{MAX_PHRASE_CHARS}}}'
+_CERT_WORDS = rf'[A-Za-z \t]{{1,{MAX_PHRASE_CHARS}}}'
+CERTIFICATION_PATTERNS = [
+    PATTERNS.add('certification', rf'\b({_CERT_NAME}){_SPACE}+Certification', re.IGNORECASE),
+    PATTERNS.add('certified', rf'\b({_CERT_NAME}){_SPACE}+Certified', re.IGNORECASE),
+    PATTERNS.add('certificate', rf'\b({_CERT_NAME}){_SPACE}+Certificate', re.IGNORECASE),
+    PATTERNS.add('aws_certification', rf'AWS{_SPACE}+{_CERT_WORDS}', re.IGNORECASE),
+    PATTERNS.add('azure_certification', rf'Azure{_SPACE}+{_CERT_WORDS}', re.IGNORECASE),
+    PATTERNS.add('google_certification', rf'Google{_SPACE}+{_CERT_WORDS}{_SPACE}+Certificate', re.IGNORECASE),
+]
+
+# Section headings, matched as a whole line or as a "Heading:" line prefix.
+# Aliases are tried longest first so "Certifications" is not cut short.
+SECTION_HEADINGS: Dict[str, List[str]] = {
+    'experience': ['experience', 'work experience', 'professional experience', 'employment history',
+                   'work history', 'employment'],
+    'education': ['education', 'academic background', 'academic qualifications'],
+    'projects': ['projects', 'personal projects', 'academic projects', 'key projects'],
+    'skills': ['skills', 'technical skills', 'core skills', 'key skills', 'core competencies'],
+    'certifications': ['certifications', 'certification', 'certificates', 'licenses and certifications'],
+}
+SECTION_HEADER = PATTERNS.add(
+    'section_header',
+    '^(?:' + '|'.join(
+        f"(?P<{section}>" + '|'.join(re.escape(alias) for alias in sorted(aliases, key=len, reverse=True)) + ')'
+        for section, aliases in SECTION_HEADINGS.items()
+    ) + rf')(?::{_SPACE}*|{_SPACE}*$)',
+    re.IGNORECASE | re.MULTILINE
+)
+
+# --- Job matcher -------------------------------------------------------------
+# Every requirement phrase in one zero-width scan. Requirement text runs to
+# the next sentence break and is capped at MAX_REQUIREMENT_CHARS so a long
+# unterminated run cannot make each keyword rescan the rest of the text.
+MAX_REQUIREMENT_CHARS = 300
+REQUIREMENT_KINDS = ['requirements', 'must have', 'looking for', 'qualifications', 'experience with']
+REQUIREMENTS = PATTERNS.add(
+    'requirements',
+    rf'(?=(?P<req>requirements?)[:\s]+(?P<req_text>[^\n.;]{{0,{MAX_REQUIREMENT_CHARS}}}?)(?=[\n.;]|responsibilities)'
+    rf'|(?P<kind>must have|looking for|qualifications?|experience with)[:\s]+(?P<text>[^\n.;]{{0,{MAX_REQUIREMENT_CHARS}}}?)(?=[\n.;]))',
+    re.IGNORECASE
+)
+SKILL_PREFIX = PATTERNS.add('skill_prefix', r'^(expert in|proficient in|skilled in|experience with|knowledge of)\s+')
+SKILL_SUFFIX = PATTERNS.add('skill_suffix', r'(?<!\s)\s+(expert|proficient|skilled|experienced|knowledge)$')
+DURATION = PATTERNS.add('duration', r'(?<!\d)(\d+)\s*(?:(years?|yrs?)|(months?|mos?))')
@@ -0,0 +1,152 @@
+import os
+import io
+import re
+import hmac
+import json
+import hashlib
+import random
+import pstats
+import cProfile
+import logging
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Requests carrying this token in the X-Profile header are profiled, and it
+# also unlocks the profile listing. Unset disables both. It is never read
+# from the query string, which ends up in access logs.
+PROFILE_TOKEN = os.getenv('PROFILE_TOKEN', '')
+# Fraction of all requests profiled without a token, e.g. 0.01 for 1%.
+PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', 0))
+PROFILE_DIR = os.getenv('PROFILE_DIR', os.path.join('data', 'profiles'))
+PROFILE_MAX_FILES = int(os.getenv('PROFILE_MAX_FILES', 200))
+PROFILE_HEADER = 'X-Profile'
+
+PROFILE_NAME = re.compile(r'^[\w.-]+\.prof$')
+SUMMARY_SORTS = ('cumulative', 'tottime', 'ncalls')
+
+# The admin grant is kept in the signed session cookie, so with the default
+# SECRET_KEY anyone could forge it. The app reports whether a real key is
+# set; until then profiling and the listing stay off.
+_secret_key_set = False
+
+
+def set_secret_key_configured(configured: bool):
+    global _secret_key_set
+    _secret_key_set = configured
+    if (PROFILE_TOKEN or PROFILE_SAMPLE_RATE) and not configured:
+        logger.warning("Request profiling is disabled: set SECRET_KEY to a non-default value to enable it")
+
+
+def is_admin(token: Optional[str]) -> bool:
+    return _secret_key_set and bool(PROFILE_TOKEN) and bool(token) and hmac.compare_digest(token, PROFILE_TOKEN)
+
+
+def admin_grant() -> str:
+    """Session value proving the token was given; changing PROFILE_TOKEN revokes old grants"""
+    return hashlib.sha256(f"profile-admin:{PROFILE_TOKEN}".encode('utf-8')).hexdigest()
+
+
+def has_admin_grant(grant: Optional[str]) -> bool:
+    return _secret_key_set and bool(PROFILE_TOKEN) and bool(grant) and hmac.compare_digest(grant, admin_grant())
+
+
+def profile_trigger(token: Optional[str]) -> Optional[str]:
+    """Why this request should be profiled ('token' or 'sample'), or None.
+
+    Checked on every request, so the common case is two comparisons.
+    """
+    if not _secret_key_set:
+        return None
+    if token and is_admin(token):
+        return 'token'
+    if PROFILE_SAMPLE_RATE and random.random() < PROFILE_SAMPLE_RATE:
+        return 'sample'
+    return None
+
+
+def start_profile() -> Optional[cProfile.Profile]:
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Another profiler is already active in this process (e.g. a second thread).
+        logger.warning("Skipping request profile, a profiler is already running")
+        return None
+    return profiler
+
+
+def save_profile(profiler: cProfile.Profile, metadata: Dict[str, Any]) -> str:
+    """Write the stats and their metadata to PROFILE_DIR; return the profile name"""
+    profiler.disable()
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    endpoint = re.sub(r'[^\w-]', '_', metadata.get('endpoint') or 'unmatched')
+    name = f"{datetime.utcnow().strftime('%Y%m%d_%H%M%S_%f')}_{endpoint}_{os.getpid()}.prof"
+    path = os.path.join(PROFILE_DIR, name)
+    profiler.dump_stats(path)
+    metadata = dict(metadata, name=name, pid=os.getpid(), created_at=datetime.utcnow().isoformat(timespec='seconds'))
+    with open(f"{path[:-len('.prof')]}.json", 'w') as f:
+        json.dump(metadata, f)
+    _prune()
+    return name
+
+
+def _prune():
+    names = sorted(name for name in os.listdir(PROFILE_DIR) if name.endswith('.prof'))
+    for name in names[:max(0, len(names) - PROFILE_MAX_FILES)]:
+        for path in (os.path.join(PROFILE_DIR, name), os.path.join(PROFILE_DIR, name[:-len('.prof')] + '.json')):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def list_profiles(limit: int = 100) -> List[Dict[str, Any]]:
+    """Newest profiles first, with the metadata saved alongside each"""
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+    names = sorted((name for name in os.listdir(PROFILE_DIR) if name.endswith('.prof')), reverse=True)
+    profiles = []
+    for name in names[:limit]:
+        metadata = {"name": name}
+        try:
+            with open(os.path.join(PROFILE_DIR, name[:-len('.prof')] + '.json')) as f:
+                metadata.update(json.load(f))
+        except (OSError, ValueError):
+            pass
+        metadata["size"] = os.path.getsize(os.path.join(PROFILE_DIR, name))
+        profiles.append(metadata)
+    return profiles
+
+
+def profile_path(name: str) -> Optional[str]:
+    """Absolute path of a stored profile, or None for unknown or unsafe names"""
+    if not PROFILE_NAME.match(name):
+        return None
+    path = os.path.abspath(os.path.join(PROFILE_DIR, name))
+    return path if os.path.isfile(path) else None
+
+
+def summarize(name: str, sort: str = 'cumulative', limit: int = 40) -> Optional[str]:
+    """pstats report of the top functions in a stored profile"""
+    path = profile_path(name)
+    if not path:
+        return None
+    if sort not in SUMMARY_SORTS:
+        sort = SUMMARY_SORTS[0]
+    out = io.StringIO()
+    stats = pstats.Stats(path, stream=out)
+    stats.strip_dirs().sort_stats(sort).print_stats(limit)
+    return out.getvalue()
+
+
+def request_metadata(request, status: int, seconds: float, trigger: str) -> Dict[str, Any]:
+    return {
+        "endpoint": request.endpoint,
+        "method": request.method,
+        "path": request.path,
+        "status": status,
+        "duration_ms": round(seconds * 1000, 2),
+        "trigger": trigger,
+    }
@@ -0,0 +1,117 @@
+import ast
+import logging
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+from bson import ObjectId
+from pymongo import UpdateOne
+from models.database import get_db, content_hash, chunked
+from services.job_matcher import MATCHER_VERSION, get_matcher
+from services.skill_taxonomy import get_skill_index, taxonomy_version
+
+logger = logging.getLogger(__name__)
+
+# Bump when the layout of the feature record changes. The stored version also
+# carries the matcher and taxonomy versions, so editing either one marks
+# every record stale and it is rebuilt on next use or by backfill.
+FEATURES_SCHEMA = 2
+
+def features_version() -> str:
+    return f"{FEATURES_SCHEMA}-{MATCHER_VERSION}-{taxonomy_version()}"
+
+
+def load_parsed_data(resume: Dict[str, Any]) -> Dict[str, Any]:
+    """parsed_data of a resume document; very old records stored it as a repr string"""
+    parsed_data = resume.get("parsed_data") or {}
+    if isinstance(parsed_data, str):
+        return ast.literal_eval(parsed_data)
+    return parsed_data
+
+
+def build_features(parsed_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Compact record of everything matching needs from a parsed resume.
+
+    skills are the names the matcher compares against job skills; skill_ids
+    are the canonical ones among them as column indexes into the skill
+    vocabulary of the taxonomy named by version, which BatchMatcher uses
+    directly as the resume's skill vector.
+    """
+    profile = get_matcher().resume_features(parsed_data)
+    index = get_skill_index()
+    return {
+        "version": features_version(),
+        "skills": profile['skills'],
+        "skill_ids": sorted(index.skill_ids[skill] for skill in profile['skills'] if skill in index.skill_ids),
+        "total_years": profile['total_years'],
+        "industries": profile['industries'],
+        "computed_at": datetime.utcnow(),
+    }
+
+
+def features_hash(features: Dict[str, Any]) -> str:
+    """Cache key for match results; ignores when the record was computed"""
+    return content_hash({key: value for key, value in features.items() if key != "computed_at"})
+
+
+def is_current(features: Optional[Dict[str, Any]]) -> bool:
+    return bool(features) and features.get("version") == features_version()
+
+
+def get_resume_features(resume: Dict[str, Any]) -> Dict[str, Any]:
+    """Stored features of a resume document, rebuilt and saved if missing or stale"""
+    features = resume.get("features")
+    if is_current(features):
+        return features
+    if "parsed_data" not in resume:
+        resume = get_db().resumes.find_one({"_id": ObjectId(resume["_id"])}, {"parsed_data": 1}) or {}
+    features = build_features(load_parsed_data(resume))
+    if resume.get("_id") is not None:
+        get_db().resumes.update_one({"_id": ObjectId(resume["_id"])}, {"$set": {"features": features}})
+    return features
+
+
+def get_features_for(resumes: List[Dict[str, Any]]) -> Dict[Any, Dict[str, Any]]:
+    """Features by _id for many resume documents (projected with at least _id and features).
+
+    Stale records are refreshed with one query for their parsed_data and one
+    bulk write, instead of a round trip each. Resumes deleted since they were
+    read are left out.
+    """
+    stale_ids = [resume["_id"] for resume in resumes if not is_current(resume.get("features"))]
+    rebuilt: Dict[Any, Dict[str, Any]] = {}
+    if stale_ids:
+        db = get_db()
+        for resume in db.resumes.find({"_id": {"$in": stale_ids}}, {"parsed_data": 1}):
+            rebuilt[resume["_id"]] = build_features(load_parsed_data(resume))
+        if rebuilt:
+            db.resumes.bulk_write(
+                [UpdateOne({"_id": resume_id}, {"$set": {"features": features}})
+                 for resume_id, features in rebuilt.items()],
+                ordered=False
+            )
+    features = {}
+    for resume in resumes:
+        record = rebuilt.get(resume["_id"]) or resume.get("features")
+        if is_current(record):
+            features[resume["_id"]] = record
+    return features
+
+
+def backfill_features(chunk_size: int = 200, force: bool = False) -> Dict[str, int]:
+    """Build features for every resume whose record is missing or from an older version"""
+    db = get_db()
+    query = {} if force else {"features.version": {"$ne": features_version()}}
+    stats = {"updated": 0, "failed": 0}
+    cursor = db.resumes.find(query, {"parsed_data": 1})
+    for chunk in chunked(cursor, chunk_size):
+        updates = []
+        for resume in chunk:
+            try:
+                updates.append(UpdateOne({"_id": resume["_id"]},
+                                         {"$set": {"features": build_features(load_parsed_data(resume))}}))
+            except Exception as e:
+                stats["failed"] += 1
+                logger.error(f"Could not build features for resume {resume['_id']}: {str(e)}")
+        if updates:
+            db.resumes.bulk_write(updates, ordered=False)
+            stats["updated"] += len(updates)
+    return stats
@@ -1,150 +1,190 @@
-import PyPDF2
-import docx
-import re
-import spacy
-from typing import Dict, List, Any, Tuple
+import io
+import os
+from typing import Dict, List, Any, Tuple, Iterator, Union, BinaryIO, Optional
 import logging
 from models.config import skill_categories, experience_indicators, industry_keywords
+from services.nlp import get_nlp
+from services.skill_taxonomy import get_skill_automaton
+from services.metrics import span
+from services.patterns import (
+    EMAIL, PHONE, LINKEDIN, GITHUB, YEARS_EXPERIENCE, YEAR, NAME_LINE, HORIZONTAL_WHITESPACE, LINE_BREAKS,
+    DISALLOWED_CHARS, SECTION_HEADER, EXPERIENCE_PATTERNS, EDUCATION_PATTERNS, CERTIFICATION_PATTERNS
+)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Bump when parsing output changes so re-uploaded files are parsed again.
+PARSER_VERSION = 4
+
+PARSER_MAX_PAGES = int(os.getenv('PARSER_MAX_PAGES', 10))
+PARSER_MAX_CHARS = int(os.getenv('PARSER_MAX_CHARS', 100000))
+# Fall back to spaCy NER for the candidate name when the header rule finds
+# none. Off by default: it costs a model load per process and inference per
+# resume for a field the rule usually gets.
+PARSER_NER_NAMES = os.getenv('PARSER_NER_NAMES', 'false').lower() == 'true'
+
+# PyPDF2 and python-docx are imported by the extractors on first use.
+ResumeSource = Union[str, bytes, BinaryIO]
+
+# Text before the first recognised section heading (name, contact, summary).
+PREAMBLE = 'preamble'
+# A line in a Projects section longer than this is description, not a title.
+MAX_PROJECT_TITLE_WORDS = 12
+# Lines in a Projects section starting with one of these describe the current project.
+PROJECT_DETAIL_LABELS = ('tech stack', 'technologies', 'tools', 'stack', 'built with', 'link', 'github')
+
 class ResumeParser:
     def __init__(self):
-        try:
-            self.nlp = spacy.load("en_core_web_sm")
-        except OSError:
-            logger.warning("spaCy model not found. Installing...")
-            import subprocess
-            subprocess.run(["python", "-m", "spacy", "download", "en_core_web_sm"])
-            self.nlp = spacy.load("en_core_web_sm")
-        
         self.skill_categories = skill_categories
         self.experience_indicators = experience_indicators
         self.industry_keywords = industry_keywords
         
-        self.all_skills = self._flatten_skills()
-        
-        self.patterns = {
-            'email': r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
-            'phone': r'(\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',
-            'linkedin': r'linkedin\.com/in/[\w-]+',
-            'github': r'github\.com/[\w-]+',
-            'url': r'https?://(?:[-\w.])+(?:[:\d]+)?(?:/(?:[\w/_.])*(?:\?(?:[\w&=%.])*)?(?:#(?:[\w.])*)?)?',
-            'years_experience': r'(\d+)[\+\-\s]*years?\s*(?:of\s*)?(?:experience|exp)',
-        }
+        self.skill_automaton = get_skill_automaton()
+
+    @property
+    def nlp(self):
+        """Shared spaCy pipeline, loaded on first access (None if unavailable)"""
+        return get_nlp()
 
-    def _flatten_skills(self) -> Dict[str, str]:
-        """Flatten skill categories into a single dict with all variations"""
-        flattened = {}
-        for category, skills in self.skill_categories.items():
-            for skill_name, variations in skills.items():
-                flattened[skill_name.lower()] = skill_name
-                for variation in variations:
-                    flattened[variation.lower()] = skill_name
-        return flattened
-
-    def parse_resume(self, file_path: str) -> Dict[str, Any]:
+    def parse_resume(self, source: ResumeSource, filename: Optional[str] = None) -> Dict[str, Any]:
+        """Parse a resume from a path, raw bytes or a binary file-like object.
+
+        For bytes and streams, filename supplies the extension that picks the
+        extractor; nothing is written to disk.
+        """
+        name = filename or (source if isinstance(source, str) else '<stream>')
         try:
-            if file_path.lower().endswith('.pdf'):
-                text = self._extract_pdf_text(file_path)
-            elif file_path.lower().endswith('.docx'):
-                text = self._extract_docx_text(file_path)
-            elif file_path.lower().endswith('.txt'):
-                text = self._extract_txt_text(file_path)
-            else:
-                raise ValueError(f"Unsupported file type: {file_path}")
-            
+            text = self.extract_text(source, filename)
             parsed_data = self._parse_text(text)
-            logger.info(f"Successfully parsed resume: {file_path}")
+            logger.info(f"Successfully parsed resume: {name}")
             return parsed_data
             
         except Exception as e:
-            logger.error(f"Error parsing resume {file_path}: {str(e)}")
+            logger.error(f"Error parsing resume {name}: {str(e)}")
             raise
 
-    def _extract_pdf_text(self, file_path: str) -> str:
+    def extract_text(self, source: ResumeSource, filename: Optional[str] = None) -> str:
+        name = (filename or (source if isinstance(source, str) else '')).lower()
+        if isinstance(source, (bytes, bytearray)):
+            source = io.BytesIO(source)
+        if name.endswith('.pdf'):
+            return self._extract_pdf_text(source)
+        elif name.endswith('.docx'):
+            return self._extract_docx_text(source)
+        elif name.endswith('.txt'):
+            return self._extract_txt_text(source)
+        raise ValueError(f"Unsupported file type: {filename or source}")
+
+    def iter_pdf_pages(self, source: Union[str, BinaryIO], max_pages: int = PARSER_MAX_PAGES) -> Iterator[str]:
+        """Yield the text of each page, stopping after max_pages (0 means no limit)"""
+        import PyPDF2
+        pdf_reader = PyPDF2.PdfReader(source)
+        for number, page in enumerate(pdf_reader.pages):
+            if max_pages and number >= max_pages:
+                logger.info(f"PDF page budget reached ({max_pages} pages), skipping the rest")
+                return
+            yield page.extract_text() or ""
+
+    @span('extract.pdf')
+    def _extract_pdf_text(self, source: Union[str, BinaryIO], max_pages: int = PARSER_MAX_PAGES,
+                          max_chars: int = PARSER_MAX_CHARS) -> str:
         try:
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-                return text
+            pages = []
+            total = 0
+            for page_text in self.iter_pdf_pages(source, max_pages):
+                pages.append(page_text)
+                total += len(page_text) + 1
+                if max_chars and total >= max_chars:
+                    logger.info(f"PDF character budget reached ({max_chars} chars), skipping the rest")
+                    break
+            text = "\n".join(pages) + "\n"
+            return text[:max_chars] if max_chars else text
         except Exception as e:
             logger.error(f"Error extracting PDF text: {str(e)}")
             raise
 
-    def _extract_docx_text(self, file_path: str) -> str:
+    @span('extract.docx')
+    def _extract_docx_text(self, source: Union[str, BinaryIO]) -> str:
         try:
-            doc = docx.Document(file_path)
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text
+            import docx
+            doc = docx.Document(source)
+            return "".join(paragraph.text + "\n" for paragraph in doc.paragraphs)
         except Exception as e:
             logger.error(f"Error extracting DOCX text: {str(e)}")
             raise
 
-    def _extract_txt_text(self, file_path: str) -> str:
+    @span('extract.txt')
+    def _extract_txt_text(self, source: Union[str, BinaryIO]) -> str:
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                return file.read()
+            if isinstance(source, str):
+                with open(source, 'r', encoding='utf-8') as file:
+                    return file.read()
+            return source.read().decode('utf-8')
         except Exception as e:
             logger.error(f"Error extracting TXT text: {str(e)}")
             raise
 
-    def _parse_text(self, text: str) -> Dict[str, Any]:
+    @span('parse')
+    def _parse_text(self, text: str, use_nlp: bool = True) -> Dict[str, Any]:
+        """Extract structured data from resume text.
+
+        The text is cleaned and split into sections once. Skills, experience
+        level, industries and years are read from the whole document; the
+        experience, education, project and certification extractors only see
+        their own section when the resume has one, and the whole text when
+        it does not.
+        """
         text = self._clean_text(text)
+        text_lower = text.lower()
+        sections = self._split_sections(text)
         parsed_data = {
-            'contact_info': self._extract_contact_info(text),
+            'contact_info': self._extract_contact_info(text, use_nlp, sections.get(PREAMBLE)),
             'skills': self._extract_skills_enhanced(text),
-            'experience_level': self._determine_experience_level(text),
-            'industry_focus': self._identify_industry(text),
+            'experience_level': self._determine_experience_level(text_lower),
+            'industry_focus': self._identify_industry(text_lower),
             'years_experience': self._extract_years_experience(text),
-            'experience': self._extract_experience(text),
-            'education': self._extract_education(text),
-            'projects': self._extract_projects(text),
-            'certifications': self._extract_certifications(text),
+            'experience': self._extract_experience(sections.get('experience', text)),
+            'education': self._extract_education(sections.get('education', text)),
+            'projects': (self._extract_section_projects(sections['projects']) if 'projects' in sections
+                         else self._extract_projects(text)),
+            'certifications': self._extract_certifications(sections.get('certifications', text)),
             'raw_text': text[:1000] + "..." if len(text) > 1000 else text
         }
         
         return parsed_data
 
+    @span('parse.clean')
     def _clean_text(self, text: str) -> str:
-        text = re.sub(r'\s+', ' ', text)
-        text = re.sub(r'[^\w\s\.\,\-\@\(\)\:\/\+\#]', '', text)
+        """Drop unsupported characters and extra spaces but keep line breaks and paragraph breaks"""
+        text = DISALLOWED_CHARS.sub('', text)
+        text = HORIZONTAL_WHITESPACE.sub(' ', text)
+        text = LINE_BREAKS.sub('\n\\1', text)
         return text.strip()
 
+    @span('parse.sections')
+    def _split_sections(self, text: str) -> Dict[str, str]:
+        """Map each section found in cleaned text to its body, in a single scan for headings.
+
+        Text before the first heading is stored under PREAMBLE; a section
+        that appears more than once has its bodies joined.
+        """
+        bodies: Dict[str, List[str]] = {}
+        section, start = PREAMBLE, 0
+        for match in SECTION_HEADER.finditer(text):
+            bodies.setdefault(section, []).append(text[start:match.start()])
+            section, start = match.lastgroup, match.end()
+        bodies.setdefault(section, []).append(text[start:])
+        return {name: '\n'.join(part.strip() for part in parts).strip() for name, parts in bodies.items()}
+
+    @span('parse.skills')
     def _extract_skills_enhanced(self, text: str) -> Dict[str, List[str]]:
         """Enhanced skill extraction using config data"""
-        found_skills = {
-            'programming_languages': [],
-            'frameworks': [],
-            'databases': [],
-            'cloud_platforms': [],
-            'devops_tools': [],
-            'ml_ai_tools': []
-        }
-        
-        text_lower = text.lower()
-        
-        for category, skills in self.skill_categories.items():
-            for skill_name, variations in skills.items():
-                for variation in variations:
-                    if variation.lower() in text_lower:
-                        if skill_name not in found_skills[category]:
-                            found_skills[category].append(skill_name)
-                        break  
-        
-        found_skills = {k: v for k, v in found_skills.items() if v}
-        
-        return found_skills
+        return self.skill_automaton.find_by_category(text)
 
-    def _determine_experience_level(self, text: str) -> str:
+    @span('parse.experience_level')
+    def _determine_experience_level(self, text_lower: str) -> str:
         """Determine experience level based on keywords"""
-        text_lower = text.lower()
-        
         for level, indicators in self.experience_indicators.items():
             for indicator in indicators:
                 if indicator in text_lower:
@@ -152,9 +192,9 @@ class ResumeParser:
         
         return 'unknown'
 
-    def _identify_industry(self, text: str) -> List[str]:
+    @span('parse.industry')
+    def _identify_industry(self, text_lower: str) -> List[str]:
         """Identify potential industry focus"""
-        text_lower = text.lower()
         industries = []
         
         for industry, keywords in self.industry_keywords.items():
@@ -166,57 +206,86 @@ class ResumeParser:
         
         return industries
 
+    @span('parse.years_experience')
     def _extract_years_experience(self, text: str) -> int:
         """Extract years of experience from text"""
-        matches = re.findall(self.patterns['years_experience'], text, re.IGNORECASE)
+        matches = YEARS_EXPERIENCE.findall(text)
         if matches:
             return max([int(match) for match in matches])
         return 0
 
-    def _extract_contact_info(self, text: str) -> Dict[str, str]:
+    @span('parse.contact_info')
+    def _extract_contact_info(self, text: str, use_nlp: bool = True, preamble: Optional[str] = None) -> Dict[str, str]:
         contact_info = {}
         
-        email_match = re.search(self.patterns['email'], text)
+        email_match = EMAIL.search(text)
         if email_match:
             contact_info['email'] = email_match.group()
         
-        phone_match = re.search(self.patterns['phone'], text)
+        phone_match = PHONE.search(text)
         if phone_match:
             contact_info['phone'] = phone_match.group()
         
-        linkedin_match = re.search(self.patterns['linkedin'], text)
+        linkedin_match = LINKEDIN.search(text)
         if linkedin_match:
             contact_info['linkedin'] = linkedin_match.group()
         
-        github_match = re.search(self.patterns['github'], text)
+        github_match = GITHUB.search(text)
         if github_match:
             contact_info['github'] = github_match.group()
         
-        name = self._extract_name(text)
+        name = self._extract_name(preamble or text, use_nlp)
         if name:
             contact_info['name'] = name
         
         return contact_info
 
-    def _extract_name(self, text: str) -> str:
-        lines = text.split('\n')
-        for i, line in enumerate(lines[:5]):
-            line = line.strip()
-            if line and len(line.split()) <= 4:
-                if re.match(r'^[A-Za-z\s]+$', line) and len(line) > 2:
+    def _extract_name(self, text: str, use_nlp: bool = True) -> str:
+        lines = [line.strip() for line in text.split('\n') if line.strip()]
+        for line in lines[:5]:
+            if len(line.split()) <= 4 and not SECTION_HEADER.match(line):
+                if NAME_LINE.match(line) and len(line) > 2:
                     return line
+        return self._extract_name_nlp(text[:200]) if use_nlp and PARSER_NER_NAMES else ""
+
+    @span('parse.ner')
+    def _extract_name_nlp(self, header: str) -> str:
+        """Fall back to spaCy NER on the resume header"""
+        nlp = self.nlp
+        if nlp is None or not header:
+            return ""
+        return self._person_from_doc(nlp(header))
+
+    def _person_from_doc(self, doc) -> str:
+        for ent in doc.ents:
+            if ent.label_ == 'PERSON' and len(ent.text.split()) <= 4:
+                return ent.text.strip()
         return ""
 
+    @span('parse.ner_batch')
+    def fill_missing_names(self, parsed_resumes: List[Dict[str, Any]], texts: List[str], batch_size: int = 64) -> int:
+        """Run the NER name fallback for many resumes at once via nlp.pipe (if PARSER_NER_NAMES is on)"""
+        if not PARSER_NER_NAMES:
+            return 0
+        pending = [i for i, parsed in enumerate(parsed_resumes) if not parsed['contact_info'].get('name')]
+        nlp = self.nlp
+        if nlp is None or not pending:
+            return 0
+        headers = (self._clean_text(texts[i])[:200] for i in pending)
+        filled = 0
+        for i, doc in zip(pending, nlp.pipe(headers, batch_size=batch_size)):
+            name = self._person_from_doc(doc)
+            if name:
+                parsed_resumes[i]['contact_info']['name'] = name
+                filled += 1
+        return filled
+
+    @span('parse.experience')
     def _extract_experience(self, text: str) -> List[Dict[str, str]]:
         experience = []
-        experience_patterns = [
-            r'(\w+(?:\s+\w+)*)\s*[-–]\s*(\w+(?:\s+\w+)*)\s*[-–]\s*(\d{4})\s*[-–]\s*(\d{4}|Present)',
-            r'(\w+(?:\s+\w+)*)\s*(\d{4})\s*[-–]\s*(\d{4}|Present)',
-            r'(\w+(?:\s+\w+)*)\s*[-–]\s*(\w+(?:\s+\w+)*)\s*(\d{4})'
-        ]
         
-        for pattern in experience_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
+        for pattern in EXPERIENCE_PATTERNS:
+            matches = pattern.finditer(text)
             for match in matches:
                 exp = {
                     'company': match.group(1) if len(match.groups()) >= 1 else '',
@@ -228,16 +297,12 @@ class ResumeParser:
         
         return experience
 
+    @span('parse.education')
     def _extract_education(self, text: str) -> List[Dict[str, str]]:
         education = []
-        education_patterns = [
-            r'(Bachelor|Master|PhD|B\.Tech|M\.Tech|B\.E|M\.E|B\.S|M\.S|B\.A|M\.A)\s+[^,\n]+',
-            r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s+University',
-            r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s+College'
-        ]
         
-        for pattern in education_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
+        for pattern in EDUCATION_PATTERNS:
+            matches = pattern.finditer(text)
             for match in matches:
                 edu = {
                     'degree': match.group(1) if match.group(1) else '',
@@ -251,9 +316,10 @@ class ResumeParser:
     def _extract_year_from_context(self, text: str, position: int) -> str:
         """Extract year from surrounding context"""
         context = text[max(0, position-100):position+100]
-        year_match = re.search(r'\b(19|20)\d{2}\b', context)
+        year_match = YEAR.search(context)
         return year_match.group() if year_match else ''
 
+    @span('parse.projects')
     def _extract_projects(self, text: str) -> List[Dict[str, str]]:
         projects = []
         project_keywords = ['project', 'developed', 'built', 'created', 'implemented', 'designed']
@@ -278,32 +344,60 @@ class ResumeParser:
         
         return projects
 
+    @span('parse.projects')
+    def _extract_section_projects(self, section: str) -> List[Dict[str, str]]:
+        """Inside a Projects section each title-shaped line starts a project.
+
+        PDF text wraps sentences onto several lines, so a line only starts a
+        project at the top of the section, after a blank line, or after a
+        bullet or a line that finished a sentence. Everything else is
+        description.
+        """
+        lines = section.split('\n')
+        entries: List[Tuple[str, List[str]]] = []
+        boundary = True
+        for i, line in enumerate(lines):
+            if not line:
+                boundary = True
+                continue
+            next_line = lines[i + 1] if i + 1 < len(lines) else ''
+            if not entries or (boundary and self._is_project_title(line, next_line)):
+                entries.append((line, []))
+            else:
+                entries[-1][1].append(line.lstrip('•-* '))
+            boundary = line.endswith(('.', '!', '?')) or line.startswith(('•', '-', '*'))
+        
+        projects = []
+        for title, description_lines in entries:
+            description = " ".join(description_lines)
+            projects.append({
+                'title': title,
+                'description': description,
+                'technologies': self._extract_technologies_from_text(title + " " + description)
+            })
+        return projects
+
+    def _is_project_title(self, line: str, next_line: str) -> bool:
+        """Short, not a bullet or detail label, not lowercase, not a sentence and not wrapped onto next_line"""
+        return (
+            not line.startswith(('•', '-', '*'))
+            and len(line.split()) <= MAX_PROJECT_TITLE_WORDS
+            and not line[0].islower()
+            and not line.endswith(('.', ',', ';', ':'))
+            and not line.lower().startswith(PROJECT_DETAIL_LABELS)
+            and not next_line[:1].islower()
+        )
+
     def _extract_technologies_from_text(self, text: str) -> List[str]:
         """Extract technologies mentioned in a specific text block"""
-        technologies = []
-        text_lower = text.lower()
-        
-        for skill in self.all_skills:
-            if skill in text_lower:
-                tech_name = self.all_skills[skill]
-                if tech_name not in technologies:
-                    technologies.append(tech_name)
-        
-        return technologies
+        return self.skill_automaton.find_skills(text)
 
+    @span('parse.certifications')
     def _extract_certifications(self, text: str) -> List[str]:
         certifications = []
-        cert_patterns = [
-            r'([A-Z][A-Za-z\s]+)\s+Certification',
-            r'([A-Z][A-Za-z\s]+)\s+Certified',
-            r'([A-Z][A-Za-z\s]+)\s+Certificate',
-            r'AWS\s+[A-Za-z\s]+',
-            r'Azure\s+[A-Za-z\s]+',
-            r'Google\s+[A-Za-z\s]+\s+Certificate'
-        ]
         
-        for pattern in cert_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
+        for pattern in CERTIFICATION_PATTERNS:
+            matches = pattern.finditer(text)
             for match in matches:
                 cert = match.group(1).strip() if len(match.groups()) >= 1 else match.group(0).strip()
                 if cert and len(cert) > 3 and cert not in certifications:
@@ -0,0 +1,196 @@
+import re
+import json
+import hashlib
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
+from models.config import skill_categories, experience_indicators, industry_keywords
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def _normalize_phrase(phrase: str) -> str:
+    return _WHITESPACE.sub(' ', phrase.lower().strip())
+
+
+def _trie_pattern(phrases: List[str]) -> str:
+    """Render phrases as a character trie regex so shared prefixes are matched once"""
+    trie: Dict = {}
+    for phrase in phrases:
+        node = trie
+        for ch in phrase:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def render(node: Dict) -> str:
+        is_end = '' in node
+        alternatives = [
+            (r'\s+' if ch == ' ' else re.escape(ch)) + render(child)
+            for ch, child in sorted(node.items()) if ch != ''
+        ]
+        if not alternatives:
+            return ''
+        if len(alternatives) == 1 and not is_end:
+            return alternatives[0]
+        group = '(?:' + '|'.join(alternatives) + ')'
+        # Greedy optional: try the longer phrase first, fall back to the
+        # shorter one if the word boundary check after it fails.
+        return group + '?' if is_end else group
+
+    return render(trie)
+
+
+class SkillAutomaton:
+    """Finds every taxonomy variation in a text in a single scan.
+
+    Variations only match on word boundaries, so short ones such as 'r',
+    'go', 'ts' or 'py' no longer fire inside other words. All variations are
+    compiled into one trie-shaped regex that is tried at each word start; the
+    longest match at a position is expanded to the shorter variations that
+    are whole-word prefixes of it, which yields the same set of hits an
+    Aho-Corasick pass with boundary filtering would.
+    """
+
+    def __init__(self, categories: Dict[str, Dict[str, List[str]]] = skill_categories):
+        self.categories = categories
+        self.phrase_skills: Dict[str, List[Tuple[str, str]]] = {}
+        self.ordered_skills: List[Tuple[str, str]] = []
+
+        for category, skills in categories.items():
+            for skill_name, variations in skills.items():
+                self.ordered_skills.append((category, skill_name))
+                for phrase in [skill_name] + list(variations):
+                    phrase = _normalize_phrase(phrase)
+                    labels = self.phrase_skills.setdefault(phrase, [])
+                    if (category, skill_name) not in labels:
+                        labels.append((category, skill_name))
+
+        phrases = list(self.phrase_skills)
+        self.expansions: Dict[str, List[str]] = {
+            phrase: [
+                other for other in phrases
+                if phrase.startswith(other)
+                and (len(other) == len(phrase) or not re.match(r'\w', phrase[len(other)]))
+            ]
+            for phrase in phrases
+        }
+        self.pattern = re.compile(r'(?<!\w)(?=(' + _trie_pattern(phrases) + r')(?!\w))')
+
+    def find_phrases(self, text: str) -> Set[str]:
+        found: Set[str] = set()
+        if not text:
+            return found
+        for match in self.pattern.finditer(text.lower()):
+            phrase = match.group(1)
+            if phrase not in self.expansions:
+                phrase = _WHITESPACE.sub(' ', phrase)
+            found.update(self.expansions[phrase])
+        return found
+
+    def _hits(self, text: str) -> Set[Tuple[str, str]]:
+        hits: Set[Tuple[str, str]] = set()
+        for phrase in self.find_phrases(text):
+            hits.update(self.phrase_skills[phrase])
+        return hits
+
+    def find_skills(self, text: str) -> List[str]:
+        """Canonical skill names found in text, in taxonomy order"""
+        hits = self._hits(text)
+        skills: List[str] = []
+        for label in self.ordered_skills:
+            if label in hits and label[1] not in skills:
+                skills.append(label[1])
+        return skills
+
+    def find_by_category(self, text: str) -> Dict[str, List[str]]:
+        """Skills found in text grouped by category; empty categories are omitted"""
+        hits = self._hits(text)
+        found: Dict[str, List[str]] = {}
+        for category, skill_name in self.ordered_skills:
+            if (category, skill_name) in hits:
+                found.setdefault(category, []).append(skill_name)
+        return found
+
+
+class SkillIndex:
+    """Reverse lookups over the taxonomy, precomputed once.
+
+    lookup() resolves a skill or variation to (canonical skill, category)
+    with the same precedence as a category-by-category scan: within each
+    category canonical names win over variations, and earlier categories
+    win over later ones. Category membership is kept both as sets and as
+    bitmasks so matcher code can test it without walking the tree.
+    """
+
+    def __init__(self, categories: Dict[str, Dict[str, List[str]]] = skill_categories):
+        self.categories = list(categories)
+        self.category_bits: Dict[str, int] = {
+            category: 1 << i for i, category in enumerate(self.categories)
+        }
+        self.category_members: Dict[str, Set[str]] = {
+            category: set(skills) for category, skills in categories.items()
+        }
+        self.skill_masks: Dict[str, int] = {}
+        self._lookup: Dict[str, Tuple[str, str]] = {}
+        # Canonical skills in taxonomy order; a skill's position is its id.
+        self.skills: List[str] = []
+        self.skill_ids: Dict[str, int] = {}
+
+        for category, skills in categories.items():
+            bit = self.category_bits[category]
+            for skill_name in skills:
+                if skill_name not in self.skill_ids:
+                    self.skill_ids[skill_name] = len(self.skills)
+                    self.skills.append(skill_name)
+                self.skill_masks[skill_name] = self.skill_masks.get(skill_name, 0) | bit
+                self._lookup.setdefault(skill_name, (skill_name, category))
+            for skill_name, variations in skills.items():
+                for variation in variations:
+                    self._lookup.setdefault(variation, (skill_name, category))
+
+    def lookup(self, skill: str) -> Tuple[Optional[str], Optional[str]]:
+        return self._lookup.get(skill.lower().strip(), (None, None))
+
+    def category_of(self, skill: str) -> Optional[str]:
+        return self.lookup(skill)[1]
+
+    def membership_mask(self, skill: str) -> int:
+        """Bitmask of categories that list skill as a canonical name"""
+        return self.skill_masks.get(skill, 0)
+
+    def importance(self, skill: str) -> int:
+        """Number of categories that list skill as a canonical name"""
+        return bin(self.membership_mask(skill)).count('1')
+
+    def primary_category(self, skill: str) -> Optional[str]:
+        """First category that lists skill as a canonical name"""
+        mask = self.skill_masks.get(skill, 0)
+        if not mask:
+            return None
+        return self.categories[(mask & -mask).bit_length() - 1]
+
+    def related(self, skill1: str, skill2: str) -> bool:
+        category1 = self.lookup(skill1)[1]
+        if category1 is not None and category1 == self.lookup(skill2)[1]:
+            return True
+        return skill1.startswith(skill2) or skill2.startswith(skill1)
+
+
+@lru_cache(maxsize=None)
+def get_skill_index() -> SkillIndex:
+    """Process-wide reverse index built from models.config.skill_categories"""
+    return SkillIndex()
+
+
+@lru_cache(maxsize=None)
+def get_skill_automaton() -> SkillAutomaton:
+    """Process-wide automaton built from models.config.skill_categories"""
+    return SkillAutomaton()
+
+
+@lru_cache(maxsize=None)
+def taxonomy_version() -> str:
+    """Short fingerprint of models.config; changes whenever the taxonomy is edited"""
+    payload = json.dumps(
+        [skill_categories, experience_indicators, industry_keywords], sort_keys=True
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:12]
@@ -0,0 +1,120 @@
+import os
+import gc
+import time
+import logging
+import importlib
+import threading
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Load the spaCy model while warming. Off by default: the model is large,
+# and without SPACY_AUTO_DOWNLOAD=false a missing one would be downloaded.
+PRELOAD_NLP = os.getenv('PRELOAD_NLP', 'false').lower() == 'true'
+
+# Modules that are otherwise imported on first use (see import-report).
+# Importing them before fork lets every worker share the pages.
+PRELOAD_MODULES = ('PyPDF2', 'docx', 'bs4', 'lxml', 'requests')
+
+_state: Dict[str, Any] = {
+    "warm": False,
+    "warming": False,
+    "warmed_pid": None,
+    "frozen": False,
+    "seconds": None,
+    "components": {},
+}
+_lock = threading.Lock()
+
+
+def warm(app=None, load_nlp: bool = PRELOAD_NLP) -> Dict[str, Any]:
+    """Build the shared state once: skill matchers, search index, templates, lazy modules and optionally NLP.
+
+    Safe to call more than once; later calls return the existing state.
+    """
+    with _lock:
+        if _state["warm"]:
+            return status()
+        start = time.perf_counter()
+        components = {}
+
+        from services.skill_taxonomy import get_skill_automaton, get_skill_index, taxonomy_version
+        get_skill_automaton()
+        get_skill_index()
+        taxonomy_version()
+        components["skill_taxonomy"] = True
+
+        from services.patterns import warm_patterns
+        components["patterns"] = warm_patterns()
+
+        for name in PRELOAD_MODULES:
+            try:
+                importlib.import_module(name)
+                components[f"module:{name}"] = True
+            except ImportError:
+                components[f"module:{name}"] = False
+
+        # Only the saved file is read here; each worker catches up from Mongo.
+        from services.job_search import preload_index
+        components["job_search_index"] = preload_index()
+
+        if app is not None:
+            for template in app.jinja_env.list_templates():
+                app.jinja_env.get_template(template)
+            components["templates"] = True
+
+        if load_nlp:
+            from services.nlp import get_nlp
+            components["nlp"] = get_nlp() is not None
+
+        _state.update({
+            "warm": True,
+            "warmed_pid": os.getpid(),
+            "seconds": round(time.perf_counter() - start, 3),
+            "components": components,
+        })
+        logger.info(f"Warmed shared state in {_state['seconds']}s: {components}")
+        return status()
+
+
+def warm_in_background(app=None) -> bool:
+    """Start warm() on a daemon thread unless the state is warm or already warming; True if started"""
+    with _lock:
+        if _state["warm"] or _state["warming"]:
+            return False
+        _state["warming"] = True
+
+    def run():
+        try:
+            warm(app)
+        except Exception as e:
+            logger.error(f"Background warm-up failed: {str(e)}", exc_info=True)
+        finally:
+            _state["warming"] = False
+
+    threading.Thread(target=run, name='warmup', daemon=True).start()
+    return True
+
+
+def freeze():
+    """Move everything allocated so far out of the collector's view before forking.
+
+    Collections in a worker then never touch (and copy) the parent's pages.
+    """
+    gc.collect()
+    gc.freeze()
+    _state["frozen"] = True
+
+
+def status() -> Dict[str, Any]:
+    warmed_pid: Optional[int] = _state["warmed_pid"]
+    return {
+        "ready": _state["warm"],
+        "warming": _state["warming"],
+        "pid": os.getpid(),
+        "preloaded": _state["warm"] and warmed_pid != os.getpid(),
+        "frozen": _state["frozen"],
+        "frozen_objects": gc.get_freeze_count(),
+        "warm_seconds": _state["seconds"],
+        "components": dict(_state["components"]),
+    }
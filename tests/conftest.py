@@ -0,0 +1,22 @@
+import os
+import pytest
+
+# Tests never reach a real server or download the spaCy model.
+os.environ.setdefault('MONGO_URI', 'mongodb://localhost:27017')
+os.environ['MONGO_TLS'] = 'false'
+os.environ['SPACY_AUTO_DOWNLOAD'] = 'false'
+
+
+@pytest.fixture
+def db(monkeypatch):
+    """A fresh in-memory database behind models.database.get_db()"""
+    import mongomock
+    from models import database
+    client = mongomock.MongoClient()
+    monkeypatch.setattr(database, '_create_client', lambda: client)
+    database.reset_client()
+    # mongomock clients for the same host share their data, so start empty.
+    client.drop_database(database.DB_NAME)
+    yield database.get_db()
+    client.drop_database(database.DB_NAME)
+    database.reset_client()
@@ -0,0 +1,34 @@
+from services.batch_matcher import BatchMatcher
+from services.job_matcher import get_matcher
+from services.skill_taxonomy import get_skill_index
+
+RESUMES = [
+    {"skills": ["python", "flask", "postgres", "docker"], "total_years": 4, "industries": ["fintech"]},
+    {"skills": ["javascript", "react", "node"], "total_years": 1, "industries": []},
+    {"skills": ["java", "spring boot", "aws"], "total_years": 9, "industries": ["healthcare"]},
+    {"skills": [], "total_years": 0, "industries": []},
+]
+DESCRIPTIONS = [
+    "Senior Python developer with Django, PostgreSQL and Kubernetes, 6+ years, banking and payments",
+    "Junior React and TypeScript frontend engineer for an e-commerce startup",
+    "Mid-level Java engineer, Spring and AWS, hospital software, 3 years of experience",
+    "Office manager",
+]
+
+
+def _with_skill_ids(features):
+    skill_ids = get_skill_index().skill_ids
+    return dict(features, skill_ids=sorted(skill_ids[skill] for skill in features["skills"] if skill in skill_ids))
+
+
+def test_batch_scores_match_the_single_pair_scores():
+    matcher = get_matcher()
+    resumes = [_with_skill_ids(features) for features in RESUMES]
+    analyses = [matcher._analyze_job_description_enhanced(text) for text in DESCRIPTIONS]
+    batch = BatchMatcher(matcher)
+    scores = batch.score(batch.encode_resumes(resumes), batch.encode_jobs(analyses))
+    for row, features in enumerate(resumes):
+        for col, analysis in enumerate(analyses):
+            expected, details = matcher.calculate_match_score({}, "", features, analysis)
+            assert scores['match_score'][row, col] == expected
+            assert abs(scores['skill_match_score'][row, col] - details['skill_match_score']) < 1e-9
@@ -0,0 +1,26 @@
+from services import bulk_ingest
+from services.bulk_ingest import ingest_directory, reparse_stored_resumes
+
+RESUMES = {
+    "jane.txt": "Jane Doe\njane@example.com\n\nSKILLS\nPython, Flask, Docker\n",
+    "john.txt": "John Roe\njohn@example.com\n\nSKILLS\nJava, Spring, AWS\n",
+}
+
+
+def test_pool_workers_are_spawned_not_forked():
+    assert bulk_ingest.POOL_CONTEXT.get_start_method() == "spawn"
+
+
+def test_ingest_then_reparse_a_directory(db, tmp_path):
+    for name, text in RESUMES.items():
+        (tmp_path / name).write_text(text)
+    (tmp_path / "notes.md").write_text("not a resume")
+    stats = ingest_directory(str(tmp_path), workers=2)
+    assert (stats["files"], stats["inserted"], stats["failed"]) == (2, 2, 0)
+    stored = {resume["filename"]: resume for resume in db.resumes.find()}
+    assert set(stored) == set(RESUMES)
+    assert stored["jane.txt"]["features"]["skills"]
+
+    db.resumes.update_many({}, {"$set": {"parser_version": 0}})
+    assert reparse_stored_resumes(workers=2)["updated"] == 2
+    assert db.resumes.count_documents({"parser_version": bulk_ingest.PARSER_VERSION}) == 2
@@ -0,0 +1,108 @@
+import os
+import pytest
+from models import database
+
+
+class FakeClient:
+    def __init__(self):
+        self.closed = False
+
+    def __getitem__(self, name):
+        return name
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def clients(monkeypatch):
+    """Every client get_client() creates, in order, with pool counters starting at zero"""
+    created = []
+
+    def create():
+        created.append(FakeClient())
+        return created[-1]
+
+    monkeypatch.setattr(database, '_create_client', create)
+    database.reset_client()
+    yield created
+    database.reset_client()
+
+
+def _fork(monkeypatch):
+    """Pretend the current process is a child forked from the one that made the client"""
+    child_pid = os.getpid() + 1
+    monkeypatch.setattr(os, 'getpid', lambda: child_pid)
+
+
+def test_client_is_shared_within_a_process(clients):
+    assert database.get_client() is database.get_client()
+    assert database.get_db() == database.DB_NAME
+    assert len(clients) == 1
+
+
+def test_forked_process_builds_its_own_client_without_closing_the_parents(clients, monkeypatch):
+    parent = database.get_client()
+    _fork(monkeypatch)
+    child = database.get_client()
+    assert child is not parent and len(clients) == 2
+    assert not parent.closed
+
+
+def test_reset_client_drops_the_reference_and_counters(clients):
+    database.get_client()
+    database.pool_metrics.connection_created(None)
+    database.reset_client()
+    assert database.pool_metrics.snapshot()["connections_created"] == 0
+    assert database.get_pool_stats()["client_active"] is False
+    database.get_client()
+    assert len(clients) == 2 and not clients[0].closed
+
+
+def test_close_db_closes_only_a_client_this_process_owns(clients, monkeypatch):
+    database.get_client()
+    database.close_db()
+    database.close_db()
+    assert clients[0].closed
+    database.get_client()
+    _fork(monkeypatch)
+    database.close_db()
+    assert not clients[1].closed
+    assert database.get_pool_stats()["client_active"] is False
+
+
+def test_pool_listener_counts_connections_and_checkouts(clients):
+    listener = database.PoolMetricsListener()
+    for _ in range(3):
+        listener.connection_created(None)
+    listener.connection_closed(None)
+    listener.connection_checked_out(None)
+    listener.connection_checked_out(None)
+    listener.connection_checked_in(None)
+    listener.connection_checked_in(None)
+    listener.connection_checked_in(None)
+    listener.connection_check_out_failed(None)
+    listener.pool_cleared(None)
+    assert listener.snapshot() == {
+        "connections_created": 3,
+        "connections_closed": 1,
+        "connections_open": 2,
+        "checkouts": 2,
+        "checkins": 3,
+        "checkout_failures": 1,
+        "pool_clears": 1,
+        "in_use": 0,
+        "max_in_use": 2,
+    }
+
+
+def test_db_stats_endpoint_reports_this_workers_pool(clients):
+    from app import app
+    database.get_client()
+    database.pool_metrics.connection_created(None)
+    database.pool_metrics.connection_checked_out(None)
+    stats = app.test_client().get('/api/db_stats').get_json()
+    assert stats["pid"] == os.getpid()
+    assert stats["client_active"] is True
+    assert stats["connections_open"] == 1 and stats["in_use"] == 1
+    assert stats["max_pool_size"] == database.MONGO_MAX_POOL_SIZE
@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta
+import pytest
+from services.ingestion import (
+    IngestionQueue, QueueFull, get_status,
+    STATUS_QUEUED, STATUS_PROCESSING, STATUS_DONE, STATUS_FAILED, INGEST_STALE_SECONDS
+)
+
+RESUME = b"""Jane Doe
+jane@example.com
+
+SKILLS
+Python, Flask, Docker
+"""
+
+
+def _run(data, filename, **kwargs):
+    """Submit one upload and wait for the pool to finish it"""
+    queue = IngestionQueue(max_workers=1)
+    job_id = queue.submit(data, filename, filename, **kwargs)
+    queue.executor.shutdown(wait=True)
+    return get_status(job_id)
+
+
+def test_upload_moves_from_queued_to_done(db):
+    status = _run(RESUME, "jane.txt", content_hash="abc")
+    assert status["status"] == STATUS_DONE
+    assert status["stage"] == STATUS_DONE and status["progress"] == 100
+    resume = db.resumes.find_one()
+    assert str(resume["_id"]) == status["resume_id"]
+    assert resume["content_hash"] == "abc" and resume["features"]
+
+
+def test_parse_error_marks_the_job_failed(db):
+    status = _run(b"not a resume", "resume.odt")
+    assert status["status"] == STATUS_FAILED
+    assert "Unsupported file type" in status["error"]
+    assert status["resume_id"] is None
+    assert db.resumes.count_documents({}) == 0
+
+
+def test_job_claimed_elsewhere_is_not_processed_twice(db, caplog):
+    queue = IngestionQueue(max_workers=1)
+    job_id = db.ingest_jobs.insert_one({"status": STATUS_PROCESSING, "filename": "jane.txt"}).inserted_id
+    queue._process(job_id, RESUME)
+    assert f"Ingest job {job_id} could not be claimed (status processing" in caplog.text
+    assert db.ingest_jobs.find_one({"_id": job_id})["status"] == STATUS_PROCESSING
+    assert db.resumes.count_documents({}) == 0
+
+
+def test_full_queue_rejects_uploads_without_recording_them(db):
+    queue = IngestionQueue(max_workers=1, max_pending=1)
+    assert queue.slots.acquire(blocking=False)
+    with pytest.raises(QueueFull):
+        queue.submit(RESUME, "jane.txt", "jane.txt")
+    assert db.ingest_jobs.count_documents({}) == 0
+
+
+def test_recover_fails_only_stale_active_jobs(db):
+    old = datetime.utcnow() - timedelta(seconds=INGEST_STALE_SECONDS + 60)
+    stale = db.ingest_jobs.insert_many([
+        {"status": STATUS_QUEUED, "updated_at": old},
+        {"status": STATUS_PROCESSING, "updated_at": old},
+    ]).inserted_ids
+    fresh = db.ingest_jobs.insert_one({"status": STATUS_PROCESSING, "updated_at": datetime.utcnow()}).inserted_id
+    done = db.ingest_jobs.insert_one({"status": STATUS_DONE, "updated_at": old}).inserted_id
+    assert IngestionQueue(max_workers=1).recover() == 2
+    for job_id in stale:
+        job = db.ingest_jobs.find_one({"_id": job_id})
+        assert job["status"] == STATUS_FAILED and job["error"]
+    assert db.ingest_jobs.find_one({"_id": fresh})["status"] == STATUS_PROCESSING
+    assert db.ingest_jobs.find_one({"_id": done})["status"] == STATUS_DONE
+
+
+def test_heartbeat_keeps_backlogged_jobs_from_being_recovered(db):
+    old = datetime.utcnow() - timedelta(seconds=INGEST_STALE_SECONDS + 60)
+    owner = IngestionQueue(max_workers=1)
+    backlogged = db.ingest_jobs.insert_one({"status": STATUS_QUEUED, "updated_at": old}).inserted_id
+    orphaned = db.ingest_jobs.insert_one({"status": STATUS_QUEUED, "updated_at": old}).inserted_id
+    owner.pending.add(backlogged)
+    assert owner.heartbeat() == 1
+    assert IngestionQueue(max_workers=1).recover() == 1
+    assert db.ingest_jobs.find_one({"_id": backlogged})["status"] == STATUS_QUEUED
+    assert db.ingest_jobs.find_one({"_id": orphaned})["status"] == STATUS_FAILED
+
+
+def test_finished_jobs_stop_getting_heartbeats(db):
+    queue = IngestionQueue(max_workers=1)
+    job_id = queue.submit(RESUME, "jane.txt", "jane.txt")
+    queue.executor.shutdown(wait=True)
+    assert queue.pending == set()
+    assert get_status(job_id)["status"] == STATUS_DONE
@@ -0,0 +1,37 @@
+from services.job_analysis import analysis_version, backfill_job_analysis, build_analysis, get_analyses_for, get_job_analysis
+
+DESCRIPTION = "Senior backend engineer, 5+ years of Python and Django, payments experience"
+EDITED = "Junior frontend developer working with React and TypeScript"
+
+
+def test_current_analysis_is_used_without_reading_the_description(db):
+    stored = build_analysis(DESCRIPTION)
+    job_id = db.jobs.insert_one({"job_description": EDITED, "analysis": stored}).inserted_id
+    jobs = list(db.jobs.find({}, {"analysis": 1}))
+    assert get_analyses_for(jobs)[job_id]["description_hash"] == stored["description_hash"]
+    assert get_job_analysis(db.jobs.find_one({"_id": job_id}))["description_hash"] == stored["description_hash"]
+
+
+def test_outdated_analysis_is_rebuilt_and_saved(db):
+    job_id = db.jobs.insert_one({"job_description": DESCRIPTION, "analysis": {"version": "old"}}).inserted_id
+    analysis = get_analyses_for(list(db.jobs.find({}, {"analysis": 1})))[job_id]
+    assert analysis["version"] == analysis_version()
+    assert analysis["technical_skills"] == build_analysis(DESCRIPTION)["technical_skills"]
+    assert db.jobs.find_one({"_id": job_id})["analysis"]["version"] == analysis_version()
+
+
+def test_analyses_for_many_skip_jobs_deleted_meanwhile(db):
+    current = db.jobs.insert_one({"job_description": DESCRIPTION, "analysis": build_analysis(DESCRIPTION)}).inserted_id
+    missing = db.jobs.insert_one({"job_description": DESCRIPTION}).inserted_id
+    deleted = db.jobs.insert_one({"job_description": EDITED}).inserted_id
+    jobs = list(db.jobs.find({}, {"analysis": 1}))
+    db.jobs.delete_one({"_id": deleted})
+    assert set(get_analyses_for(jobs)) == {current, missing}
+
+
+def test_backfill_reanalyses_descriptions_edited_outside_the_app(db):
+    job_id = db.jobs.insert_one({"job_description": DESCRIPTION, "analysis": build_analysis(DESCRIPTION)}).inserted_id
+    db.jobs.insert_one({"job_description": DESCRIPTION, "analysis": build_analysis(DESCRIPTION)})
+    db.jobs.update_one({"_id": job_id}, {"$set": {"job_description": EDITED}})
+    assert backfill_job_analysis() == {"updated": 1, "checked": 2}
+    assert db.jobs.find_one({"_id": job_id})["analysis"]["description_hash"] == build_analysis(EDITED)["description_hash"]
@@ -0,0 +1,87 @@
+import pytest
+from bson import ObjectId
+from models.database import get_jobs_page, encode_job_cursor, decode_job_cursor
+
+
+@pytest.fixture
+def jobs(db):
+    # Several jobs share a date, so the _id tie-break decides their order.
+    dates = ["2025-03-01", "2025-03-01", "2025-02-15", "2025-03-01", "2025-01-20", "2025-02-15", "2025-03-10"]
+    documents = [
+        {"company": f"Company {i}", "position": "Engineer", "application_date": date,
+         "status": "interviewing" if i % 2 else "applied", "job_description": "Python" if i % 3 else ""}
+        for i, date in enumerate(dates)
+    ]
+    db.jobs.insert_many(documents)
+    return sorted(documents, key=lambda job: (job["application_date"], job["_id"]), reverse=True)
+
+
+def _walk(limit, status=None):
+    pages, cursor = [], None
+    while True:
+        page, cursor = get_jobs_page(limit=limit, after=cursor, status=status)
+        pages.append(page)
+        if cursor is None:
+            return pages
+
+
+def test_pages_cover_every_job_once_newest_first(jobs):
+    pages = _walk(limit=3)
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert [job["_id"] for page in pages for job in page] == [job["_id"] for job in jobs]
+
+
+def test_last_full_page_has_no_next_cursor(jobs):
+    page, cursor = get_jobs_page(limit=len(jobs))
+    assert len(page) == len(jobs) and cursor is None
+
+
+def test_status_filter_applies_to_every_page(jobs):
+    pages = _walk(limit=2, status="interviewing")
+    expected = [job["_id"] for job in jobs if job["status"] == "interviewing"]
+    assert [job["_id"] for page in pages for job in page] == expected
+
+
+def test_pages_only_carry_list_fields(jobs):
+    page, _ = get_jobs_page(limit=len(jobs))
+    by_id = {job["_id"]: job for job in jobs}
+    for job in page:
+        assert "job_description" not in job
+        assert job["has_description"] == bool(by_id[job["_id"]]["job_description"])
+
+
+def test_cursor_round_trip_and_malformed_cursor(jobs):
+    assert decode_job_cursor(encode_job_cursor(jobs[0])) == (jobs[0]["application_date"], jobs[0]["_id"])
+    with pytest.raises(ValueError):
+        get_jobs_page(after="not-a-cursor")
+
+
+def test_api_rejects_a_bad_cursor(db):
+    from app import app
+    assert app.test_client().get('/api/jobs?after=garbage').status_code == 400
+
+
+def test_datetime_and_missing_dates_are_paged_in_bson_order(db):
+    from datetime import datetime
+    documents = [
+        {"company": "A", "application_date": "2025-03-01"},
+        {"company": "B", "application_date": datetime(2025, 4, 2, 9, 30)},
+        {"company": "C"},
+        {"company": "D", "application_date": None},
+        {"company": "E", "application_date": "2025-01-05"},
+        {"company": "F", "application_date": datetime(2025, 2, 1)},
+        {"company": "G"},
+    ]
+    ids = {document["company"]: db.jobs.insert_one(document).inserted_id for document in documents}
+    for limit in (1, 2, 3):
+        pages = _walk(limit=limit)
+        order = [job["_id"] for page in pages for job in page]
+        # Datetimes, then strings, newest first; undated jobs last by _id.
+        assert order == [ids[company] for company in ("B", "F", "A", "E", "G", "D", "C")]
+
+
+def test_cursor_keeps_the_date_type(db):
+    from datetime import datetime
+    for application_date in (datetime(2025, 4, 2, 9, 30, 15, 123000), "2025-03-01", None):
+        job = {"_id": ObjectId(), "application_date": application_date}
+        assert decode_job_cursor(encode_job_cursor(job)) == (application_date, job["_id"])
@@ -0,0 +1,39 @@
+import time
+import pytest
+from services import job_scraper
+
+
+@pytest.fixture
+def fake_search(monkeypatch):
+    """Serve pages from a dict instead of TimesJobs, with an empty cache"""
+    pages = {}
+    monkeypatch.setattr(job_scraper, '_search_cache', job_scraper.SearchCache())
+    monkeypatch.setattr(job_scraper, '_search', lambda query, location, page: [dict(job) for job in pages.get(page, [])])
+    return pages
+
+
+def test_search_cache_stats_endpoint_counts_hits_and_misses(fake_search):
+    from app import app
+    fake_search[1] = [{"title": "Python Developer", "link": "https://example.com/1"}]
+    job_scraper.search_timesjobs_jobs("python")
+    job_scraper.search_timesjobs_jobs("  Python ")
+    stats = app.test_client().get('/api/search_cache_stats').get_json()
+    assert stats == {"entries": 1, "hits": 1, "stale_hits": 0, "misses": 1}
+
+
+def test_pages_are_yielded_and_deduplicated_in_page_order(fake_search, monkeypatch):
+    search = job_scraper._search
+
+    def slow_first_page(query, location, page):
+        if page == 1:
+            time.sleep(0.2)
+        return search(query, location, page)
+
+    monkeypatch.setattr(job_scraper, '_search', slow_first_page)
+    shared = {"title": "Data Engineer", "link": "https://example.com/shared"}
+    fake_search[1] = [{"title": "Python Developer", "link": "https://example.com/1"}, shared]
+    fake_search[2] = [shared, {"title": "Go Developer", "link": "https://example.com/2"}]
+    batches = list(job_scraper.iter_timesjobs_pages("python", pages=2))
+    assert [number for number, _, _ in batches] == [1, 2]
+    assert [job["link"] for job in batches[0][1]] == ["https://example.com/1", shared["link"]]
+    assert [job["link"] for job in batches[1][1]] == ["https://example.com/2"]
@@ -0,0 +1,76 @@
+import pytest
+from services import job_search
+from services.job_search import JobSearchIndex, load_index, save_index, search_jobs
+
+
+@pytest.fixture
+def jobs(db, monkeypatch, tmp_path):
+    monkeypatch.setattr(job_search, '_index', None)
+    monkeypatch.setattr(job_search, 'SEARCH_INDEX_PATH', str(tmp_path / 'jobs.json'))
+
+    def add(company, position, description, status='applied'):
+        job = {"company": company, "position": position, "job_description": description, "status": status}
+        job["_id"] = db.jobs.insert_one(dict(job)).inserted_id
+        return job
+    return add
+
+
+def test_bm25_ranks_title_hits_above_description_hits():
+    index = JobSearchIndex()
+    index.add({"_id": "64b000000000000000000001", "position": "Python Developer", "job_description": "Django APIs"})
+    index.add({"_id": "64b000000000000000000002", "position": "Data Engineer", "job_description": "python pipelines"})
+    index.add({"_id": "64b000000000000000000003", "position": "Designer", "job_description": "figma"})
+    ranked, matched = index.search("python")
+    assert matched == 2
+    assert [job_id for job_id, _ in ranked] == ["64b000000000000000000001", "64b000000000000000000002"]
+
+
+def test_skill_variations_match_each_other():
+    index = JobSearchIndex()
+    index.add({"_id": "64b000000000000000000001", "job_description": "Frontend work in JavaScript"})
+    assert index.search("js")[1] == 1
+
+
+def test_status_filter_applies_before_top_results(jobs):
+    for i in range(30):
+        jobs(f"Rejecting {i}", "Python Developer", "python python python")
+    offered = jobs("Offer Co", "Engineer", "some python", status="offered")
+    result = search_jobs("python", limit=5, status="offered")
+    assert [job["_id"] for job in result["results"]] == [str(offered["_id"])]
+    assert result["matched"] == 1
+
+
+def test_results_skip_jobs_whose_status_changed_after_indexing(jobs, db):
+    first = jobs("A", "Python Developer", "python")
+    second = jobs("B", "Python Developer", "python")
+    job_search.get_job_index()
+    db.jobs.update_one({"_id": first["_id"]}, {"$set": {"status": "rejected"}})
+    result = search_jobs("python", limit=1, status="applied")
+    assert [job["_id"] for job in result["results"]] == [str(second["_id"])]
+
+
+def test_new_jobs_are_indexed_and_highlighted(jobs):
+    jobs("Acme", "Backend Engineer", "Builds <APIs> in Go")
+    job_search.get_job_index()
+    added = jobs("Globex", "Senior Python Developer", "Django & REST")
+    job_search.index_job(added)
+    result = search_jobs("python", limit=5)
+    assert result["results"][0]["highlights"]["position"] == "Senior <mark>Python</mark> Developer"
+    assert search_jobs("apis")["results"][0]["highlights"]["snippet"] == "Builds &lt;<mark>APIs</mark>&gt; in Go"
+
+
+def test_index_round_trips_through_json(jobs, tmp_path):
+    jobs("Acme", "Python Developer", "python", status="offered")
+    index = job_search.get_job_index()
+    path = save_index(index, str(tmp_path / 'saved.json'))
+    loaded = load_index(path)
+    assert loaded.to_dict() == index.to_dict()
+    assert loaded.search("python", status="offered") == index.search("python", status="offered")
+
+
+def test_outdated_or_corrupt_files_are_ignored(tmp_path):
+    path = tmp_path / 'jobs.json'
+    path.write_text('{"version": "0-old"}')
+    assert load_index(str(path)) is None
+    path.write_text('not json')
+    assert load_index(str(path)) is None
@@ -0,0 +1,43 @@
+from bson import ObjectId
+from models.database import get_match_result, save_match_result
+
+RESUME_ID, JOB_ID = ObjectId(), ObjectId()
+
+
+def _save(version, score=72.5, job_hash="job-a", resume_hash="resume-a"):
+    save_match_result(RESUME_ID, JOB_ID, job_hash, resume_hash, version,
+                      score, {"skill_match_score": 80.0}, ["docker"], None)
+
+
+def test_saved_match_is_returned_for_the_same_inputs(db):
+    _save("v1")
+    cached = get_match_result(RESUME_ID, JOB_ID, "job-a", "resume-a", "v1")
+    assert cached["match_score"] == 72.5
+    assert cached["missing_keywords"] == ["docker"]
+    assert cached["skill_suggestions"] == {}
+
+
+def test_new_config_version_misses_the_cache(db):
+    _save("v1")
+    assert get_match_result(RESUME_ID, JOB_ID, "job-a", "resume-a", "v2") is None
+
+
+def test_changed_job_or_resume_misses_the_cache(db):
+    _save("v1")
+    assert get_match_result(RESUME_ID, JOB_ID, "job-b", "resume-a", "v1") is None
+    assert get_match_result(RESUME_ID, JOB_ID, "job-a", "resume-b", "v1") is None
+
+
+def test_recomputed_match_replaces_the_stale_one(db):
+    _save("v1")
+    _save("v2", score=64.0)
+    assert db.job_applications.count_documents({"resume_id": RESUME_ID, "job_id": JOB_ID}) == 1
+    assert get_match_result(RESUME_ID, JOB_ID, "job-a", "resume-a", "v1") is None
+    assert get_match_result(RESUME_ID, JOB_ID, "job-a", "resume-a", "v2")["match_score"] == 64.0
+
+
+def test_tracked_applications_without_a_cached_match_are_left_alone(db):
+    db.job_applications.insert_one({"resume_id": RESUME_ID, "job_id": JOB_ID, "status": "applied"})
+    _save("v1")
+    assert db.job_applications.count_documents({"resume_id": RESUME_ID, "job_id": JOB_ID}) == 2
+    assert db.job_applications.find_one({"config_version": {"$exists": False}})["status"] == "applied"
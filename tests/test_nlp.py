@@ -0,0 +1,20 @@
+from services import nlp
+
+
+def test_failed_load_is_retried_after_the_retry_window(monkeypatch):
+    clock = [1000.0]
+    attempts = []
+
+    def load(name):
+        attempts.append(name)
+        raise OSError('model missing')
+
+    monkeypatch.setattr(nlp, '_load', load)
+    monkeypatch.setattr(nlp, '_failed_at', {})
+    monkeypatch.setattr(nlp.time, 'monotonic', lambda: clock[0])
+    assert nlp.get_nlp('missing_model') is None
+    assert nlp.get_nlp('missing_model') is None
+    assert len(attempts) == 1
+    clock[0] += nlp.SPACY_RETRY_SECONDS
+    assert nlp.get_nlp('missing_model') is None
+    assert len(attempts) == 2
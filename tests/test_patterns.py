@@ -0,0 +1,46 @@
+import time
+import pytest
+from services.patterns import PATTERNS
+
+# Seconds any one pattern may spend scanning one input.
+BUDGET_SECONDS = 0.5
+
+# Inputs that made the previous, unbounded patterns backtrack for seconds or
+# longer. Every pattern has to get through each of them within the budget.
+ADVERSARIAL_INPUTS = {
+    'long_single_line_words': ' '.join(['word'] * 20000),
+    'words_without_dates': ' '.join(['Senior Software Engineer Acme Corp -'] * 2000),
+    'dash_runs': ' - '.join(['alpha beta gamma'] * 3000),
+    'digit_run': '1' * 50000,
+    'dotted_token': 'a.' * 25000,
+    'email_like_no_at': 'john.doe.' * 5000 + 'example',
+    'capitalized_no_university': ' '.join(['Stanford'] * 20000),
+    'certification_bait': ' '.join(['Certified'] + ['Cloud'] * 20000),
+    'cloud_bait': ' '.join(['AWS Azure Google'] * 7000),
+    'degree_bait': ' '.join(['B.A'] * 15000),
+    'requirements_no_terminator': 'requirements: ' + 'python ' * 20000,
+    'blank_lines': ' \n' * 25000,
+    'heading_lines': '\n'.join(['Experience Education Projects'] * 5000),
+}
+
+
+@pytest.mark.parametrize('input_name', sorted(ADVERSARIAL_INPUTS))
+def test_patterns_stay_linear_on_adversarial_input(input_name):
+    text = ADVERSARIAL_INPUTS[input_name]
+    slow = {}
+    for name, pattern in PATTERNS.patterns.items():
+        start = time.perf_counter()
+        for _ in pattern.regex.finditer(text):
+            pass
+        elapsed = time.perf_counter() - start
+        if elapsed > BUDGET_SECONDS:
+            slow[name] = round(elapsed, 3)
+    assert not slow, f"patterns over {BUDGET_SECONDS}s on {input_name}: {slow}"
+
+
+def test_regex_timing_is_exported_as_a_histogram(monkeypatch):
+    from services import metrics, patterns
+    monkeypatch.setattr(patterns, 'REGEX_TIMING', True)
+    metrics.registry.reset()
+    patterns.EMAIL.search('contact: jane@example.com')
+    assert 'job_tracker_regex_duration_seconds_count{pattern="email"} 1' in metrics.render_prometheus()
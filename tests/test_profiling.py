@@ -0,0 +1,41 @@
+import pytest
+from services import profiling
+
+TOKEN = 'test-token'
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    from app import app
+    monkeypatch.setattr(profiling, 'PROFILE_TOKEN', TOKEN)
+    monkeypatch.setattr(profiling, 'PROFILE_DIR', str(tmp_path))
+    monkeypatch.setattr(profiling, '_secret_key_set', True)
+    return app.test_client()
+
+
+def test_admin_needs_the_token_header(client):
+    assert client.get('/admin/profiles').status_code == 404
+    assert client.get(f'/admin/profiles?token={TOKEN}').status_code == 404
+    assert client.get('/admin/profiles', headers={profiling.PROFILE_HEADER: TOKEN}).status_code == 200
+    # The grant is remembered in the session
+    assert client.get('/admin/profiles').status_code == 200
+
+
+def test_rotating_the_token_revokes_session_grants(client, monkeypatch):
+    client.get('/admin/profiles', headers={profiling.PROFILE_HEADER: TOKEN})
+    monkeypatch.setattr(profiling, 'PROFILE_TOKEN', 'rotated')
+    assert client.get('/admin/profiles').status_code == 404
+
+
+def test_default_secret_key_disables_profiling_and_admin(client, monkeypatch):
+    monkeypatch.setattr(profiling, '_secret_key_set', False)
+    monkeypatch.setattr(profiling, 'PROFILE_SAMPLE_RATE', 1.0)
+    assert profiling.profile_trigger(TOKEN) is None
+    assert client.get('/admin/profiles', headers={profiling.PROFILE_HEADER: TOKEN}).status_code == 404
+
+
+def test_only_the_header_triggers_a_profile(client, tmp_path):
+    client.get(f'/metrics?profile={TOKEN}')
+    assert not list(tmp_path.glob('*.prof'))
+    client.get('/metrics', headers={profiling.PROFILE_HEADER: TOKEN})
+    assert len(list(tmp_path.glob('*.prof'))) == 1
@@ -0,0 +1,43 @@
+from services.resume_features import (
+    build_features, features_version, get_features_for, get_resume_features, backfill_features
+)
+
+PARSED = {
+    "skills": {"programming_languages": ["python"], "web_frameworks": ["flask"]},
+    "years_experience": 4,
+    "industry_focus": ["fintech"],
+    "projects": [{"title": "Payments API", "description": "REST service built with Python and Flask"}],
+}
+
+
+def test_stale_features_are_rebuilt_and_saved(db):
+    resume_id = db.resumes.insert_one({"parsed_data": PARSED, "features": {"version": "old"}}).inserted_id
+    features = get_resume_features(db.resumes.find_one({"_id": resume_id}, {"features": 1}))
+    assert features["version"] == features_version()
+    assert "python" in features["skills"]
+    assert db.resumes.find_one({"_id": resume_id})["features"]["version"] == features_version()
+
+
+def test_features_for_many_skip_resumes_deleted_meanwhile(db):
+    kept = db.resumes.insert_one({"parsed_data": PARSED}).inserted_id
+    current = db.resumes.insert_one({"parsed_data": PARSED, "features": build_features(PARSED)}).inserted_id
+    deleted = db.resumes.insert_one({"parsed_data": PARSED}).inserted_id
+    resumes = list(db.resumes.find({}, {"features": 1}))
+    db.resumes.delete_one({"_id": deleted})
+    features = get_features_for(resumes)
+    assert set(features) == {kept, current}
+
+
+def test_backfill_only_touches_outdated_records(db):
+    db.resumes.insert_many([{"parsed_data": PARSED}, {"parsed_data": PARSED, "features": {"version": "old"}}])
+    assert backfill_features() == {"updated": 2, "failed": 0}
+    assert backfill_features() == {"updated": 0, "failed": 0}
+
+
+def test_skill_ids_are_the_batch_matchers_exact_skill_row():
+    from services.batch_matcher import BatchMatcher
+    features = build_features(PARSED)
+    batch = BatchMatcher()
+    row = batch.encode_resumes([features]).skills[0]
+    assert [batch.skills[col] for col in row.nonzero()[0]] == [batch.skills[i] for i in features["skill_ids"]]
+    assert {"python", "flask"} <= {batch.skills[i] for i in features["skill_ids"]}
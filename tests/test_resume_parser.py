@@ -0,0 +1,55 @@
+import os
+import pytest
+from services.resume_parser import ResumeParser
+
+SAMPLE_PDF = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                          'uploads', '20250901_182732_resume_oc.pdf')
+
+
+@pytest.fixture(scope='module')
+def parser():
+    return ResumeParser()
+
+
+def test_sample_resume_projects_ignore_wrapped_lines(parser):
+    parsed = parser._parse_text(parser.extract_text(SAMPLE_PDF), use_nlp=False)
+    titles = [project['title'] for project in parsed['projects']]
+    assert len(titles) == 2
+    assert titles[0].startswith('Distraction Tracker')
+    assert titles[1].startswith('Pathfinding Visualizer')
+    assert 'Tech Stack: React, Vite' in parsed['projects'][1]['description']
+
+
+def test_projects_split_on_blank_lines_bullets_and_sentences(parser):
+    section = '\n'.join([
+        'Project A',
+        '• did x',
+        '• did y',
+        'Project B',
+        'Built a service that wraps',
+        'onto the next line.',
+        '',
+        'Project C',
+        'Tech Stack: Python, Flask',
+    ])
+    projects = parser._extract_section_projects(section)
+    assert [project['title'] for project in projects] == ['Project A', 'Project B', 'Project C']
+    assert projects[1]['description'] == 'Built a service that wraps onto the next line.'
+    assert {'python', 'flask'} <= set(projects[2]['technologies'])
+
+
+def test_clean_text_keeps_one_blank_line_between_paragraphs(parser):
+    assert parser._clean_text('a  \n\n  \n b\nc') == 'a\n\nb\nc'
+
+
+def test_name_is_read_from_preamble(parser):
+    parsed = parser._parse_text(parser.extract_text(SAMPLE_PDF), use_nlp=False)
+    assert parsed['contact_info']['name'] == 'Priyanshu Singh'
+
+
+def test_ner_name_fallback_is_off_by_default(parser, monkeypatch):
+    from services import resume_parser
+    monkeypatch.setattr(resume_parser, 'get_nlp', lambda: pytest.fail('spaCy loaded without PARSER_NER_NAMES'))
+    parsed = parser._parse_text('jane.doe@example.com\nExperience\nEngineer at Acme')
+    assert 'name' not in parsed['contact_info']
+    assert parser.fill_missing_names([parsed], ['jane.doe@example.com']) == 0
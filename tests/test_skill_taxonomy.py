@@ -0,0 +1,43 @@
+import pytest
+from services.skill_taxonomy import SkillAutomaton, get_skill_automaton
+
+
+@pytest.fixture(scope="module")
+def automaton():
+    return get_skill_automaton()
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("C++ and Go developer", ["c++", "go"]),
+    ("C++/Go", ["c++", "go"]),
+    ("cpp, golang", ["c++", "go"]),
+    ("Skilled in R programming", ["r"]),
+    ("I use R.", ["r"]),
+    ("java, javascript", ["java", "javascript"]),
+])
+def test_short_and_symbol_skills_match_as_whole_words(automaton, text, expected):
+    assert automaton.find_skills(text) == expected
+
+
+@pytest.mark.parametrize("text", [
+    "We are going to order rare records",
+    "cargo, forego, argon",
+    "erlang",
+    "c++11",
+])
+def test_skills_do_not_fire_inside_other_words(automaton, text):
+    assert automaton.find_skills(text) == []
+
+
+def test_longest_variation_also_yields_its_whole_word_prefixes():
+    automaton = SkillAutomaton({"languages": {"go": ["go"], "go kit": ["go kit"]}})
+    assert automaton.find_skills("built with go   kit") == ["go", "go kit"]
+    assert automaton.find_skills("gokit") == []
+
+
+def test_find_by_category_groups_in_taxonomy_order():
+    automaton = SkillAutomaton({
+        "languages": {"python": ["python", "py"], "r": ["r"]},
+        "frameworks": {"django": ["django"]},
+    })
+    assert automaton.find_by_category("Django, R and py") == {"languages": ["python", "r"], "frameworks": ["django"]}
@@ -0,0 +1,27 @@
+import hashlib
+import io
+
+
+def test_upload_is_hashed_while_the_body_is_parsed():
+    from flask import request
+    from app import app, read_upload, HashingUploadBuffer
+    data = b"%PDF-1.4 resume body " * 50000
+    with app.test_request_context('/upload', method='POST', content_type='multipart/form-data',
+                                  data={'resume': (io.BytesIO(data), 'resume.pdf')}):
+        upload = request.files['resume']
+        assert isinstance(upload.stream, HashingUploadBuffer)
+        assert upload.stream.sha256.hexdigest() == hashlib.sha256(data).hexdigest()
+        assert read_upload(upload) == (data, hashlib.sha256(data).hexdigest())
+
+
+def test_duplicate_upload_reuses_the_parsed_resume(db):
+    from app import app
+    from services.resume_parser import PARSER_VERSION
+    data = b"Jane Doe\njane@example.com\n"
+    resume_id = db.resumes.insert_one({"content_hash": hashlib.sha256(data).hexdigest(),
+                                       "parser_version": PARSER_VERSION, "parsed_data": {"name": "Jane Doe"}}).inserted_id
+    response = app.test_client().post('/api/parse_resume', content_type='multipart/form-data',
+                                      data={'resume': (io.BytesIO(data), 'jane.txt')})
+    assert response.status_code == 200
+    assert response.get_json()["duplicate"] is True
+    assert response.get_json()["resume_id"] == str(resume_id)
@@ -0,0 +1,40 @@
+import time
+import pytest
+from services import warmup
+
+
+@pytest.fixture
+def cold(monkeypatch):
+    monkeypatch.setitem(warmup._state, "warm", False)
+    monkeypatch.setitem(warmup._state, "warming", False)
+    monkeypatch.setitem(warmup._state, "components", {})
+
+
+def _wait_until_ready(client, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        response = client.get('/healthz/ready')
+        if response.status_code == 200:
+            return response
+        time.sleep(0.05)
+    raise AssertionError("worker never became ready")
+
+
+def test_readiness_reports_503_while_a_cold_worker_warms_in_the_background(cold):
+    from app import app
+    client = app.test_client()
+    response = client.get('/healthz/ready')
+    assert response.status_code == 503
+    assert response.get_json()["ready"] is False
+    ready = _wait_until_ready(client).get_json()
+    assert ready["components"]["patterns"] > 0
+    assert ready["warming"] is False
+
+
+def test_warm_in_background_starts_only_one_warmup(cold, monkeypatch):
+    calls = []
+    monkeypatch.setattr(warmup, 'warm', lambda app=None: calls.append(app) or time.sleep(0.2))
+    assert warmup.warm_in_background() is True
+    assert warmup.warm_in_background() is False
+    time.sleep(0.4)
+    assert calls == [None]